@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -80,13 +82,52 @@ WSGI_APPLICATION = 'joinbackend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Pragmas applied to every new SQLite connection. WAL lets readers run next to
+# a writer, and busy_timeout makes concurrent writers wait instead of failing
+# with "database is locked".
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 134217728,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {key}={value}' for key, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        },
+    },
+    # Read-only connection to the same WAL database, used for the reads of the
+    # list and summary views so they do not share a connection with writes.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{BASE_DIR / 'db.sqlite3'}?mode=ro",
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(
+                f'PRAGMA {key}={value}' for key, value in SQLITE_PRAGMAS.items() if key != 'journal_mode'
+            ),
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
 }
 
+DATABASE_ROUTERS = ['task_data_app.routers.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -106,6 +147,51 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Size of the thread pool the async login and registration views use for the
+# password key derivation.
+
+PASSWORD_HASHING_WORKERS = 4
+
+# Polling interval (seconds) and retention (hours) of the task event log that
+# feeds the /api/task/events/ stream.
+
+TASK_EVENTS_POLL_INTERVAL = 0.5
+TASK_EVENTS_RETENTION_HOURS = 24
+
+# Minimum interval (seconds) between two checks of the cross-worker
+# invalidation bus.
+
+INVALIDATION_POLL_INTERVAL = 0.05
+
+# Hours the first response of a write sent with an `Idempotency-Key` header
+# is kept for replaying to retries.
+
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+
+# Seconds a write sent with an `Idempotency-Key` holds its key while it runs.
+# Retries within the lease get 409; later retries run the write again.
+
+IDEMPOTENCY_KEY_LEASE_SECONDS = 60
+
+# Seconds the drag and drop moves of a task sent to /api/task/move/ are
+# collected before only the final column is written.
+
+TASK_MOVE_COALESCE_WINDOW = 0.3
+
+# Seconds a move request waits for its coalesced write before writing the
+# move itself.
+
+TASK_MOVE_TIMEOUT = 5.0
+
+# Background job queue: number of threads running jobs, seconds between two
+# looks for due jobs, attempts before a job is given up, and whether the app
+# process runs the jobs itself instead of a separate `run_jobs` command.
+
+JOB_QUEUE_WORKERS = 2
+JOB_QUEUE_POLL_INTERVAL = 1.0
+JOB_QUEUE_MAX_ATTEMPTS = 5
+JOB_QUEUE_EMBEDDED_WORKER = True
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -134,6 +220,19 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5500"    # Optionally include localhost
 ]
 
+# Request headers of the API beyond the defaults: board selection, read
+# routing, write preconditions, idempotent retries and event stream resume.
+
+CORS_ALLOW_HEADERS = (
+    *default_headers,
+    'x-board',
+    'x-read-primary',
+    'if-match',
+    'idempotency-key',
+    'last-event-id',
+)
+CORS_EXPOSE_HEADERS = ['etag', 'idempotent-replayed']
+
 REST_FRAMEWORK = {
     # 'DEFAULT_PERMISSION_CLASSES': [
     #     'rest_framework.permissions.AllowAny',
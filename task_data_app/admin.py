@@ -1,5 +1,26 @@
 from django.contrib import admin
-from .models import User, Task, SubTask, Category
+from .api.projection import deferred_card_updates
+from .models import Board, BoardMembership, PriorityImage, User, Task, SubTask, Category, TaskAssignment, TaskCategory
+
+
+class CardProjectionAdmin(admin.ModelAdmin):
+    """
+    Admin interface that keeps the task cards in the transaction of its edits.
+
+    Methods
+    -------
+    changeform_view(*args, **kwargs)
+        Handles the add and change forms, refreshing touched cards once.
+    delete_view(*args, **kwargs)
+        Handles the delete confirmation, refreshing touched cards once.
+    """
+    def changeform_view(self, *args, **kwargs):
+        with deferred_card_updates():
+            return super().changeform_view(*args, **kwargs)
+
+    def delete_view(self, *args, **kwargs):
+        with deferred_card_updates():
+            return super().delete_view(*args, **kwargs)
 
 class SubTaskInline(admin.TabularInline):
     """
@@ -16,7 +37,37 @@ class SubTaskInline(admin.TabularInline):
     extra = 1
 
 
-class TaskAdmin(admin.ModelAdmin):
+class TaskAssignmentInline(admin.TabularInline):
+    """
+    Inline admin interface for the ordered assignees of a task.
+
+    Attributes
+    ----------
+    model : TaskAssignment
+        The model represented in this inline admin.
+    extra : int
+        The number of empty assignment forms displayed in the inline admin.
+    """
+    model = TaskAssignment
+    extra = 1
+
+
+class TaskCategoryInline(admin.TabularInline):
+    """
+    Inline admin interface for the ordered categories of a task.
+
+    Attributes
+    ----------
+    model : TaskCategory
+        The model represented in this inline admin.
+    extra : int
+        The number of empty category forms displayed in the inline admin.
+    """
+    model = TaskCategory
+    extra = 1
+
+
+class TaskAdmin(CardProjectionAdmin):
     """
     Admin interface for the Task model.
 
@@ -28,12 +79,42 @@ class TaskAdmin(admin.ModelAdmin):
         Inline models to include in the Task admin interface.
     """
     list_display = ('id', 'title', 'container',  'due_date', 'priority')
-    inlines = [SubTaskInline]
+    inlines = [TaskAssignmentInline, TaskCategoryInline, SubTaskInline]
 
 
-admin.site.register(User)
-admin.site.register(Task , TaskAdmin)	
-admin.site.register(SubTask)
-admin.site.register(Category)
+class BoardMembershipInline(admin.TabularInline):
+    """
+    Inline admin interface for the members of a board.
+
+    Attributes
+    ----------
+    model : BoardMembership
+        The model represented in this inline admin.
+    extra : int
+        Number of extra blank forms displayed in the admin.
+    """
+    model = BoardMembership
+    extra = 1
+
 
+class BoardAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the Board model.
 
+    Attributes
+    ----------
+    list_display : tuple
+        Fields to display in the admin list view for Board.
+    inlines : list
+        Inline models to include in the Board admin interface.
+    """
+    list_display = ('id', 'name')
+    inlines = [BoardMembershipInline]
+
+
+admin.site.register(User, CardProjectionAdmin)
+admin.site.register(Task , TaskAdmin)	
+admin.site.register(SubTask, CardProjectionAdmin)
+admin.site.register(Category, CardProjectionAdmin)
+admin.site.register(Board, BoardAdmin)
+admin.site.register(PriorityImage, CardProjectionAdmin)
@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from task_data_app.models import ArchivedTask, Category, SubTask, Task, TaskAssignment, TaskCategory, User
+
+from .projection import build_cards, deferred_card_updates
+
+TASK_SNAPSHOT_FIELDS = ('container', 'title', 'description', 'due_date', 'priority')
+
+
+def get_archivable_tasks(days):
+    """
+    Returns the tasks that have been done for more than the given number of days.
+
+    Parameters
+    ----------
+    days : int
+        Minimum number of days a task must have been in the done column.
+
+    Returns
+    -------
+    QuerySet
+        The archivable tasks, oldest first.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return Task.objects.filter(done_since__lt=cutoff, container=Task.Container.DONE).order_by('done_since', 'id')
+
+
+def build_snapshots(tasks):
+    """
+    Captures what is needed to restore the given tasks.
+
+    Parameters
+    ----------
+    tasks : list of Task
+        The tasks to capture.
+
+    Returns
+    -------
+    dict
+        The snapshot of every task by task ID.
+    """
+    snapshots = {
+        task.id: {
+            **{field: getattr(task, field) for field in TASK_SNAPSHOT_FIELDS},
+            'due_date': task.due_date.isoformat() if task.due_date else None,
+            'user': [],
+            'category': [],
+            'subtasks': [],
+        }
+        for task in tasks
+    }
+    assignments = TaskAssignment.objects.filter(task_id__in=snapshots).order_by('task_id', 'position', 'id')
+    for task_id, user_id in assignments.values_list('task_id', 'user_id'):
+        snapshots[task_id]['user'].append(user_id)
+    categories = TaskCategory.objects.filter(task_id__in=snapshots).order_by('task_id', 'position', 'id')
+    for task_id, category_id in categories.values_list('task_id', 'category_id'):
+        snapshots[task_id]['category'].append(category_id)
+    subtasks = SubTask.objects.filter(task_id__in=snapshots).order_by('task_id', 'id')
+    for task_id, name, checked in subtasks.values_list('task_id', 'name', 'checked'):
+        snapshots[task_id]['subtasks'].append({'name': name, 'checked': checked})
+    return snapshots
+
+
+def archive_tasks(days, batch_size=500):
+    """
+    Moves tasks done for more than the given number of days to the archive.
+
+    Every batch is archived in its own transaction: the cards and snapshots
+    are written to `ArchivedTask`, then the tasks are deleted together with
+    their subtasks, relations and cards.
+
+    Parameters
+    ----------
+    days : int
+        Minimum number of days a task must have been in the done column.
+    batch_size : int, optional
+        Number of tasks archived per transaction.
+
+    Returns
+    -------
+    int
+        The number of archived tasks.
+    """
+    count = 0
+    while True:
+        with deferred_card_updates():
+            tasks = list(get_archivable_tasks(days)[:batch_size])
+            if not tasks:
+                break
+            snapshots = build_snapshots(tasks)
+            cards = {card['id']: card for card in build_cards(Task.objects.filter(id__in=snapshots))}
+            archived_at = timezone.now()
+            ArchivedTask.objects.bulk_create([
+                ArchivedTask(
+                    id=task.id, board_id=task.board_id, title=task.title, done_since=task.done_since, archived_at=archived_at,
+                    card=cards[task.id], snapshot=snapshots[task.id],
+                )
+                for task in tasks
+            ])
+            Task.objects.filter(id__in=snapshots).delete()
+        count += len(tasks)
+    return count
+
+
+def restore_task(archived_task):
+    """
+    Moves an archived task back onto the board under its original ID.
+
+    The task goes back to the board it was archived from. Assignees and
+    categories that were deleted in the meantime are dropped.
+    The task returns to the done column with a fresh `done_since`, so it is
+    not archived again right away.
+
+    Parameters
+    ----------
+    archived_task : ArchivedTask
+        The archived task to restore.
+
+    Returns
+    -------
+    Task
+        The restored task.
+    """
+    snapshot = archived_task.snapshot
+    with deferred_card_updates():
+        task = Task(id=archived_task.id, board_id=archived_task.board_id, **{field: snapshot[field] for field in TASK_SNAPSHOT_FIELDS})
+        task.save(force_insert=True)
+        existing_users = set(User.objects.visible().filter(id__in=snapshot['user']).values_list('id', flat=True))
+        task.set_assignees([user_id for user_id in snapshot['user'] if user_id in existing_users])
+        existing_categories = set(Category.objects.filter(id__in=snapshot['category']).values_list('id', flat=True))
+        task.set_categories([category_id for category_id in snapshot['category'] if category_id in existing_categories])
+        SubTask.objects.bulk_create([SubTask(task=task, **subtask) for subtask in snapshot['subtasks']])
+        archived_task.delete()
+    return task
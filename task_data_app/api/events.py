@@ -0,0 +1,225 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from task_data_app.job_queue import job_queue
+from task_data_app.models import TaskCard, TaskEvent
+
+
+class TaskEventBroker:
+    """
+    Fans task change events out to the open event streams of this worker.
+
+    A single poller per worker reads new rows from the `TaskEvent` log and
+    pushes them to one queue per connected client, so idle connections cost a
+    queue rather than a thread or a database query each. Because the log lives
+    in the database, writes made by other workers are streamed as well.
+
+    Attributes
+    ----------
+    poll_interval : float
+        Seconds between two polls of the event log.
+    queue_size : int
+        Events buffered per client before the client is dropped and has to
+        resume with `Last-Event-ID`.
+    batch_size : int
+        Maximum number of events read per poll.
+    retention : timedelta
+        How long events are kept for resuming clients.
+    prune_every : int
+        Number of logged events between two background deletions of expired events.
+
+    Methods
+    -------
+    record(kind, task_ids, board_id=None)
+        Logs task events and schedules the pruning of expired ones.
+    subscribe()
+        Registers a new client queue and starts the poller if needed.
+    unsubscribe(queue)
+        Removes a client queue.
+    fetch_events(after_id)
+        Reads the events after the given ID and builds their payloads.
+    prune()
+        Deletes events older than the retention period.
+    """
+    poll_interval = getattr(settings, 'TASK_EVENTS_POLL_INTERVAL', 0.5)
+    queue_size = 1000
+    batch_size = 500
+    retention = timedelta(hours=getattr(settings, 'TASK_EVENTS_RETENTION_HOURS', 24))
+    prune_every = 1000
+
+    def __init__(self):
+        self._subscribers = set()
+        self._poller = None
+        self._last_id = None
+        self._recorded = 0
+
+    def record(self, kind, task_ids, board_id=None):
+        """
+        Logs task events and schedules the pruning of expired ones.
+
+        Pruning runs as a background job after every `prune_every` events
+        logged by this worker, whether or not clients are connected.
+
+        Parameters
+        ----------
+        kind : str
+            Either ``'upsert'`` or ``'delete'``.
+        task_ids : iterable of int
+            The IDs of the changed tasks.
+        board_id : int, optional
+            The board of the tasks; given for deletes.
+        """
+        recorded = len(TaskEvent.record(kind, task_ids, board_id))
+        if self._recorded // self.prune_every != (self._recorded + recorded) // self.prune_every:
+            job_queue.enqueue('prune_task_events')
+        self._recorded += recorded
+
+    async def subscribe(self):
+        """
+        Registers a new client queue and starts the poller if needed.
+
+        The first client after an idle stretch starts at the newest event,
+        not where the poller stopped; clients that missed events resume with
+        `Last-Event-ID`.
+
+        Returns
+        -------
+        asyncio.Queue
+            The queue receiving the events for this client; `None` is put on
+            it when the client fell too far behind.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if not self._subscribers:
+            self._last_id = None
+        self._subscribers.add(queue)
+        loop = asyncio.get_running_loop()
+        if self._poller is None or self._poller.done() or self._poller.get_loop() is not loop:
+            self._poller = loop.create_task(self._poll())
+        return queue
+
+    def unsubscribe(self, queue):
+        """
+        Removes a client queue.
+
+        Parameters
+        ----------
+        queue : asyncio.Queue
+            The queue returned by `subscribe`.
+        """
+        self._subscribers.discard(queue)
+
+    async def _poll(self):
+        """
+        Polls the event log and fans new events out while clients are connected.
+        """
+        while self._subscribers:
+            if self._last_id is None:
+                self._last_id = await sync_to_async(self.get_last_id)()
+            last_id, events = await sync_to_async(self.fetch_events)(self._last_id)
+            self._last_id = last_id
+            for event in events:
+                for queue in list(self._subscribers):
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        self._subscribers.discard(queue)
+                        queue.get_nowait()
+                        queue.put_nowait(None)
+            await asyncio.sleep(self.poll_interval)
+
+    def get_last_id(self):
+        """
+        Returns the ID of the newest logged event.
+
+        Returns
+        -------
+        int
+            The newest event ID, or 0 if the log is empty.
+        """
+        return TaskEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    def get_first_id(self):
+        """
+        Returns the ID of the oldest retained event.
+
+        Returns
+        -------
+        int or None
+            The oldest event ID, or `None` if the log is empty.
+        """
+        return TaskEvent.objects.order_by('id').values_list('id', flat=True).first()
+
+    def fetch_events(self, after_id):
+        """
+        Reads the events after the given ID and builds their payloads.
+
+        Upsert payloads carry the task's card in the same format as
+        `/api/task/`; upserts for tasks that no longer exist are dropped.
+        The card is read now rather than when the event was logged, but
+        every upsert is logged in the transaction that rebuilt its card, so
+        it is never older than the event.
+        Delete payloads carry the task ID and, where it was logged, the board.
+
+        Parameters
+        ----------
+        after_id : int
+            The ID of the last event already seen.
+
+        Returns
+        -------
+        tuple
+            The ID of the last event read and the list of events with `id`,
+            `event` and `data` keys, oldest first.
+        """
+        events = list(
+            TaskEvent.objects.filter(id__gt=after_id).order_by('id')
+            .values('id', 'task_id', 'board_id', 'kind')[:self.batch_size]
+        )
+        upserted_ids = {event['task_id'] for event in events if event['kind'] == TaskEvent.UPSERT}
+        tasks = {}
+        if upserted_ids:
+            tasks = dict(TaskCard.objects.filter(task_id__in=upserted_ids).values_list('task_id', 'data'))
+
+        payloads = []
+        for event in events:
+            if event['kind'] == TaskEvent.DELETE:
+                data = {'id': event['task_id']}
+                if event['board_id'] is not None:
+                    data['board'] = event['board_id']
+            elif event['task_id'] in tasks:
+                data = tasks[event['task_id']]
+            else:
+                continue
+            payloads.append({'id': event['id'], 'event': event['kind'], 'data': data})
+        return (events[-1]['id'] if events else after_id), payloads
+
+    def prune(self):
+        """
+        Deletes events older than the retention period.
+        """
+        TaskEvent.objects.filter(created__lt=timezone.now() - self.retention).delete()
+
+
+def format_event(event):
+    """
+    Formats an event as a Server-Sent Events message.
+
+    Parameters
+    ----------
+    event : dict
+        The event with `id`, `event` and `data` keys.
+
+    Returns
+    -------
+    str
+        The SSE message.
+    """
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+task_event_broker = TaskEventBroker()
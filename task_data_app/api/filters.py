@@ -0,0 +1,262 @@
+from datetime import timedelta
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework import serializers
+
+from task_data_app.models import Category, Task, TaskAssignment, TaskCard, TaskCategory
+
+from .serializers import LabelChoiceField
+
+
+class CommaSeparatedListField(serializers.ListField):
+    """
+    List field for query parameters given repeated or comma separated.
+
+    `?assignee=1&assignee=2` and `?assignee=1,2` are read the same way.
+
+    Methods
+    -------
+    get_value(dictionary)
+        Collects the values of the parameter from the query string.
+    """
+
+    def get_value(self, dictionary):
+        """
+        Collects the values of the parameter from the query string.
+
+        Parameters
+        ----------
+        dictionary : QueryDict or dict
+            The query parameters of the request.
+
+        Returns
+        -------
+        list of str
+            The individual values, or `empty` if the parameter is missing.
+        """
+        if self.field_name not in dictionary:
+            return serializers.empty
+        if hasattr(dictionary, 'getlist'):
+            params = dictionary.getlist(self.field_name)
+        else:
+            params = [dictionary[self.field_name]]
+        return [value.strip() for param in params for value in param.split(',') if value.strip()]
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Validates the filter parameters of the task list.
+
+    Every filter maps onto an indexed column: assignees and categories are
+    matched with `EXISTS` subqueries on the indexed through tables, priority,
+    container and due date on the task indexes. Unknown parameters are
+    rejected instead of ignored, so no filter can fall back to a table scan.
+    Category IDs must belong to the `board` passed in the context.
+
+    Attributes
+    ----------
+    assignee : CommaSeparatedListField
+        User IDs; matches tasks assigned to any of them.
+    category : CommaSeparatedListField
+        Category IDs of the board; matches tasks in any of them.
+    priority : CommaSeparatedListField
+        Priority names; matches tasks with any of them.
+    container : CommaSeparatedListField
+        Board column names; matches tasks in any of them.
+    due_after : DateField
+        Earliest due date, inclusive.
+    due_before : DateField
+        Latest due date, inclusive.
+    max_values : int
+        Upper bound for the number of values per list filter.
+    ignored_params : tuple
+        Query parameters handled elsewhere and allowed next to the filters.
+
+    Methods
+    -------
+    validate_category(value)
+        Rejects category IDs that are not on the board.
+    validate(attrs)
+        Rejects unknown parameters and empty due date ranges.
+    filter_tasks(queryset)
+        Applies the validated filters to a task queryset.
+    filter_cards(board)
+        Returns the card data of the matching tasks on a board.
+    """
+    max_values = 50
+    ignored_params = ('primary', 'format', 'board')
+
+    assignee = CommaSeparatedListField(child=serializers.IntegerField(min_value=1), required=False, max_length=max_values)
+    category = CommaSeparatedListField(child=serializers.IntegerField(min_value=1), required=False, max_length=max_values)
+    priority = CommaSeparatedListField(child=LabelChoiceField(Task.Priority), required=False, max_length=max_values)
+    container = CommaSeparatedListField(child=LabelChoiceField(Task.Container), required=False, max_length=max_values)
+    due_after = serializers.DateField(required=False)
+    due_before = serializers.DateField(required=False)
+
+    def validate_category(self, value):
+        """
+        Rejects category IDs that are not on the board.
+
+        Parameters
+        ----------
+        value : list of int
+            The requested category IDs.
+
+        Returns
+        -------
+        list of int
+            The category IDs.
+
+        Raises
+        ------
+        serializers.ValidationError
+            If a category does not exist on the board.
+        """
+        known = set(Category.objects.filter(board=self.context['board'], id__in=value).values_list('id', flat=True))
+        unknown = sorted(set(value) - known)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown categories: {', '.join(map(str, unknown))}.")
+        return value
+
+    def validate(self, attrs):
+        """
+        Rejects unknown parameters and empty due date ranges.
+
+        Parameters
+        ----------
+        attrs : dict
+            The validated filter values.
+
+        Returns
+        -------
+        dict
+            The validated filter values.
+
+        Raises
+        ------
+        serializers.ValidationError
+            If an unknown parameter is given or `due_after` lies after `due_before`.
+        """
+        unknown = set(self.initial_data) - set(self.fields) - set(self.ignored_params)
+        if unknown:
+            raise serializers.ValidationError(
+                {param: 'Unknown filter.' for param in sorted(unknown)})
+        if 'due_after' in attrs and 'due_before' in attrs and attrs['due_after'] > attrs['due_before']:
+            raise serializers.ValidationError({'due_after': 'Must not be after due_before.'})
+        return attrs
+
+    def filter_tasks(self, queryset):
+        """
+        Applies the validated filters to a task queryset.
+
+        Parameters
+        ----------
+        queryset : QuerySet
+            The tasks to filter.
+
+        Returns
+        -------
+        QuerySet
+            The tasks matching all given filters.
+        """
+        data = self.validated_data
+        if 'assignee' in data:
+            queryset = queryset.filter(Exists(TaskAssignment.objects.filter(
+                task_id=OuterRef('pk'), user_id__in=data['assignee'])))
+        if 'category' in data:
+            queryset = queryset.filter(Exists(TaskCategory.objects.filter(
+                task_id=OuterRef('pk'), category_id__in=data['category'])))
+        if 'priority' in data:
+            queryset = queryset.filter(priority__in=data['priority'])
+        if 'container' in data:
+            queryset = queryset.filter(container__in=data['container'])
+        if 'due_after' in data:
+            queryset = queryset.filter(due_date__gte=data['due_after'])
+        if 'due_before' in data:
+            queryset = queryset.filter(due_date__lte=data['due_before'])
+        return queryset
+
+    def filter_cards(self, board):
+        """
+        Returns the card data of the matching tasks on a board.
+
+        Parameters
+        ----------
+        board : Board
+            The board whose tasks are filtered.
+
+        Returns
+        -------
+        list of dict
+            The matching tasks in the format expected by the board.
+        """
+        tasks = self.filter_tasks(Task.objects.filter(board=board)).values('pk')
+        return list(TaskCard.objects.filter(task_id__in=tasks).order_by('task_id').values_list('data', flat=True))
+
+
+class CalendarRangeSerializer(serializers.Serializer):
+    """
+    Validates the date range of the deadline calendar.
+
+    The range is given by the `from` and `to` query parameters. `from`
+    defaults to today and `to` to `default_days` after `from`; both days
+    are included.
+
+    Attributes
+    ----------
+    default_days : int
+        Length of the range when no `to` is given.
+    max_days : int
+        Upper bound for the length of the range.
+
+    Methods
+    -------
+    get_fields()
+        Declares the `from` and `to` fields, whose names are Python keywords.
+    validate(attrs)
+        Fills in the defaults and checks the length of the range.
+    """
+    default_days = 30
+    max_days = 366
+
+    def get_fields(self):
+        """
+        Declares the `from` and `to` fields, whose names are Python keywords.
+
+        Returns
+        -------
+        dict
+            The fields of the serializer.
+        """
+        return {
+            'from': serializers.DateField(required=False),
+            'to': serializers.DateField(required=False),
+        }
+
+    def validate(self, attrs):
+        """
+        Fills in the defaults and checks the length of the range.
+
+        Parameters
+        ----------
+        attrs : dict
+            The validated `from` and `to` dates.
+
+        Returns
+        -------
+        dict
+            The `from` and `to` dates of the range, both inclusive.
+
+        Raises
+        ------
+        serializers.ValidationError
+            If `to` lies before `from` or the range exceeds `max_days`.
+        """
+        start = attrs.get('from') or timezone.localdate()
+        end = attrs.get('to') or start + timedelta(days=self.default_days)
+        if end < start:
+            raise serializers.ValidationError({'to': 'Must not be before from.'})
+        if (end - start).days >= self.max_days:
+            raise serializers.ValidationError({'to': f'The range must not exceed {self.max_days} days.'})
+        return {'from': start, 'to': end}
@@ -0,0 +1,236 @@
+import hashlib
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.db import IntegrityError
+from django.http import HttpResponse, JsonResponse
+from django.http.request import RawPostDataException
+from django.utils import timezone
+from rest_framework import status
+
+from task_data_app.job_queue import job_queue
+from task_data_app.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+class IdempotencyStore:
+    """
+    Keeps the first response of writes sent with an `Idempotency-Key` header.
+
+    A write claims its key with a pending row before it runs, so a retry
+    arriving while the first attempt is still running is rejected instead of
+    running twice. The claim is a lease: if the write never answers, for
+    example because its worker crashed, a retry after the lease takes the
+    key over and runs the write. Once the write has answered, the response is stored
+    compressed and replayed to every retry with the same key until the key
+    expires; the retry does not run validation, hashing or inserts again.
+    Server errors are not stored, so the client can retry them. A key is
+    only accepted with a body that can be read whole to fingerprint it;
+    larger writes are refused rather than matched by their length.
+
+    Attributes
+    ----------
+    ttl : timedelta
+        How long a key and its response are kept.
+    lease : timedelta
+        How long a running write holds its key.
+    max_key_length : int
+        Upper bound for the length of a key.
+    prune_every : int
+        Number of claimed keys between two background deletions of expired keys.
+
+    Methods
+    -------
+    begin(request, key)
+        Claims the key of a write or returns the response to send instead.
+    finish(record, response)
+        Stores the response of a write under its claimed key.
+    prune()
+        Deletes the expired keys.
+    """
+    ttl = timedelta(hours=getattr(settings, 'IDEMPOTENCY_KEY_TTL_HOURS', 24))
+    lease = timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_LEASE_SECONDS', 60))
+    max_key_length = 255
+    prune_every = 1000
+
+    def __init__(self):
+        self._claims = 0
+
+    def begin(self, request, key):
+        """
+        Claims the key of a write or returns the response to send instead.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The write request.
+        key : str
+            The value of the `Idempotency-Key` header.
+
+        Returns
+        -------
+        tuple
+            The claimed `IdempotencyKey` and `None` if the write should run,
+            otherwise `None` and the response to send: 413 or 422 if the
+            body cannot be fingerprinted.
+        """
+        if not key or len(key) > self.max_key_length:
+            return None, JsonResponse(
+                {'error': f'{IDEMPOTENCY_HEADER} must have 1 to {self.max_key_length} characters'},
+                status=status.HTTP_400_BAD_REQUEST)
+        scope = self.get_scope(request)
+        try:
+            fingerprint = self.get_fingerprint(request)
+        except RequestDataTooBig:
+            return None, JsonResponse(
+                {'error': f'Writes with an {IDEMPOTENCY_HEADER} must not be larger than '
+                          f'{settings.DATA_UPLOAD_MAX_MEMORY_SIZE} bytes'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        except RawPostDataException:
+            return None, JsonResponse(
+                {'error': f'The body of this write was already read and cannot be matched to its {IDEMPOTENCY_HEADER}'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        now = timezone.now()
+        record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+        if record is not None and record.expires_at <= now:
+            record.delete()
+            record = None
+        if record is None:
+            try:
+                record = IdempotencyKey.objects.create(
+                    scope=scope, key=key, fingerprint=fingerprint,
+                    locked_until=now + self.lease, expires_at=now + self.ttl)
+            except IntegrityError:
+                return None, self.conflict()
+            self._claims += 1
+            if self._claims % self.prune_every == 0:
+                job_queue.enqueue('prune_idempotency_keys')
+            return record, None
+        if record.fingerprint != fingerprint:
+            return None, JsonResponse(
+                {'error': f'{IDEMPOTENCY_HEADER} was already used for a different request'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if record.status_code is None:
+            if record.locked_until is not None and record.locked_until > now:
+                return None, self.conflict()
+            taken_over = IdempotencyKey.objects.filter(
+                pk=record.pk, status_code__isnull=True, locked_until=record.locked_until,
+            ).update(locked_until=now + self.lease)
+            if not taken_over:
+                return None, self.conflict()
+            record.locked_until = now + self.lease
+            return record, None
+        response = HttpResponse(
+            zlib.decompress(record.content), status=record.status_code, content_type=record.content_type or None)
+        response[REPLAYED_HEADER] = 'true'
+        return None, response
+
+    def finish(self, record, response):
+        """
+        Stores the response of a write under its claimed key.
+
+        Server errors release the key instead, so the write can be retried.
+
+        Parameters
+        ----------
+        record : IdempotencyKey
+            The key claimed by `begin`.
+        response : HttpResponse
+            The response of the write; rendered if it is not yet.
+
+        Returns
+        -------
+        HttpResponse
+            The response.
+        """
+        if response.status_code >= 500 or response.streaming:
+            record.delete()
+            return response
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        record.status_code = response.status_code
+        record.content_type = response.get('Content-Type', '')
+        record.content = zlib.compress(response.content)
+        record.save(update_fields=['status_code', 'content_type', 'content'])
+        return response
+
+    def prune(self):
+        """
+        Deletes the expired keys.
+
+        Returns
+        -------
+        int
+            The number of deleted keys.
+        """
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def get_scope(self, request):
+        """
+        Returns the digest of the credentials a request was sent with.
+
+        The `Authorization` header is used rather than the user, so the scope
+        is known before authentication and in async views alike.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The request.
+
+        Returns
+        -------
+        str
+            A hex digest; the same for all anonymous requests.
+        """
+        credentials = request.headers.get('Authorization', '')
+        return hashlib.blake2b(credentials.encode(), digest_size=16).hexdigest()
+
+    def get_fingerprint(self, request):
+        """
+        Returns the digest of the method, path, board and body of a request.
+
+        The `X-Board` header is included, so the same write sent to another
+        board is not answered with the first board's response.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The request.
+
+        Returns
+        -------
+        str
+            A hex digest.
+
+        Raises
+        ------
+        RequestDataTooBig
+            If the body is larger than `DATA_UPLOAD_MAX_MEMORY_SIZE`.
+        RawPostDataException
+            If the body was already read as a stream.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{request.method} {request.get_full_path()}\n{request.headers.get("X-Board", "")}\n'.encode())
+        digest.update(request.body)
+        return digest.hexdigest()
+
+    def conflict(self):
+        """
+        Returns the response for a retry of a write that is still running.
+
+        Returns
+        -------
+        JsonResponse
+            A 409 response.
+        """
+        return JsonResponse(
+            {'error': f'A request with this {IDEMPOTENCY_HEADER} is still being processed'},
+            status=status.HTTP_409_CONFLICT)
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,89 @@
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from task_data_app.invalidation import invalidation_bus
+from task_data_app.job_queue import job_queue
+from task_data_app.models import DataVersion, TaskEvent
+
+from .events import task_event_broker
+from .idempotency import idempotency_store
+from .projection import refresh_cards
+from .users import purge_user
+
+
+@job_queue.register('refresh_cards', batch=True)
+def refresh_cards_job(payloads):
+    """
+    Rebuilds the cards scheduled by `schedule_card_refresh`.
+
+    The upsert events of the tasks are logged in the same transaction as
+    their rebuilt cards, so event streams never send the card from before
+    the change. The board version is bumped afterwards, so clients that
+    already revalidated after the write fetch the rebuilt cards.
+
+    Parameters
+    ----------
+    payloads : list of dict
+        Payloads with the `task_ids` whose cards are stale.
+    """
+    task_ids = {task_id for payload in payloads for task_id in payload['task_ids']}
+    with transaction.atomic():
+        refresh_cards(task_ids)
+        task_event_broker.record(TaskEvent.UPSERT, sorted(task_ids))
+        invalidation_bus.publish(DataVersion.BOARD)
+
+
+@job_queue.register('create_auth_tokens', batch=True)
+def create_auth_tokens(payloads):
+    """
+    Creates the API tokens of newly registered users.
+
+    Parameters
+    ----------
+    payloads : list of dict
+        Payloads with the `user_id` of a new user.
+    """
+    user_ids = {payload['user_id'] for payload in payloads}
+    user_ids -= set(Token.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+    Token.objects.bulk_create(
+        [Token(user_id=user_id, key=Token.generate_key()) for user_id in user_ids], ignore_conflicts=True)
+
+
+@job_queue.register('prune_idempotency_keys')
+def prune_idempotency_keys(payload):
+    """
+    Deletes the expired idempotency keys.
+
+    Parameters
+    ----------
+    payload : dict
+        Unused.
+    """
+    idempotency_store.prune()
+
+
+
+@job_queue.register('purge_user')
+def purge_user_job(payload):
+    """
+    Removes a deleted user together with everything that refers to them.
+
+    Parameters
+    ----------
+    payload : dict
+        Payload with the `user_id` of the deleted user.
+    """
+    purge_user(payload['user_id'])
+
+
+@job_queue.register('prune_task_events')
+def prune_task_events(payload):
+    """
+    Deletes the task events older than the retention period.
+
+    Parameters
+    ----------
+    payload : dict
+        Unused.
+    """
+    task_event_broker.prune()
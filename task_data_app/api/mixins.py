@@ -0,0 +1,264 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from task_data_app.models import Board, VersionConflict
+from task_data_app.routers import REPLICA_DB_ALIAS, read_from
+
+from .idempotency import IDEMPOTENCY_HEADER, idempotency_store
+
+
+class ReplicaReadMixin:
+    """
+    View mixin routing the reads of safe requests to the read-only replica.
+
+    Clients that need to see their own just-made writes can pin a request to
+    the primary with the `X-Read-Primary: 1` header or `?primary=1`.
+
+    Methods
+    -------
+    dispatch(request, *args, **kwargs)
+        Handles the request with reads routed to the replica if allowed.
+    wants_primary(request)
+        Checks whether the request asked to read from the primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Handles the request with reads routed to the replica if allowed.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The incoming request.
+
+        Returns
+        -------
+        Response
+            The view's response.
+        """
+        if request.method not in SAFE_METHODS or self.wants_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from(REPLICA_DB_ALIAS):
+            return super().dispatch(request, *args, **kwargs)
+
+    def wants_primary(self, request):
+        """
+        Checks whether the request asked to read from the primary.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The incoming request.
+
+        Returns
+        -------
+        bool
+            `True` if the request is pinned to the primary.
+        """
+        value = request.headers.get('X-Read-Primary') or request.GET.get('primary')
+        return value in ('1', 'true', 'True')
+
+
+class BoardScopeMixin:
+    """
+    View mixin scoping a view to the board the request works on.
+
+    The board is chosen with the `X-Board` header or the `board` query
+    parameter; without either, the user's oldest board is used. Users only
+    reach boards they are a member of, anonymous requests only the default
+    board.
+
+    Methods
+    -------
+    get_board()
+        Returns the board of the request.
+    """
+
+    def get_board(self):
+        """
+        Returns the board of the request.
+
+        Returns
+        -------
+        Board
+            The board the request is scoped to.
+
+        Raises
+        ------
+        NotFound
+            If the board does not exist or the user is not a member of it.
+        """
+        if not hasattr(self, '_board'):
+            board_id = self.request.headers.get('X-Board') or self.request.query_params.get('board')
+            if board_id is not None and not board_id.isdigit():
+                raise NotFound('Board not found.')
+            board = Board.objects.for_user(self.request.user, board_id)
+            if board is None:
+                raise NotFound('Board not found.')
+            self._board = board
+        return self._board
+
+
+class IdempotentWriteMixin:
+    """
+    View mixin replaying the first response of writes retried with the same `Idempotency-Key`.
+
+    Writes without the header run as before. Works for sync and async views.
+
+    Methods
+    -------
+    dispatch(request, *args, **kwargs)
+        Handles the request, replaying the stored response of a retried write.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Handles the request, replaying the stored response of a retried write.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The incoming request.
+
+        Returns
+        -------
+        HttpResponse
+            The view's response, or a coroutine returning it for async views.
+        """
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method in SAFE_METHODS or key is None:
+            return super().dispatch(request, *args, **kwargs)
+        if getattr(self, 'view_is_async', False):
+            return self._adispatch_idempotent(key, request, *args, **kwargs)
+        record, response = idempotency_store.begin(request, key)
+        if response is not None:
+            return response
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except BaseException:
+            record.delete()
+            raise
+        return idempotency_store.finish(record, response)
+
+    async def _adispatch_idempotent(self, key, request, *args, **kwargs):
+        """
+        Async variant of `dispatch` for writes with an `Idempotency-Key`.
+        """
+        record, response = await sync_to_async(idempotency_store.begin)(request, key)
+        if response is not None:
+            return response
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+        except BaseException:
+            await record.adelete()
+            raise
+        return await sync_to_async(idempotency_store.finish)(record, response)
+
+
+class VersionedWriteMixin:
+    """
+    View mixin for conditional updates of versioned rows.
+
+    The client names the version its edit is based on with the `If-Match`
+    header (`If-Match: "3"`) or a `version` field in the body; without
+    either, the version read by the request is used. An update of a row
+    that has moved on since then is answered with 409 and the row's current
+    state instead of overwriting it.
+
+    Methods
+    -------
+    apply_expected_version(instance)
+        Sets the version the client's edit is based on on an instance.
+    perform_update(serializer)
+        Saves an update of a generic view against the expected version.
+    handle_exception(exc)
+        Answers version conflicts with 409 and the current state.
+    get_current_state(instance)
+        Returns the current state of a row for a conflict response.
+    """
+
+    def apply_expected_version(self, instance):
+        """
+        Sets the version the client's edit is based on on an instance.
+
+        Parameters
+        ----------
+        instance : VersionedModel
+            The instance about to be updated.
+
+        Raises
+        ------
+        ValidationError
+            If `If-Match` or `version` is not a single version number.
+        """
+        header = self.request.headers.get('If-Match')
+        if header is not None:
+            value = header.strip()
+            if value == '*':
+                return
+            if value.startswith('W/'):
+                value = value[2:]
+            value = value.strip('"')
+            field = 'If-Match'
+        else:
+            value = self.request.data.get('version') if hasattr(self.request.data, 'get') else None
+            field = 'version'
+        if value is None:
+            return
+        try:
+            instance.version = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({field: 'Must be a single version number.'})
+
+    def perform_update(self, serializer):
+        """
+        Saves an update of a generic view against the expected version.
+
+        Parameters
+        ----------
+        serializer : Serializer
+            The validated serializer bound to the instance.
+        """
+        self.apply_expected_version(serializer.instance)
+        serializer.save()
+
+    def handle_exception(self, exc):
+        """
+        Answers version conflicts with 409 and the current state.
+
+        Parameters
+        ----------
+        exc : Exception
+            The exception raised by the handler.
+
+        Returns
+        -------
+        Response
+            The error response.
+        """
+        if isinstance(exc, VersionConflict):
+            current = type(exc.instance).objects.filter(pk=exc.instance.pk).first()
+            return Response({
+                'error': 'The data was changed by someone else',
+                'current': self.get_current_state(current) if current is not None else None,
+            }, status=status.HTTP_409_CONFLICT)
+        return super().handle_exception(exc)
+
+    def get_current_state(self, instance):
+        """
+        Returns the current state of a row for a conflict response.
+
+        Parameters
+        ----------
+        instance : VersionedModel
+            The row as currently stored.
+
+        Returns
+        -------
+        dict
+            The row serialized like the view's responses.
+        """
+        return self.get_serializer(instance).data
@@ -0,0 +1,263 @@
+import asyncio
+import threading
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from task_data_app.models import Task, VersionConflict
+
+from .projection import deferred_card_updates
+
+
+class PendingMove:
+    """
+    The latest requested column of a task, waiting to be written.
+
+    Attributes
+    ----------
+    board_id : int
+        The board the move was requested on.
+    container : int
+        The requested column, one of `Task.Container`.
+    deadline : float
+        Loop time at which the move is written.
+    waiters : list of asyncio.Future
+        One future per request merged into the move, resolved with the
+        written state.
+    """
+
+    def __init__(self, board_id, container, deadline):
+        self.board_id = board_id
+        self.container = container
+        self.deadline = deadline
+        self.waiters = []
+
+
+class MoveQueue:
+    """
+    The pending moves of one event loop and the task writing them.
+
+    Attributes
+    ----------
+    pending : dict
+        The `PendingMove` by board ID and task ID.
+    wakeup : asyncio.Event
+        Set when a move is added to an empty queue.
+    flusher : asyncio.Task
+        The task writing the due moves.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.wakeup = asyncio.Event()
+        self.flusher = None
+
+
+class TaskMoveCoalescer:
+    """
+    Merges the column moves of a task requested within a short window into one write.
+
+    Dragging a card across the board sends a move for every column it
+    passes. The first move of a task opens a window; later moves of the
+    same task within the window only replace the requested column, and
+    when the window closes the final column is written once. Every
+    request is answered with the state that was written.
+
+    Every event loop gets its own queue and flusher, since asyncio
+    primitives cannot be shared between loops; under ASGI all requests of
+    a worker share one loop, while sync servers reach the coalescer
+    through a new loop per request. The flusher of a queue writes the due
+    moves in one transaction, one batch after the other. A move arriving
+    while its task is being written waits for the next batch, so the moves
+    of a task are applied in the order they arrived. A request whose move
+    is not written within `timeout` takes it out of the queue and writes
+    its latest column directly, answering every request waiting for it; a
+    move the flusher has already started writing is waited for instead.
+
+    Attributes
+    ----------
+    window : float
+        Seconds a move waits for later moves of the same task.
+    timeout : float
+        Seconds a request waits for the flusher before writing its move itself.
+
+    Methods
+    -------
+    submit(board_id, task_id, container)
+        Requests a move and waits until the task's final column is written.
+    get_queue(loop)
+        Returns the move queue of an event loop, starting its flusher if needed.
+    write_moves(moves)
+        Writes the final columns of the given tasks in one transaction.
+    """
+    window = getattr(settings, 'TASK_MOVE_COALESCE_WINDOW', 0.3)
+    timeout = getattr(settings, 'TASK_MOVE_TIMEOUT', 5.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = weakref.WeakKeyDictionary()
+
+    async def submit(self, board_id, task_id, container):
+        """
+        Requests a move and waits until the task's final column is written.
+
+        Parameters
+        ----------
+        board_id : int
+            The board of the request; tasks on other boards are not moved.
+        task_id : int
+            The ID of the task to move.
+        container : int
+            The requested column, one of `Task.Container`.
+
+        Returns
+        -------
+        dict or None
+            The ID, column and version the task was written with, or `None`
+            if the board has no such task.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self.get_queue(loop)
+        key = (board_id, task_id)
+        move = queue.pending.get(key)
+        if move is None:
+            move = queue.pending[key] = PendingMove(board_id, container, loop.time() + self.window)
+            queue.wakeup.set()
+        move.container = container
+        waiter = loop.create_future()
+        move.waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if queue.pending.get(key) is not move:
+                return await waiter
+        del queue.pending[key]
+        try:
+            results = await sync_to_async(self.write_moves)({key: move.container})
+        except Exception as exc:
+            self._resolve({key: move}, exc=exc)
+        else:
+            self._resolve({key: move}, results)
+        return await waiter
+
+    def _resolve(self, moves, results=None, exc=None):
+        """
+        Answers the waiters of written moves.
+
+        Parameters
+        ----------
+        moves : dict
+            The written `PendingMove` by board ID and task ID.
+        results : dict, optional
+            The results of `write_moves`.
+        exc : Exception, optional
+            The error the write failed with.
+        """
+        for key, move in moves.items():
+            for waiter in move.waiters:
+                if waiter.done():
+                    continue
+                if exc is not None:
+                    waiter.set_exception(exc)
+                else:
+                    waiter.set_result(results.get(key))
+
+    def get_queue(self, loop):
+        """
+        Returns the move queue of an event loop, starting its flusher if needed.
+
+        Must be called from within the loop.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            The running loop.
+
+        Returns
+        -------
+        MoveQueue
+            The queue of the loop.
+        """
+        with self._lock:
+            queue = self._queues.get(loop)
+            if queue is None or queue.flusher.done():
+                queue = self._queues[loop] = MoveQueue()
+                queue.flusher = loop.create_task(self._flush(queue))
+        return queue
+
+    async def _flush(self, queue):
+        """
+        Writes the due moves of a queue batch by batch while moves are pending.
+
+        Parameters
+        ----------
+        queue : MoveQueue
+            The queue of the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        pending = queue.pending
+        while True:
+            if not pending:
+                queue.wakeup.clear()
+                await queue.wakeup.wait()
+                continue
+            delay = min(move.deadline for move in pending.values()) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = loop.time()
+            due = {key: move for key, move in pending.items() if move.deadline <= now}
+            if not due:
+                continue
+            for key in due:
+                del pending[key]
+            try:
+                results = await sync_to_async(self.write_moves)({key: move.container for key, move in due.items()})
+            except Exception as exc:
+                self._resolve(due, exc=exc)
+                continue
+            self._resolve(due, results)
+
+    def write_moves(self, moves):
+        """
+        Writes the final columns of the given tasks in one transaction.
+
+        A task changed by another write since it was read here is read
+        again, so the move is applied on top of that change.
+
+        Parameters
+        ----------
+        moves : dict
+            The column by board ID and task ID.
+
+        Returns
+        -------
+        dict
+            The ID, column and version written, by board ID and task ID;
+            tasks not on the requested board are left out.
+        """
+        results = {}
+        fields = ('id', 'board_id', 'container', 'done_since', 'version')
+        with deferred_card_updates():
+            tasks = Task.objects.filter(pk__in={task_id for _, task_id in moves}).only(*fields)
+            for task in tasks:
+                container = moves.get((task.board_id, task.pk))
+                if container is None:
+                    continue
+                while task is not None and task.container != container:
+                    task.container = container
+                    try:
+                        task.save(update_fields=['container'])
+                    except VersionConflict:
+                        task = Task.objects.only(*fields).filter(pk=task.pk).first()
+                if task is None:
+                    continue
+                results[task.board_id, task.pk] = {
+                    'id': task.pk,
+                    'container': Task.Container(task.container).label,
+                    'version': task.version,
+                }
+        return results
+
+
+task_move_coalescer = TaskMoveCoalescer()
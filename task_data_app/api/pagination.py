@@ -0,0 +1,40 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class ContactPagination(PageNumberPagination):
+    """
+    Optional page number pagination for the contact list.
+
+    Pagination only kicks in when the client sends a `page_size` query
+    parameter, so existing clients keep receiving the plain list.
+
+    Attributes
+    ----------
+    page_size : None
+        No default page size; unpaginated unless requested.
+    page_size_query_param : str
+        Query parameter holding the requested page size.
+    max_page_size : int
+        Upper bound for the requested page size.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class ArchivePagination(PageNumberPagination):
+    """
+    Page number pagination for the task archive.
+
+    Attributes
+    ----------
+    page_size : int
+        Default number of archived tasks per page.
+    page_size_query_param : str
+        Query parameter holding the requested page size.
+    max_page_size : int
+        Upper bound for the requested page size.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
+from task_data_app.job_queue import job_queue
+from task_data_app.models import Task, TaskCard
+
+from .search import clear_search_index, update_search_index
+
+_pending_cards = ContextVar('pending_task_cards', default=None)
+
+
+@contextmanager
+def deferred_card_updates():
+    """
+    Runs the block in a transaction and refreshes the touched cards once at its end.
+
+    Writes inside the block only collect the IDs of the tasks whose cards
+    changed; the cards are rebuilt right before the block's transaction
+    commits, so a task created with its assignees and subtasks is projected
+    once and in the same transaction.
+
+    Yields
+    ------
+    None
+    """
+    if _pending_cards.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _pending_cards.set(pending)
+    try:
+        with transaction.atomic():
+            yield
+            while pending:
+                task_ids = set(pending)
+                pending.clear()
+                refresh_cards(task_ids)
+    finally:
+        _pending_cards.reset(token)
+
+
+def touch_cards(task_ids):
+    """
+    Marks the cards of the given tasks as stale.
+
+    Inside `deferred_card_updates` the cards are rebuilt at the end of the
+    block; otherwise they are rebuilt right away, in the transaction of the
+    write if there is one. Bulk changes that may lag behind use
+    `schedule_card_refresh` instead.
+
+    Parameters
+    ----------
+    task_ids : iterable of int
+        The IDs of the changed tasks.
+    """
+    task_ids = set(task_ids)
+    if not task_ids:
+        return
+    pending = _pending_cards.get()
+    if pending is not None:
+        pending.update(task_ids)
+    else:
+        refresh_cards(task_ids)
+
+
+def schedule_card_refresh(task_ids):
+    """
+    Rebuilds the cards of the given tasks in a background job.
+
+    The `refresh_cards` job runs once the current transaction commits, so
+    the cards lag behind the write until the job worker gets to them. Only
+    for bulk changes, such as a new priority image shown on every card of
+    its priority, where a request should not rebuild thousands of cards.
+
+    Parameters
+    ----------
+    task_ids : iterable of int
+        The IDs of the changed tasks.
+    """
+    task_ids = set(task_ids)
+    if task_ids:
+        job_queue.enqueue('refresh_cards', {'task_ids': sorted(task_ids)})
+
+
+def build_cards(queryset):
+    """
+    Builds the flattened cards for the given tasks.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        The tasks to build cards for.
+
+    Returns
+    -------
+    list of dict
+        The cards in the format returned by `/api/task/`.
+    """
+    from .views import TaskViewSet
+
+    return TaskViewSet(request=None, format_kwarg=None).get_transformed_tasks(queryset)
+
+
+def refresh_cards(task_ids):
+    """
+    Rebuilds the cards of the given tasks and drops those of deleted tasks.
+
+    The full-text search rows of the tasks are rewritten along with the cards.
+
+    Parameters
+    ----------
+    task_ids : iterable of int
+        The IDs of the tasks whose cards are rebuilt.
+    """
+    task_ids = set(task_ids)
+    cards = build_cards(Task.objects.filter(id__in=task_ids))
+    TaskCard.objects.bulk_create(
+        [TaskCard(task_id=card['id'], data=card) for card in cards],
+        update_conflicts=True, update_fields=['data'], unique_fields=['task'],
+    )
+    deleted_ids = task_ids - {card['id'] for card in cards}
+    if deleted_ids:
+        TaskCard.objects.filter(task_id__in=deleted_ids).delete()
+    update_search_index(cards, deleted_ids)
+
+
+def rebuild_cards(batch_size=500):
+    """
+    Regenerates the whole card projection and search index from the tasks.
+
+    Parameters
+    ----------
+    batch_size : int, optional
+        Number of tasks built and written per batch.
+
+    Returns
+    -------
+    int
+        The number of cards written.
+    """
+    count = 0
+    with transaction.atomic():
+        TaskCard.objects.all().delete()
+        clear_search_index()
+        task_ids = list(Task.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(task_ids), batch_size):
+            cards = build_cards(Task.objects.filter(id__in=task_ids[start:start + batch_size]))
+            TaskCard.objects.bulk_create([TaskCard(task_id=card['id'], data=card) for card in cards])
+            update_search_index(cards)
+            count += len(cards)
+    return count
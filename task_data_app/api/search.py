@@ -0,0 +1,158 @@
+import json
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+
+from task_data_app.models import Task, TaskCard
+
+SEARCH_TABLE = 'task_data_app_task_search'
+
+
+def fts5_available(connection):
+    """
+    Checks whether the task search table exists on the given connection.
+
+    The table is only created by the migrations when SQLite was built with
+    FTS5, so its presence also tells whether FTS5 can be used.
+
+    Parameters
+    ----------
+    connection : DatabaseWrapper
+        The database connection to check.
+
+    Returns
+    -------
+    bool
+        `True` if full-text search is available.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    if not hasattr(connection, '_task_search_available'):
+        connection._task_search_available = SEARCH_TABLE in connection.introspection.table_names()
+    return connection._task_search_available
+
+
+def build_match_query(query):
+    """
+    Turns free text into an FTS5 query matching all words as prefixes.
+
+    Parameters
+    ----------
+    query : str
+        The search text entered by the user.
+
+    Returns
+    -------
+    str
+        The FTS5 MATCH expression, or an empty string if there are no words.
+    """
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def update_search_index(cards, deleted_ids=()):
+    """
+    Writes the search rows of the given cards and removes those of deleted tasks.
+
+    Parameters
+    ----------
+    cards : list of dict
+        The task cards to index.
+    deleted_ids : iterable of int, optional
+        The IDs of deleted tasks.
+    """
+    connection = connections[router.db_for_write(Task)]
+    if not fts5_available(connection):
+        return
+    stale_ids = [card['id'] for card in cards] + list(deleted_ids)
+    with connection.cursor() as cursor:
+        if stale_ids:
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(stale_ids))})", stale_ids
+            )
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, subtasks) VALUES (%s, %s, %s, %s)",
+            [(card['id'], card['title'], card['description'], ' '.join(card['subtasks'])) for card in cards],
+        )
+
+
+def clear_search_index():
+    """
+    Removes all rows from the search index.
+    """
+    connection = connections[router.db_for_write(Task)]
+    if fts5_available(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+
+def search_tasks(query, limit, board):
+    """
+    Searches task titles, descriptions and subtask names on a board.
+
+    Uses the FTS5 index ranked by bm25 when it exists and falls back to
+    case-insensitive substring matching otherwise.
+
+    Parameters
+    ----------
+    query : str
+        The search text entered by the user.
+    limit : int
+        The maximum number of hits.
+    board : Board
+        The board to search; tasks on other boards are never returned.
+
+    Returns
+    -------
+    list of dict
+        The hits, best first, each with the task `id`, a `snippet` with the
+        matched words wrapped in `<mark>`, its `rank` and the task `card`.
+    """
+    connection = connections[router.db_for_read(Task)]
+    if not fts5_available(connection):
+        return search_tasks_without_index(query, limit, board)
+    match = build_match_query(query)
+    if not match:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT s.rowid, snippet({SEARCH_TABLE}, -1, '<mark>', '</mark>', '…', 12), bm25({SEARCH_TABLE}), c.data "
+            f"FROM {SEARCH_TABLE} s JOIN {TaskCard._meta.db_table} c ON c.task_id = s.rowid "
+            f"JOIN {Task._meta.db_table} t ON t.id = s.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND t.board_id = %s ORDER BY bm25({SEARCH_TABLE}) LIMIT %s",
+            [match, board.pk, limit],
+        )
+        rows = cursor.fetchall()
+    return [
+        {'id': task_id, 'snippet': snippet, 'rank': rank, 'card': json.loads(data)}
+        for task_id, snippet, rank, data in rows
+    ]
+
+
+def search_tasks_without_index(query, limit, board):
+    """
+    Searches tasks with `icontains` when FTS5 is not available.
+
+    Parameters
+    ----------
+    query : str
+        The search text entered by the user.
+    limit : int
+        The maximum number of hits.
+    board : Board
+        The board to search.
+
+    Returns
+    -------
+    list of dict
+        The hits in task order, shaped like the results of `search_tasks`.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    matches = Task.objects.filter(board=board).filter(
+        Q(title__icontains=query) | Q(description__icontains=query) | Q(subtask__name__icontains=query)
+    ).values('id')
+    cards = TaskCard.objects.filter(task__in=matches).order_by('task_id').values_list('task_id', 'data')[:limit]
+    return [{'id': task_id, 'snippet': data['title'], 'rank': None, 'card': data} for task_id, data in cards]
@@ -1,13 +1,108 @@
 from rest_framework import serializers
-from task_data_app.models import Task, User, Category, SubTask
+from task_data_app.models import ArchivedTask, Board, PriorityImage, Task, User, Category, SubTask
 import random
-from .utils import authenticate_with_username_and_password
+from .utils import ahash_password
+
+
+class LabelChoiceField(serializers.ChoiceField):
+    """
+    Field storing integer choices but reading and writing their labels.
+
+    Labels are matched case-insensitively, so clients keep sending and
+    receiving the names the API always used.
+
+    Attributes
+    ----------
+    choices_class : IntegerChoices
+        The choices the field maps to.
+
+    Methods
+    -------
+    to_internal_value(data)
+        Converts a label to its integer value.
+    to_representation(value)
+        Converts an integer value to its label.
+    """
+
+    def __init__(self, choices_class, **kwargs):
+        self.choices_class = choices_class
+        self.values_by_label = {label.lower(): value for value, label in choices_class.choices}
+        super().__init__(choices=choices_class.labels, **kwargs)
+
+    def to_internal_value(self, data):
+        """
+        Converts a label to its integer value.
+
+        Parameters
+        ----------
+        data : str
+            The label sent by the client.
+
+        Returns
+        -------
+        int
+            The value of the choice.
+
+        Raises
+        ------
+        serializers.ValidationError
+            If the label matches no choice.
+        """
+        value = self.values_by_label.get(str(data).strip().lower())
+        if value is None:
+            self.fail('invalid_choice', input=data)
+        return value
+
+    def to_representation(self, value):
+        """
+        Converts an integer value to its label.
+
+        Parameters
+        ----------
+        value : int
+            The stored value.
+
+        Returns
+        -------
+        str
+            The label of the choice.
+        """
+        return self.choices_class(value).label
+
+
+class CurrentBoardDefault:
+    """
+    Field default returning the board passed in the serializer context.
+    """
+    requires_context = True
+
+    def __call__(self, serializer_field):
+        return serializer_field.context['board']
+
+
+class BoardCategoryField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for categories of the board passed in the serializer context.
+
+    Without a board in the context no category is accepted.
+    """
+
+    def get_queryset(self):
+        board = self.context.get('board')
+        if board is None:
+            return Category.objects.none()
+        return Category.objects.filter(board=board)
 
 
 class CategorySerializer(serializers.ModelSerializer):
     """
     Serializer for the `Category` model.
 
+    Attributes
+    ----------
+    board : HiddenField
+        The board of the category, taken from the `board` in the context.
+
     Meta
     ----
     model : Category
@@ -15,6 +110,7 @@ class CategorySerializer(serializers.ModelSerializer):
     fields : str
         All fields in the `Category` model are included.
     """
+    board = serializers.HiddenField(default=CurrentBoardDefault())
     class Meta:
         model = Category
         fields = '__all__'
@@ -34,7 +130,63 @@ class SubTaskSerializer(serializers.ModelSerializer):
         model = SubTask
         fields = ['name', 'checked']   
 
-class TaskSerializer(serializers.ModelSerializer):
+class PriorityImageMixin:
+    """
+    Serializer mixin storing the `priorityImg` sent with a task as the image of its priority.
+
+    Images are kept per priority in `PriorityImage` rather than per task,
+    so an image sent with a task becomes the image of every task with its
+    priority. A blank image leaves the stored one alone.
+
+    Methods
+    -------
+    validate(attrs)
+        Rejects an image sent for a task without a priority.
+    save_priority_image(task, image)
+        Stores an image sent with a task as the image of its priority.
+    """
+
+    def validate(self, attrs):
+        """
+        Rejects an image sent for a task without a priority.
+
+        Parameters
+        ----------
+        attrs : dict
+            The validated fields.
+
+        Returns
+        -------
+        dict
+            The validated fields.
+
+        Raises
+        ------
+        ValidationError
+            If `priorityImg` is sent for a task without a priority.
+        """
+        attrs = super().validate(attrs)
+        priority = attrs.get('priority', getattr(self.instance, 'priority', Task.Priority.NONE))
+        if attrs.get('priority_img') and not priority:
+            raise serializers.ValidationError({'priorityImg': 'An image needs a priority to belong to.'})
+        return attrs
+
+    def save_priority_image(self, task, image):
+        """
+        Stores an image sent with a task as the image of its priority.
+
+        Parameters
+        ----------
+        task : Task
+            The saved task.
+        image : str or None
+            The sent image, or `None` if none was sent.
+        """
+        if image:
+            PriorityImage.objects.store(task.priority, image)
+
+
+class TaskSerializer(PriorityImageMixin, serializers.ModelSerializer):
     """
     Serializer for the `Task` model.
 
@@ -42,6 +194,25 @@ class TaskSerializer(serializers.ModelSerializer):
     ----------
     subtask : PrimaryKeyRelatedField
         Field to include related subtasks in the serialized data.
+    category : BoardCategoryField
+        Field for related categories of the `board` in the context, stored
+        in the given order.
+    user : PrimaryKeyRelatedField
+        Field for related users, stored in the given order.
+    container : LabelChoiceField
+        The board column by name.
+    priority : LabelChoiceField
+        The priority by name.
+    priorityImg : CharField
+        The image of the priority; a sent image is stored for the priority,
+        see `PriorityImageMixin`.
+    board : PrimaryKeyRelatedField
+        The board of the task; set by the view, not by the client.
+
+    Methods
+    -------
+    update(instance, validated_data)
+        Updates the task and stores its categories, users and priority image.
 
     Meta
     ----
@@ -51,10 +222,94 @@ class TaskSerializer(serializers.ModelSerializer):
         All fields in the `Task` model are included.
     """
     subtask = serializers.PrimaryKeyRelatedField(many=True, read_only=True, source='subtask_set')
+    category = BoardCategoryField(many=True, required=False)
+    user = serializers.PrimaryKeyRelatedField(
+        many=True, required=False, queryset=User.objects.visible())
+    container = LabelChoiceField(Task.Container, required=False)
+    priority = LabelChoiceField(Task.Priority, required=False)
+    priorityImg = serializers.CharField(source='priority_img', max_length=50, required=False, allow_blank=True)
+    board = serializers.PrimaryKeyRelatedField(read_only=True)
     class Meta:
         model = Task
         fields = '__all__'
 
+    def update(self, instance, validated_data):
+        """
+        Updates the task and stores its categories, users and priority image.
+
+        Parameters
+        ----------
+        instance : Task
+            The task to update.
+        validated_data : dict
+            The validated data for the task.
+
+        Returns
+        -------
+        Task
+            The updated task instance.
+        """
+        category_data = validated_data.pop('category', None)
+        user_data = validated_data.pop('user', None)
+        image = validated_data.pop('priority_img', None)
+        instance = super().update(instance, validated_data)
+        self.save_priority_image(instance, image)
+        if category_data is not None:
+            instance.set_categories(category_data)
+        if user_data is not None:
+            instance.set_assignees(user_data)
+        return instance
+
+
+class BoardSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the `Board` model.
+
+    Meta
+    ----
+    model : Board
+        The model associated with this serializer.
+    fields : list
+        Includes `id`, `name` and `members`.
+    read_only_fields : list
+        Members are managed separately.
+    """
+    class Meta:
+        model = Board
+        fields = ['id', 'name', 'members']
+        read_only_fields = ['members']
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """
+    Validates a drag and drop move of a task to another board column.
+
+    Attributes
+    ----------
+    id : IntegerField
+        The ID of the task.
+    container : LabelChoiceField
+        The target column by name.
+    """
+    id = serializers.IntegerField(min_value=1)
+    container = LabelChoiceField(Task.Container)
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the `ArchivedTask` model.
+
+    Meta
+    ----
+    model : ArchivedTask
+        The model associated with this serializer.
+    fields : list
+        Includes `id`, `title`, `done_since`, `archived_at` and `card`.
+    """
+    class Meta:
+        model = ArchivedTask
+        fields = ['id', 'title', 'done_since', 'archived_at', 'card']
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -85,6 +340,10 @@ class RegisterSerializer(serializers.ModelSerializer):
     -------
     save(**kwargs)
         Validates passwords and creates a new user instance.
+    asave(**kwargs)
+        Async variant of `save` that hashes the password in the hashing pool.
+    build_account()
+        Builds an unsaved user instance from the validated data.
     setNameTag(name)
         Generates a short name tag from the user's full name.
     SetRandomColor()
@@ -119,11 +378,51 @@ class RegisterSerializer(serializers.ModelSerializer):
         User
             The created user instance.
         """
+        account = self.build_account()
+        account.set_password(self.validated_data['password'])
+        account.save()
+
+        return account
+
+    async def asave(self, **kwargs):
+        """
+        Async variant of `save` that hashes the password in the hashing pool.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Additional arguments for the save method.
+
+        Returns
+        -------
+        User
+            The created user instance.
+        """
+        account = self.build_account()
+        account.password = await ahash_password(self.validated_data['password'])
+        await account.asave()
+
+        return account
+
+    def build_account(self):
+        """
+        Builds an unsaved user instance from the validated data.
+
+        Returns
+        -------
+        User
+            The unsaved user instance without a password.
+
+        Raises
+        ------
+        serializers.ValidationError
+            If the password and the repeated password do not match.
+        """
         pw = self.validated_data['password']
         repeated_pw = self.validated_data['repeated_password']
         if pw != repeated_pw:
             raise serializers.ValidationError({'error': 'Passwords do not match'})
-        account = User(
+        return User(
                     name=self.validated_data['name'], 
                     email=self.validated_data['email'].lower(),
                     name_tag=self.setNameTag(self.validated_data['name']),
@@ -131,10 +430,6 @@ class RegisterSerializer(serializers.ModelSerializer):
                     phone=self.validated_data['phone'],
                     is_active=self.validated_data['is_active']
                     )
-        account.set_password(pw)
-        account.save()
-
-        return account
     
     def setNameTag(self, name):
         """
@@ -172,23 +467,32 @@ class RegisterSerializer(serializers.ModelSerializer):
 
 
 
-class NewTaskSerializer(serializers.ModelSerializer):
+class NewTaskSerializer(PriorityImageMixin, serializers.ModelSerializer):
     """
     Serializer for creating a new task.
 
     Attributes
     ----------
-    category : PrimaryKeyRelatedField
-        Field for related categories.
+    category : BoardCategoryField
+        Field for related categories of the `board` in the context.
     user : PrimaryKeyRelatedField
         Field for related users.
     subtasks : SubTaskSerializer
         Nested serializer for related subtasks.
+    container : LabelChoiceField
+        The board column by name.
+    priority : LabelChoiceField
+        The priority by name.
+    priorityImg : CharField
+        The image of the priority; a sent image is stored for the priority,
+        see `PriorityImageMixin`.
+    board : PrimaryKeyRelatedField
+        The board of the task; passed to `save` by the view.
 
     Methods
     -------
     create(validated_data)
-        Creates a new task with associated categories, users, and subtasks.
+        Creates a new task with associated categories, users, subtasks and priority image.
 
     Meta
     ----
@@ -197,12 +501,15 @@ class NewTaskSerializer(serializers.ModelSerializer):
     fields : str
         All fields in the `Task` model are included.
     """
-    category = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=Category.objects.all())
+    category = BoardCategoryField(many=True)
     user = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=User.objects.all())
+        many=True, queryset=User.objects.visible())
     # Nested serializer for subtasks
     subtasks = SubTaskSerializer(many=True, required=False)
+    container = LabelChoiceField(Task.Container, required=False)
+    priority = LabelChoiceField(Task.Priority, required=False)
+    priorityImg = serializers.CharField(source='priority_img', max_length=50, required=False, allow_blank=True)
+    board = serializers.PrimaryKeyRelatedField(read_only=True)
     
     class Meta:
         model = Task
@@ -210,7 +517,7 @@ class NewTaskSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """
-        Creates a new task with associated categories, users, and subtasks.
+        Creates a new task with associated categories, users, subtasks and priority image.
 
         Parameters
         ----------
@@ -225,13 +532,14 @@ class NewTaskSerializer(serializers.ModelSerializer):
         category_data = validated_data.pop('category', [])
         user_data = validated_data.pop('user', [])
         subtask_data = validated_data.pop('subtasks', [])
+        image = validated_data.pop('priority_img', None)
 
         task = Task.objects.create(**validated_data)
-        task.category.set(category_data)  # Set categories
-        task.user.set(user_data)          # Set users
+        self.save_priority_image(task, image)
+        task.set_categories(category_data)
+        task.set_assignees(user_data)
 
-        for subtask in subtask_data:
-             SubTask.objects.create(task=task, **subtask)
+        SubTask.objects.bulk_create([SubTask(task=task, **subtask) for subtask in subtask_data])
 
         return task
 
@@ -250,63 +558,3 @@ class NewUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = '__all__'
-
-class LoginSerializer(serializers.Serializer):
-    """
-    Serializer for user login.
-
-    Attributes
-    ----------
-    email : EmailField
-        The email address of the user.
-    password : CharField
-        The user's password.
-
-    Methods
-    -------
-    validate(attrs)
-        Validates the user's credentials.
-
-    Meta
-    ----
-    model : User
-        The model associated with this serializer.
-    fields : tuple
-        Includes `email` and `password`.
-    read_only_fields : tuple
-        Specifies `email` as a read-only field.
-    """
-    email = serializers.EmailField()
-    password = serializers.CharField(required=True, write_only=True)
-
-    class Meta:
-        model = User
-        fields = ('email' 'password')
-        read_only_fields = ('email',)
-    
-    def validate(self, attrs):
-        """
-        Validates the user's credentials.
-
-        Parameters
-        ----------
-        attrs : dict
-            The input data containing email and password.
-
-        Returns
-        -------
-        User
-            The authenticated user.
-
-        Raises
-        ------
-        serializers.ValidationError
-            If the credentials are invalid or the user is inactive.
-        """
-        user = authenticate_with_username_and_password(attrs['email'], attrs['password'])
-        print (user)
-        if user: 
-            if user.is_active:
-                return user
-        raise serializers.ValidationError('Unable to log in with provided credentials.')
-     
\ No newline at end of file
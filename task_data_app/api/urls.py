@@ -1,15 +1,26 @@
 from django.urls import path, include
-from .views import TaskViewSet, UserViewSet, CategoryViewSet, UserDetail, RegistrationView, CustomLoginView, TaskSummaryView, AuthenticationView
+from django.views.decorators.csrf import csrf_exempt
+from .views import TaskViewSet, UserViewSet, CategoryViewSet, UserDetail, AsyncRegistrationView, AsyncLoginView, ContactImportView, ContactSearchView, TaskSummaryView, TaskEventStreamView, TaskSearchView, TaskCalendarView, TaskArchiveView, TaskArchiveRestoreView, TaskMoveView, AuthenticationView, BootstrapView, BoardViewSet
 urlpatterns = [
     path('task/', TaskViewSet.as_view(), name='task_list'),
     path('task/summary/', TaskSummaryView.as_view(), name='task_summary'),
+    path('task/calendar/', TaskCalendarView.as_view(), name='task_calendar'),
+    path('task/archive/', TaskArchiveView.as_view(), name='task_archive'),
+    path('task/archive/<int:pk>/restore/', TaskArchiveRestoreView.as_view(), name='task_archive_restore'),
+    path('task/move/', csrf_exempt(TaskMoveView.as_view()), name='task_move'),
+    path('task/search/', TaskSearchView.as_view(), name='task_search'),
+    path('task/events/', TaskEventStreamView.as_view(), name='task_events'),
     path('user/', UserViewSet.as_view(), name='user_list'),
     path('user/<int:pk>', UserDetail.as_view(), name='user_detail'),
-    path('user/register/', RegistrationView.as_view(), name='register_user'),
+    path('user/register/', csrf_exempt(AsyncRegistrationView.as_view()), name='register_user'),
     path('user/active/', AuthenticationView.as_view(), name='active_user'),
-    path('user/login/', CustomLoginView.as_view(), name='login_user'),
+    path('user/login/', csrf_exempt(AsyncLoginView.as_view()), name='login_user'),
     path('contact/', UserViewSet.as_view(), name='contact_list'),
-    path('contact/new/', RegistrationView.as_view(), name='contact_detail'),
+    path('contact/new/', csrf_exempt(AsyncRegistrationView.as_view()), name='contact_detail'),
+    path('contact/search/', ContactSearchView.as_view(), name='contact_search'),
+    path('contact/import/', ContactImportView.as_view(), name='contact_import'),
     path('category/', CategoryViewSet.as_view(), name='category_list'),
+    path('board/', BoardViewSet.as_view(), name='board_list'),
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
 ]
\ No newline at end of file
@@ -0,0 +1,66 @@
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from task_data_app.job_queue import job_queue
+from task_data_app.models import BoardMembership, TaskAssignment, User
+
+from .projection import deferred_card_updates
+
+
+def delete_user(user):
+    """
+    Deletes a user right away and leaves the cleanup to a background job.
+
+    The user is flagged as deleted, which hides them from every endpoint;
+    the `purge_user` job then removes everything that refers to them.
+
+    Parameters
+    ----------
+    user : User
+        The user to delete.
+    """
+    with transaction.atomic():
+        user.mark_deleted()
+        job_queue.enqueue('purge_user', {'user_id': user.pk})
+
+
+def purge_user(user_id, batch_size=500):
+    """
+    Removes a deleted user together with everything that refers to them.
+
+    The task assignments are deleted in batches, each in its own transaction
+    that also rebuilds the cards of the affected tasks, so the write lock is
+    never held for long. The tokens, permissions and board memberships are
+    deleted with the user row in a last short transaction.
+
+    Users that are not flagged as deleted are left alone.
+
+    Parameters
+    ----------
+    user_id : int
+        The ID of the deleted user.
+    batch_size : int, optional
+        Number of assignments deleted per transaction.
+
+    Returns
+    -------
+    int
+        The number of deleted assignments.
+    """
+    if not User.objects.filter(pk=user_id, deleted_at__isnull=False).exists():
+        return 0
+    count = 0
+    while True:
+        with deferred_card_updates():
+            ids = list(TaskAssignment.objects.filter(user_id=user_id).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            TaskAssignment.objects.filter(id__in=ids).delete()
+        count += len(ids)
+    with transaction.atomic():
+        Token.objects.filter(user_id=user_id).delete()
+        BoardMembership.objects.filter(user_id=user_id).delete()
+        User.groups.through.objects.filter(user_id=user_id).delete()
+        User.user_permissions.through.objects.filter(user_id=user_id).delete()
+        User.objects.filter(pk=user_id, deleted_at__isnull=False).delete()
+    return count
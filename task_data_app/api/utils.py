@@ -1,38 +1,334 @@
+import asyncio
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from task_data_app.models import User
+from asgiref.sync import sync_to_async
+from rest_framework.authtoken.models import Token
+from task_data_app.models import Board, BoardMembership, DataVersion, User
 from joinbackend.settings import AUTH_USER_MODEL
 
-def authenticate_with_username_and_password(email, password):
+# Dedicated, size-limited pool for the password key derivation. PBKDF2 releases
+# the GIL, so a few threads are enough to keep the event loop free while a burst
+# of logins queues up here instead of on the shared sync_to_async thread.
+password_hashing_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', 4),
+    thread_name_prefix='password-hashing',
+)
+
+CONTACT_PASSWORD = "join356"
+CONTACT_IMPORT_BATCH_SIZE = 500
+
+
+def parse_limit(value, default, maximum):
+    """
+    Parses the `limit` query parameter of a list endpoint.
+
+    Parameters
+    ----------
+    value : str or None
+        The raw parameter; `None` or an empty string selects the default.
+    default : int
+        The limit used when none is given.
+    maximum : int
+        Upper bound for the limit.
+
+    Returns
+    -------
+    int
+        The limit, clamped to 1 through `maximum`.
+
+    Raises
+    ------
+    ValueError
+        If the value is not an integer.
+    """
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    return max(1, min(limit, maximum))
+
+async def ahash_password(password):
+    """
+    Hashes a raw password in the password hashing pool.
+
+    Parameters
+    ----------
+    password : str
+        The raw password to hash.
+
+    Returns
+    -------
+    str
+        The encoded password hash.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hashing_executor, make_password, password)
+
+
+async def acheck_password(password, encoded):
     """
-    Authenticates a user using their email and password.
+    Checks a raw password against an encoded hash in the password hashing pool.
 
     Parameters
     ----------
-    email : str
-        The email address of the user attempting to log in.
     password : str
-        The password provided for authentication.
+        The raw password provided by the client.
+    encoded : str
+        The encoded password stored on the user.
+
+    Returns
+    -------
+    bool
+        `True` if the password matches the hash; otherwise, `False`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hashing_executor, check_password, password, encoded)
+
+
+async def aget_token_user(request, allow_query=False):
+    """
+    Authenticates a plain Django request by its API token.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        The incoming request with an `Authorization: Token <key>` header.
+    allow_query : bool, optional
+        Also accept the token as `?token=`, for clients that cannot send headers.
 
     Returns
     -------
     User or None
-        The authenticated user if the credentials are valid; otherwise, None.
+        The active user owning the token, or `None`.
+    """
+    auth = request.headers.get('Authorization', '').split()
+    key = auth[1] if len(auth) == 2 and auth[0] == 'Token' else None
+    if key is None and allow_query:
+        key = request.GET.get('token')
+    token = await Token.objects.select_related('user').filter(key=key).afirst() if key else None
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
 
-    Notes
-    -----
-    - If the email does not exist or the password is incorrect, None is returned.
-    - Uses `get_object_or_404` to fetch the user instance by email.
+async def aget_request_board(request, user):
     """
-    user = User
-    try:
-        user = get_object_or_404(user, email=email)
-        print("user", user)
-        print("pass", user.password)
-        print("password", password)
-        print("check", user.check_password(password))
-        if user.check_password(password):
-            return user
-    except user.DoesNotExist:
-        print("user not found")
-        return None
\ No newline at end of file
+    Returns the board a plain Django request works on.
+
+    The board is chosen with `X-Board` or `?board=` like in `BoardScopeMixin`.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        The incoming request.
+    user : User
+        The authenticated user.
+
+    Returns
+    -------
+    Board or None
+        The board, or `None` if it does not exist or the user is not a member.
+    """
+    board_id = request.headers.get('X-Board') or request.GET.get('board')
+    if board_id is not None and not board_id.isdigit():
+        return None
+    return await sync_to_async(Board.objects.for_user)(user, board_id)
+
+
+def parse_request_data(request):
+    """
+    Parses the body of a plain Django request into a dictionary.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        The incoming request carrying JSON or form data.
+
+    Returns
+    -------
+    dict
+        The parsed request data, or an empty dict if the body is not valid JSON.
+    """
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST.dict()
+
+
+@lru_cache(maxsize=1)
+def get_contact_password_hash():
+    """
+    Returns the hash of the placeholder password shared by all contacts.
+
+    The hash is computed once per process and reused for every imported
+    contact, since contacts are inactive and cannot log in with it anyway.
+
+    Returns
+    -------
+    str
+        The encoded placeholder password.
+    """
+    return make_password(CONTACT_PASSWORD)
+
+
+def read_contact_rows(content, file_format):
+    """
+    Reads contact rows from CSV or JSON content.
+
+    Parameters
+    ----------
+    content : str
+        The raw file content.
+    file_format : str
+        Either ``'csv'`` or ``'json'``.
+
+    Returns
+    -------
+    list of dict
+        The contact rows with `email`, `name` and optional `phone` keys.
+
+    Raises
+    ------
+    ValueError
+        If the format is unknown or the content cannot be parsed.
+    """
+    if file_format == 'csv':
+        return list(csv.DictReader(io.StringIO(content)))
+    if file_format == 'json':
+        rows = json.loads(content)
+        if isinstance(rows, dict):
+            rows = rows.get('contacts', [])
+        if not isinstance(rows, list):
+            raise ValueError("JSON content must be a list of contacts")
+        return rows
+    raise ValueError(f"Unsupported contact format: {file_format}")
+
+
+def get_existing_emails(contacts):
+    """
+    Returns the emails of a contact import that already belong to a user.
+
+    Parameters
+    ----------
+    contacts : dict
+        The contacts to import by normalised email.
+
+    Returns
+    -------
+    set of str
+        The emails that are taken.
+    """
+    existing_emails = User.objects.annotate(email_lower=Lower('email'))
+    if len(contacts) <= CONTACT_IMPORT_BATCH_SIZE:
+        existing_emails = existing_emails.filter(email_lower__in=list(contacts))
+    # Large imports would exceed SQLite's bound-parameter limit with `IN`, so
+    # they read every email in one pass instead.
+    return set(existing_emails.values_list('email_lower', flat=True)) & contacts.keys()
+
+
+def import_contacts(rows):
+    """
+    Creates inactive contacts in bulk.
+
+    Emails are validated and normalised up front, duplicates inside the batch
+    and against existing users are dropped with a single lookup query, and the
+    new contacts are inserted with `bulk_create` sharing one precomputed
+    placeholder hash. `bulk_create` sends no `post_save`, so the contacts
+    join the default board here, like new users do in `join_default_board`.
+    No tokens are created for the inactive contacts. If a registration or
+    another import takes one of the emails in the meantime, the insert is
+    retried without it and the email is reported as skipped.
+
+    Parameters
+    ----------
+    rows : list of dict
+        The contact rows with `email`, `name` and optional `phone` keys.
+
+    Returns
+    -------
+    dict
+        The number of created contacts, the skipped emails and the row errors.
+    """
+    from .serializers import RegisterSerializer
+
+    errors = []
+    contacts = {}
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({'row': index, 'error': 'Invalid contact'})
+            continue
+        email = str(row.get('email') or '').strip().lower()
+        name = str(row.get('name') or '').strip()
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append({'row': index, 'error': 'Invalid email', 'email': email})
+            continue
+        if not name:
+            errors.append({'row': index, 'error': 'Name is required', 'email': email})
+            continue
+        try:
+            phone = int(row.get('phone') or 0)
+        except (TypeError, ValueError):
+            errors.append({'row': index, 'error': 'Invalid phone', 'email': email})
+            continue
+        if email not in contacts:
+            contacts[email] = (name, phone)
+
+    password = get_contact_password_hash()
+    helper = RegisterSerializer()
+    while True:
+        existing = get_existing_emails(contacts)
+        new_users = [
+            User(
+                email=email,
+                name=name,
+                name_lower=name.casefold(),
+                name_tag=helper.setNameTag(name),
+                color=helper.SetRandomColor(),
+                phone=phone,
+                is_active=False,
+                password=password,
+            )
+            for email, (name, phone) in contacts.items()
+            if email not in existing
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(new_users, batch_size=CONTACT_IMPORT_BATCH_SIZE)
+                if new_users:
+                    board = Board.objects.default()
+                    BoardMembership.objects.bulk_create(
+                        [BoardMembership(board=board, user=user) for user in new_users],
+                        batch_size=CONTACT_IMPORT_BATCH_SIZE,
+                    )
+                    DataVersion.bump(DataVersion.BOARD)
+            break
+        except IntegrityError:
+            # A registration or import running at the same time took one of
+            # the emails; retry without the emails that exist now.
+            if get_existing_emails(contacts) <= existing:
+                raise
+
+    return {
+        'created': len(new_users),
+        'skipped': sorted(existing),
+        'errors': errors,
+    }
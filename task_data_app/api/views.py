@@ -1,10 +1,21 @@
-from datetime import datetime
-
-from rest_framework import generics
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import router, transaction
+from django.db.models import Count, Min, Prefetch, Q
+from django.db.models.functions import Lower
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views import View
+from rest_framework import generics, serializers
 from rest_framework.authtoken.models import Token
-from rest_framework.authtoken.views import APIView, ObtainAuthToken
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from task_data_app.models import Task, User, Category, SubTask
+from rest_framework.authtoken.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from task_data_app.models import ArchivedTask, Board, BoardMembership, Task, User, Category, SubTask, DataVersion, TaskAssignment, TaskCard, TaskCategory
+from task_data_app.job_queue import job_queue
+from task_data_app.registry import category_registry
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import get_user_model
@@ -16,137 +27,187 @@ from .serializers import (
     CategorySerializer, 
     NewTaskSerializer, 
     NewUserSerializer,
-    LoginSerializer,
+    ArchivedTaskSerializer,
+    BoardSerializer,
+    TaskMoveSerializer,
 )
+from .archive import restore_task
+from .pagination import ArchivePagination, ContactPagination
 from .permissions import IsOwnerOAdmin
+from .events import format_event, task_event_broker
+from .filters import CalendarRangeSerializer, TaskFilterSerializer
+from .moves import task_move_coalescer
+from .mixins import BoardScopeMixin, IdempotentWriteMixin, ReplicaReadMixin, VersionedWriteMixin
+from .projection import deferred_card_updates
+from .search import search_tasks
+from .utils import acheck_password, aget_request_board, aget_token_user, parse_limit, parse_request_data, import_contacts, read_contact_rows
+from .users import delete_user
 
 
 
 
-class RegistrationView(APIView):
+class AsyncRegistrationView(IdempotentWriteMixin, View):
     """
-    API view for user registration.
+    Async API view for user and contact registration.
+
+    The password hash is computed in the dedicated hashing pool and the user
+    is stored through the async ORM, so a burst of registrations does not tie
+    up the worker threads serving the other endpoints.
 
     Methods
     -------
     post(request)
         Handles the registration of a new user.
     """
-    permission_classes = [AllowAny]
 
-    def post(self, request):
+    async def post(self, request):
         """
         Handles the registration of a new user.
 
         Parameters
         ----------
-        request : Request
+        request : HttpRequest
             The HTTP request containing user registration data.
 
         Returns
         -------
-        Response
+        JsonResponse
             A response indicating the success or failure of the registration.
         """
-        if request.data.get('contact'):
-            request.data['password'] = "join356"
-            request.data['repeated_password'] = "join356"
-            request.data['is_active'] = False
-
-
+        data = parse_request_data(request)
+        if data.get('contact'):
+            data['password'] = "join356"
+            data['repeated_password'] = "join356"
+            data['is_active'] = False
         else:
-            request.data['is_active'] = True
-            request.data['phone'] = 0
+            data['is_active'] = True
+            data['phone'] = 0
 
-        serializer = RegisterSerializer(data=request.data)
-        if serializer.is_valid():
-            print(serializer.validated_data['password'] )
-            saved_account = serializer.save()
-            token, created = Token.objects.get_or_create(user=saved_account)
-            return Response({'message': 'Account created successfully',}, status=201)
-        return Response(serializer.errors, status=200)
+        serializer = RegisterSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=200)
+        try:
+            saved_account = await serializer.asave()
+        except serializers.ValidationError as e:
+            return JsonResponse(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        await sync_to_async(job_queue.enqueue)('create_auth_tokens', {'user_id': saved_account.pk})
+        return JsonResponse({'message': 'Account created successfully',}, status=201)
 
 
-class CustomLoginView(ObtainAuthToken):
+class AsyncLoginView(View):
     """
-    Custom API view for user login.
+    Async API view for user login.
+
+    The user is looked up through the async ORM and the password is checked
+    in the dedicated hashing pool.
 
     Methods
     -------
     post(request)
         Handles user authentication and token generation.
     """
-    permission_classes = [AllowAny]
-    serializer_class = LoginSerializer
-    def post(self, request):
+
+    async def post(self, request):
         """
         Handles user authentication and token generation.
 
         Parameters
         ----------
-        request : Request
+        request : HttpRequest
             The HTTP request containing login credentials.
 
         Returns
         -------
-        Response
+        JsonResponse
             A response with the user's token and additional information.
         """
-        serializer = self.serializer_class(data=request.data)
-        print("serializer", serializer)
-        print("serializer.data", serializer.is_valid())
-        data = {}
+        data = parse_request_data(request)
+        email = data.get('email')
+        password = data.get('password')
+        if not email:
+            return JsonResponse({'error': 'Email field is requiered'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = await get_user_model().objects.visible().filter(email=email).afirst()
+        if user is None:
+            return JsonResponse({'error': 'User does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        if not user.is_active:
+            return JsonResponse({'error': 'User is not active'}, status=status.HTTP_403_FORBIDDEN)
+        if not password or not await acheck_password(password, user.password):
+            return JsonResponse({'error': 'Wrong username or password'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        token, created = await Token.objects.aget_or_create(user=user)
+        data = {
+            'token': token.key,
+            'name': user.name,
+            'name_tag': user.name_tag
+        }
+        return JsonResponse(data, status=status.HTTP_200_OK)
+
+
+class ContactImportView(IdempotentWriteMixin, APIView):
+    """
+    API view for importing contacts in bulk.
+
+    Methods
+    -------
+    post(request)
+        Imports contacts from a JSON list or an uploaded CSV/JSON file.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Imports contacts from a JSON list or an uploaded CSV/JSON file.
+
+        Parameters
+        ----------
+        request : Request
+            The HTTP request containing a list of contacts, or a `file` upload
+            whose name ends in `.csv` or `.json`.
+
+        Returns
+        -------
+        Response
+            A response with the number of created contacts, skipped emails and row errors.
+        """
+        upload = request.FILES.get('file')
         try:
-            serializer.is_valid(raise_exception=True)
-        except Exception as e:
-            print(e)
-            return Response({'error': 'Wrong username or password'}, status=status.HTTP_401_UNAUTHORIZED)
-        if serializer.is_valid():
-            user_data = serializer.validated_data
-            if user_data.email:
-                try:
-                    token, created = Token.objects.get_or_create(user=user_data)
-                    data = {
-                        'token': token.key,
-                        'name': user_data.name,
-                        'name_tag': user_data.name_tag
-                    }
-                    return Response(data, status=status.HTTP_200_OK)
-                except User.DoesNotExist:
-                    print("User does not exist")
-                    return Response({'error': 'User does not exist'}, status=status.HTTP_404_NOT_FOUND)
-        else:
-            user_data = serializer.data
-            print("user_data")
-            if serializer.data.get('email'):
-                try:
-                    user=get_user_model().objects.get(email=user_data['email'])
-                    if not user.is_active:
-                        return Response({'error': 'User is not active'}, status=status.HTTP_403_FORBIDDEN)
-                    else:
-                        print("wrong password")
-                        return Response({'error': 'Wrong username or password'}, status=status.HTTP_401_UNAUTHORIZED)
-                except get_user_model().DoesNotExist:
-                    return Response({'error': 'User does not exist'}, status=status.HTTP_404_NOT_FOUND)
+            if upload is not None:
+                file_format = upload.name.rsplit('.', 1)[-1].lower()
+                rows = read_contact_rows(upload.read().decode('utf-8-sig'), file_format)
+            elif isinstance(request.data, list):
+                rows = request.data
             else:
-                return Response({'error': 'Email field is requiered'}, status=status.HTTP_400_BAD_REQUEST)
-
+                rows = request.data.get('contacts', [])
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(rows, list):
+            return Response({'error': 'Contacts must be a list'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(import_contacts(rows), status=201)
 
 
-class TaskViewSet(generics.ListCreateAPIView):
+class TaskViewSet(IdempotentWriteMixin, VersionedWriteMixin, BoardScopeMixin, ReplicaReadMixin, generics.ListCreateAPIView):
     """
-    ViewSet for managing tasks.
+    ViewSet for managing the tasks of a board.
 
     Methods
     -------
     get(request, *args, **kwargs)
-        Retrieves all tasks.
+        Retrieves all tasks, or those matching the given filters.
+    get_queryset()
+        Returns the tasks of the request's board.
+    get_cards(board)
+        Reads the board from the denormalized card projection.
+    get_transformed_tasks(queryset=None)
+        Builds the transformed board data for all tasks.
     post(request)
         Creates a new task.
     put(request)
-        Updates an existing task.
+        Updates an existing task unless it changed since the given version.
     delete(request)
         Deletes a task.
+    get_current_state(instance)
+        Returns the current card of a task for a conflict response.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
@@ -156,6 +217,10 @@ class TaskViewSet(generics.ListCreateAPIView):
         """
         Retrieves all tasks with detailed transformation.
 
+        The tasks can be narrowed down with the `assignee`, `category`,
+        `priority`, `container`, `due_after` and `due_before` query parameters,
+        see `TaskFilterSerializer`.
+
         Parameters
         ----------
         request : Request
@@ -164,33 +229,99 @@ class TaskViewSet(generics.ListCreateAPIView):
         Returns
         -------
         Response
-            A response containing transformed task data.
+            A response containing transformed task data, or the validation
+            errors of the filters with status 400.
         """
-        queryset = self.get_queryset()
+        filters = TaskFilterSerializer(data=request.query_params, context={'board': self.get_board()})
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        if filters.validated_data:
+            return Response(filters.filter_cards(self.get_board()))
+        return Response(self.get_cards(self.get_board()))
+
+    def get_queryset(self):
+        """
+        Returns the tasks of the request's board.
+
+        Returns
+        -------
+        QuerySet
+            The tasks of the board.
+        """
+        return Task.objects.filter(board=self.get_board())
+
+    def get_cards(self, board):
+        """
+        Reads the board from the denormalized card projection.
+
+        Parameters
+        ----------
+        board : Board
+            The board to read.
+
+        Returns
+        -------
+        list of dict
+            The tasks in the format expected by the board, read with one query.
+        """
+        tasks = Task.objects.filter(board=board).values('pk')
+        return list(TaskCard.objects.filter(task_id__in=tasks).order_by('task_id').values_list('data', flat=True))
+
+    def get_transformed_tasks(self, queryset=None):
+        """
+        Builds the transformed board data for all tasks.
+
+        Category name, color and name tag are embedded from the category
+        registry, so they cost no queries per task. Assignees and categories
+        are read in their stored order with one query each for all tasks.
+
+        Parameters
+        ----------
+        queryset : QuerySet, optional
+            The tasks to transform; defaults to all tasks.
+
+        Returns
+        -------
+        list of dict
+            The tasks in the format expected by the board.
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
         data = serializer.data
+        categories = category_registry.get_categories()
+        task_ids = [task["id"] for task in data]
+        assignees = self.get_assignees(task_ids)
+        category_ids = self.get_category_ids(task_ids)
         transformed_data = []
 
         for task in data:
+            users = assignees[task["id"]]
+            task_category_ids = category_ids[task["id"]]
             transformed_task = {
                 "container": task["container"],
-                "category": task["category"],
+                "category": task_category_ids,
+                "categories": [categories[i] for i in task_category_ids if i in categories],
                 "title": task["title"],
                 "description": task["description"],
                 "date": task["due_date"],
                 "priority": task["priority"],
                 "priorityImg": task["priorityImg"],
-                "associates": task["user"],
-                "assignedTo": self.get_assigned_to_names(task["user"]),
-                "assignedToNameTag": self.get_name_tags(task["user"]),
-                "assignedToColor": self.get_assigned_colors(task["user"]),
+                "associates": [user["id"] for user in users],
+                "assignedTo": [user["name"] for user in users],
+                "assignedToNameTag": [user["name_tag"] for user in users],
+                "assignedToColor": [user["color"] for user in users],
                 "subtasks": self.get_subtask_titles(task["subtask"]),
                 "subtaskschecked": self.get_subtask_statuses(task["subtask"]),
+                "subtaskTotal": task["subtask_total"],
+                "subtaskDone": task["subtask_done"],
                 "id": task["id"],
+                "version": task["version"],
+                "board": task["board"],
             }
             transformed_data.append(transformed_task)
 
-        return Response(transformed_data)
+        return transformed_data
 
     def get_category_names(self, category_ids):
         """
@@ -206,56 +337,57 @@ class TaskViewSet(generics.ListCreateAPIView):
         list of str
             List of category names associated with the provided IDs.
         """
-        return list(Category.objects.filter(id__in=category_ids).values_list('name', flat=True))
-
-    def get_assigned_to_names(self, user_ids):
-        """
-        Converts user IDs to user names.
-
-        Parameters
-        ----------
-        user_ids : list of int
-            List of user IDs associated with the task.
-
-        Returns
-        -------
-        list of str
-            List of names corresponding to the provided user IDs.
-        """
-        return list(User.objects.filter(id__in=user_ids).values_list('name', flat=True))
+        return [category['name'] for category in category_registry.get(category_ids)]
 
-    def get_name_tags(self, user_ids):
+    def get_assignees(self, task_ids):
         """
-        Generates name tags from user IDs.
+        Retrieves the assigned users of the given tasks in assignment order.
 
         Parameters
         ----------
-        user_ids : list of int
-            List of user IDs associated with the task.
+        task_ids : list of int
+            List of task IDs.
 
         Returns
         -------
-        list of str
-            List of name tags corresponding to the provided user IDs.
+        dict
+            Mapping of task ID to a list of dicts with the user's `id`, `name`,
+            `name_tag` and `color`, fetched with a single join. Deleted users
+            are left out.
         """
-        return list(User.objects.filter(id__in=user_ids).values_list('name_tag', flat=True))
-
-    def get_assigned_colors(self, user_ids):
+        assignees = {task_id: [] for task_id in task_ids}
+        rows = TaskAssignment.objects.filter(task_id__in=task_ids, user__deleted_at__isnull=True).order_by(
+            'task_id', 'position', 'id').values(
+            'task_id', 'user_id', 'user__name', 'user__name_tag', 'user__color')
+        for row in rows:
+            assignees[row['task_id']].append({
+                'id': row['user_id'],
+                'name': row['user__name'],
+                'name_tag': row['user__name_tag'],
+                'color': row['user__color'],
+            })
+        return assignees
+
+    def get_category_ids(self, task_ids):
         """
-        Retrieves assigned colors for users based on their IDs.
+        Retrieves the category IDs of the given tasks in their stored order.
 
         Parameters
         ----------
-        user_ids : list of int
-            List of user IDs associated with the task.
+        task_ids : list of int
+            List of task IDs.
 
         Returns
         -------
-        list of str
-            List of colors corresponding to the provided user IDs.
+        dict
+            Mapping of task ID to its ordered list of category IDs.
         """
-        users = User.objects.filter(id__in=user_ids)
-        return [user.color for user in users]
+        category_ids = {task_id: [] for task_id in task_ids}
+        rows = TaskCategory.objects.filter(task_id__in=task_ids).order_by('task_id', 'position', 'id').values_list(
+            'task_id', 'category_id')
+        for task_id, category_id in rows:
+            category_ids[task_id].append(category_id)
+        return category_ids
 
     def get_subtask_titles(self, subtask_ids):
         """
@@ -304,17 +436,22 @@ class TaskViewSet(generics.ListCreateAPIView):
         Response
             A response with the created task data or errors.
         """
-        serializer = NewTaskSerializer(data=request.data)
+        board = self.get_board()
+        serializer = NewTaskSerializer(data=request.data, context={'board': board})
         if serializer.is_valid():
-            serializer.save()
-            all_tasks = TaskSerializer(Task.objects.all(), many=True).data
+            with deferred_card_updates():
+                serializer.save(board=board)
+            all_tasks = TaskSerializer(self.get_queryset(), many=True).data
             return Response(all_tasks, status=201)
         else:
             return Response(serializer.errors, status=400)
 
     def put(self, request):
         """
-        Updates an existing task.
+        Updates an existing task unless it changed since the given version.
+
+        The version is taken from the `If-Match` header or the `version`
+        field, see `VersionedWriteMixin`.
 
         Parameters
         ----------
@@ -324,13 +461,16 @@ class TaskViewSet(generics.ListCreateAPIView):
         Returns
         -------
         Response
-            A response with the updated task data or errors.
+            A response with the updated task data or errors, or 409 with the
+            task's current card if it was changed in the meantime.
         """
-        task = Task.objects.get(id=request.data["id"])
-        serilizer = TaskSerializer(task, data=request.data)
+        task = get_object_or_404(self.get_queryset(), id=request.data["id"])
+        self.apply_expected_version(task)
+        serilizer = TaskSerializer(task, data=request.data, context={'board': self.get_board()})
         if serilizer.is_valid():
-            serilizer.save()
-            all_tasks = TaskSerializer(Task.objects.all(), many=True).data
+            with deferred_card_updates():
+                serilizer.save()
+            all_tasks = TaskSerializer(self.get_queryset(), many=True).data
             return Response(all_tasks, status=201)
         else:
             return Response(serilizer.errors, status=400)
@@ -349,22 +489,311 @@ class TaskViewSet(generics.ListCreateAPIView):
         Response
             A response with the remaining tasks after deletion.
         """
-        task = Task.objects.get(id=request.data["id"])
-        task.delete()
-        all_tasks = TaskSerializer(Task.objects.all(), many=True).data
+        task = get_object_or_404(self.get_queryset(), id=request.data["id"])
+        with deferred_card_updates():
+            task.delete()
+        all_tasks = TaskSerializer(self.get_queryset(), many=True).data
         return Response(all_tasks, status=201)
 
+    def get_current_state(self, instance):
+        """
+        Returns the current card of a task for a conflict response.
+
+        Parameters
+        ----------
+        instance : Task
+            The task as currently stored.
+
+        Returns
+        -------
+        dict
+            The task in the format expected by the board.
+        """
+        return self.get_transformed_tasks(Task.objects.filter(pk=instance.pk))[0]
+
+
+class TaskSearchView(BoardScopeMixin, ReplicaReadMixin, APIView):
+    """
+    API view for full-text search over the tasks of a board.
+
+    Attributes
+    ----------
+    permission_classes : list
+        Permissions required to access the view.
+    default_limit : int
+        Number of hits returned when no `limit` is given.
+    max_limit : int
+        Upper bound for the requested number of hits.
+
+    Methods
+    -------
+    get(request)
+        Searches task titles, descriptions and subtask names.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        """
+        Searches task titles, descriptions and subtask names.
+
+        Parameters
+        ----------
+        request : Request
+            The HTTP request with the search text in `q` and an optional `limit`.
+
+        Returns
+        -------
+        Response
+            A response containing the ranked hits with snippets and task cards,
+            or 400 if `limit` is not an integer.
+        """
+        try:
+            limit = parse_limit(request.query_params.get('limit'), self.default_limit, self.max_limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(search_tasks(request.query_params.get('q', ''), limit, self.get_board()))
+
+
+class TaskArchiveView(BoardScopeMixin, ReplicaReadMixin, generics.ListAPIView):
+    """
+    View listing the archived tasks of a board, most recently archived first.
+
+    Attributes
+    ----------
+    serializer_class : Serializer
+        The serializer for archived tasks.
+    pagination_class : Pagination
+        Page number pagination with `page` and `page_size`.
+    permission_classes : list
+        Permissions required to access the view.
+
+    Methods
+    -------
+    get_queryset()
+        Returns the archived tasks of the request's board in listing order.
+    """
+    serializer_class = ArchivedTaskSerializer
+    pagination_class = ArchivePagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Returns the archived tasks of the request's board in listing order.
+
+        Returns
+        -------
+        QuerySet
+            The archived tasks, most recently archived first.
+        """
+        return ArchivedTask.objects.filter(board=self.get_board()).order_by('-archived_at', '-id')
+
+
+class TaskArchiveRestoreView(IdempotentWriteMixin, BoardScopeMixin, APIView):
+    """
+    API view moving an archived task back onto the board.
+
+    Methods
+    -------
+    post(request, pk)
+        Restores the archived task with the given ID.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        """
+        Restores the archived task with the given ID.
+
+        Parameters
+        ----------
+        request : Request
+            The HTTP request.
+        pk : int
+            The ID of the archived task.
+
+        Returns
+        -------
+        Response
+            A response with the restored task's card, or 404 if the board has
+            no archived task with the ID.
+        """
+        archived_task = ArchivedTask.objects.filter(pk=pk, board=self.get_board()).first()
+        if archived_task is None:
+            return Response({'error': 'Archived task not found'}, status=status.HTTP_404_NOT_FOUND)
+        task = restore_task(archived_task)
+        return Response(TaskCard.objects.get(task=task).data, status=status.HTTP_201_CREATED)
+
 
-class TaskSummaryView(generics.ListAPIView):
+class TaskEventStreamView(View):
     """
-    View for retrieving task summaries.
+    Async Server-Sent Events stream of the task changes on a board.
+
+    The board is chosen like in the other task views, with `X-Board` or
+    `?board=`. Clients authenticate with the usual `Authorization: Token <key>` header,
+    or with `?token=` since `EventSource` cannot send headers. A reconnecting
+    client resumes after the ID in `Last-Event-ID` (or `?lastEventId=`); if
+    that event has already been pruned, a `reset` event tells it to reload
+    the board.
+
+    Attributes
+    ----------
+    keepalive_interval : float
+        Seconds of silence after which a comment is sent to keep the connection open.
+
+    Methods
+    -------
+    get(request)
+        Opens the event stream.
+    """
+    keepalive_interval = 15
+
+    async def get(self, request):
+        """
+        Opens the event stream.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The HTTP request.
+
+        Returns
+        -------
+        StreamingHttpResponse or JsonResponse
+            The event stream, 401 if the token is missing or invalid, or 404
+            if the user is not a member of the board.
+        """
+        user = await aget_token_user(request, allow_query=True)
+        if user is None:
+            return JsonResponse({'detail': 'Invalid token.'}, status=status.HTTP_401_UNAUTHORIZED)
+        board = await aget_request_board(request, user)
+        if board is None:
+            return JsonResponse({'detail': 'Board not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('lastEventId')
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_event_id = None
+
+        response = StreamingHttpResponse(self.stream(board.pk, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, board_id, last_event_id):
+        """
+        Yields the missed events and then the live events as SSE messages.
+
+        Upserts and deletes of tasks on other boards are skipped. Deletes
+        logged before they carried a board are passed on; clients ignore IDs
+        they do not know.
+
+        Parameters
+        ----------
+        board_id : int
+            The ID of the board whose changes are streamed.
+        last_event_id : int or None
+            The ID of the last event the client received.
+
+        Yields
+        ------
+        str
+            The SSE messages.
+        """
+        queue = await task_event_broker.subscribe()
+        try:
+            yield f"retry: {int(task_event_broker.poll_interval * 2000)}\n\n"
+            if last_event_id is not None:
+                first_id = await sync_to_async(task_event_broker.get_first_id)()
+                if first_id is not None and first_id > last_event_id + 1:
+                    yield format_event({'id': last_event_id, 'event': 'reset', 'data': {}})
+                last_id, events = await sync_to_async(task_event_broker.fetch_events)(last_event_id)
+                while events:
+                    for event in events:
+                        if event['data'].get('board', board_id) == board_id:
+                            yield format_event(event)
+                    last_event_id = last_id
+                    last_id, events = await sync_to_async(task_event_broker.fetch_events)(last_event_id)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), self.keepalive_interval)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                if last_event_id is not None and event['id'] <= last_event_id:
+                    continue
+                if event['data'].get('board', board_id) != board_id:
+                    continue
+                yield format_event(event)
+        finally:
+            task_event_broker.unsubscribe(queue)
+
+
+class TaskMoveView(IdempotentWriteMixin, View):
+    """
+    Async API view moving a task to another board column.
+
+    Meant for drag and drop: the moves of a task sent within a short window
+    are merged by `TaskMoveCoalescer` and only the final column is written,
+    in one transaction. Every request is acknowledged with the state that
+    was written, without the full board. Clients authenticate with the
+    usual `Authorization: Token <key>` header and choose the board with
+    `X-Board` or `?board=`.
+
+    Methods
+    -------
+    post(request)
+        Moves the task and answers with its written state.
+    """
+
+    async def post(self, request):
+        """
+        Moves the task and answers with its written state.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The HTTP request with the task `id` and the target `container`.
+
+        Returns
+        -------
+        JsonResponse
+            The task's ID, written column and version, and whether a later
+            move replaced the requested column; 400 for invalid data, 401
+            without a valid token, 404 if the board has no such task.
+        """
+        user = await aget_token_user(request)
+        if user is None:
+            return JsonResponse({'detail': 'Invalid token.'}, status=status.HTTP_401_UNAUTHORIZED)
+        board = await aget_request_board(request, user)
+        if board is None:
+            return JsonResponse({'detail': 'Board not found.'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = TaskMoveSerializer(data=parse_request_data(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        container = serializer.validated_data['container']
+        result = await task_move_coalescer.submit(board.pk, serializer.validated_data['id'], container)
+        if result is None:
+            return JsonResponse({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+        return JsonResponse({**result, 'superseded': result['container'] != Task.Container(container).label})
+
+
+class TaskSummaryView(BoardScopeMixin, ReplicaReadMixin, generics.ListAPIView):
+    """
+    View for retrieving the task summary of a board.
 
     Methods
     -------
     get(request)
         Retrieves a summary of tasks, including priority counts and due dates.
+    get_queryset()
+        Returns the tasks of the request's board.
+    get_summary()
+        Builds the task summary, including counts by priority and containers.
     """
-    queryset = Task.objects.all()
     serializer_class = TaskSerializer
 
     def get(self, request):
@@ -381,36 +810,152 @@ class TaskSummaryView(generics.ListAPIView):
         Response
             A response with task summary data.
         """
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(self.get_summary())
+
+    def get_queryset(self):
+        """
+        Returns the tasks of the request's board.
+
+        Returns
+        -------
+        QuerySet
+            The tasks of the board.
+        """
+        return Task.objects.filter(board=self.get_board())
+
+    def get_summary(self):
+        """
+        Builds the task summary, including counts by priority and containers.
+
+        All counts and the earliest due date come from one aggregate query.
+
+        Returns
+        -------
+        dict
+            The summary counts and the earliest due date, or `None` as the due
+            date if no task has one.
+        """
+        counts = self.get_queryset().aggregate(
+            urgent=Count('id', filter=Q(priority=Task.Priority.URGENT)),
+            total=Count('id'),
+            to_do=Count('id', filter=Q(container=Task.Container.TO_DO)),
+            await_feedback=Count('id', filter=Q(container=Task.Container.AWAIT_FEEDBACK)),
+            in_progress=Count('id', filter=Q(container=Task.Container.IN_PROGRESS)),
+            done=Count('id', filter=Q(container=Task.Container.DONE)),
+            earliest_due_date=Min('due_date'),
+        )
+        earliest_due_date = counts['earliest_due_date']
         summaryTasks = {
-            0: 0,
-            1: 0,
-            2: 0,
-            3: 0,
-            4: 0,
-            5: 0,
-            6: None
+            0: counts['urgent'],
+            1: counts['total'],
+            2: counts['to_do'],
+            3: counts['await_feedback'],
+            4: counts['in_progress'],
+            5: counts['done'],
+            6: earliest_due_date.strftime("%Y-%m-%d") if earliest_due_date else None,
         }
-        for task in serializer.data:
-            summaryTasks[1] += 1
-            if task["priority"] == "Urgent":                
-                summaryTasks[0] += 1 
-            if task["container"] == "to-do-con":
-                summaryTasks[2] += 1
-            if task["container"] == "await-feedback-con":                
-                summaryTasks[3] += 1
-            if task["container"] == "in-progress-con":                
-                summaryTasks[4] += 1                
-            if task["container"] == "done-con":                
-                summaryTasks[5] += 1
 
-            task_due_date = datetime.strptime(task["due_date"], "%Y-%m-%d")
-            if summaryTasks[6] is None or task_due_date < summaryTasks[6]:
-                summaryTasks[6] = task_due_date
+        return summaryTasks
+
+
+class TaskCalendarView(BoardScopeMixin, ReplicaReadMixin, APIView):
+    """
+    API view returning the tasks of a board due in a date range, bucketed by day.
+
+    Methods
+    -------
+    get(request)
+        Retrieves the deadline calendar for the requested date range.
+    get_calendar(board, start, end, today)
+        Builds the day buckets and the overdue and undated counts.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Retrieves the deadline calendar for the requested date range.
+
+        The response carries an `ETag` made of the board, its version, the
+        range and the current day, so a client can cache each range and revalidate
+        it with `If-None-Match`; an unchanged calendar is answered with 304.
+
+        Parameters
+        ----------
+        request : Request
+            The HTTP request with the optional `from` and `to` dates.
+
+        Returns
+        -------
+        Response
+            A response with the calendar, 304 if unchanged, or the validation
+            errors of the range with status 400.
+        """
+        date_range = CalendarRangeSerializer(data=request.query_params)
+        if not date_range.is_valid():
+            return Response(date_range.errors, status=status.HTTP_400_BAD_REQUEST)
+        start, end = date_range.validated_data['from'], date_range.validated_data['to']
+        today = timezone.localdate()
+        board = self.get_board()
+        with transaction.atomic(using=router.db_for_read(DataVersion)):
+            version = DataVersion.get_version(DataVersion.BOARD)
+            etag = f'"calendar-{board.pk}-{version}-{start}-{end}-{today}"'
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            data = self.get_calendar(board, start, end, today)
+        return Response(data, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+    def get_calendar(self, board, start, end, today):
+        """
+        Builds the day buckets and the overdue and undated counts.
+
+        Days are counted with one grouped range query on the due date index
+        and the cards of the range are read with a second one. Tasks without
+        a due date never fall into a bucket; they are only counted as
+        `undated`. Overdue tasks are those due before today that are not done,
+        independent of the requested range.
 
-        summaryTasks[6] = summaryTasks[6].strftime("%Y-%m-%d")
+        Parameters
+        ----------
+        board : Board
+            The board whose tasks are bucketed.
+        start : date
+            First day of the range.
+        end : date
+            Last day of the range.
+        today : date
+            The current day, used for the overdue count.
 
-        return Response(summaryTasks)
+        Returns
+        -------
+        dict
+            The range, the days with tasks in ascending order and the
+            overdue and undated counts.
+        """
+        tasks = Task.objects.filter(board=board)
+        in_range = tasks.filter(due_date__range=(start, end))
+        counts = (
+            in_range.order_by('due_date').values('due_date')
+            .annotate(count=Count('id'), done=Count('id', filter=Q(container=Task.Container.DONE)))
+        )
+        days = {
+            row['due_date']: {'date': row['due_date'], 'count': row['count'], 'done': row['done'], 'tasks': []}
+            for row in counts
+        }
+        cards = (
+            TaskCard.objects.filter(task__board=board, task__due_date__range=(start, end))
+            .order_by('task__due_date', 'task_id').values_list('task__due_date', 'data')
+        )
+        for due_date, card in cards:
+            days[due_date]['tasks'].append(card)
+        overdue = tasks.filter(due_date__lt=today).exclude(container=Task.Container.DONE).count()
+        undated = tasks.filter(due_date__isnull=True).count()
+        return {
+            'from': start,
+            'to': end,
+            'days': list(days.values()),
+            'overdue': overdue,
+            'undated': undated,
+        }
 
 
 class AuthenticationView(APIView):
@@ -419,14 +964,14 @@ class AuthenticationView(APIView):
         return Response({"message": "Authenticated"})
 
 
-class UserViewSet(generics.ListCreateAPIView):
+class UserViewSet(IdempotentWriteMixin, VersionedWriteMixin, ReplicaReadMixin, generics.ListCreateAPIView):
     """
     ViewSet for managing user-related operations.
 
     Attributes
     ----------
     queryset : QuerySet
-        The queryset containing all User instances.
+        The queryset containing all users that are not deleted.
     serializer_class : Serializer
         The serializer class for serializing and deserializing User instances.
     permission_classes : list
@@ -435,20 +980,29 @@ class UserViewSet(generics.ListCreateAPIView):
     Methods
     -------
     get(request)
-        Retrieves all users in a transformed format.
+        Retrieves all users as contacts.
+    get_contacts(letter='')
+        Builds the contact queryset ordered by name.
     put(request)
-        Updates an existing user's details.
+        Updates an existing user's details unless they changed since the given version.
     delete(request)
-        Deletes a user by ID.
+        Deletes a user by ID and cleans up after them in the background.
     post(request)
         Creates a new user.
     """
-    queryset = User.objects.all()
+    queryset = User.objects.visible()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ContactPagination
+    contact_fields = ('id', 'name', 'name_tag', 'color', 'phone', 'email', 'version')
+
     def get(self, request):
         """
-        Retrieves all users and transforms their data.
+        Retrieves all users as contacts.
+
+        Only the contact fields are selected, in a single query. The list can
+        be narrowed to names starting with `?letter=` and paginated with
+        `?page_size=` and `?page=`.
 
         Parameters
         ----------
@@ -458,28 +1012,39 @@ class UserViewSet(generics.ListCreateAPIView):
         Returns
         -------
         Response
-            A response containing transformed user data.
+            A response containing the contact data.
         """
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        contacts = []
-
-        for user in data:
-            transformed_user = {
-                "id": user["id"],
-                "name": user["name"],
-                "name_tag": user["name_tag"],
-                "color": user["color"],
-                "phone": user["phone"],
-                "email": user["email"]
-            }
-            contacts.append(transformed_user)
-        return Response(contacts)
+        queryset = self.get_contacts(request.query_params.get('letter', ''))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+
+    def get_contacts(self, letter=''):
+        """
+        Builds the contact queryset ordered by name.
+
+        Parameters
+        ----------
+        letter : str, optional
+            Only include contacts whose name starts with this letter.
+
+        Returns
+        -------
+        QuerySet
+            A values queryset with the contact fields.
+        """
+        queryset = User.objects.visible().order_by('name_lower', 'id')
+        letter = letter[:1].casefold()
+        if letter:
+            queryset = queryset.filter(name_lower__gte=letter, name_lower__lt=letter + chr(0x10FFFF))
+        return queryset.values(*self.contact_fields)
     
     def put (self, request):
         """
-        Updates an existing user's details.
+        Updates an existing user's details unless they changed since the given version.
+
+        The cards of the user's tasks are rebuilt in the same transaction.
 
         Parameters
         ----------
@@ -489,22 +1054,27 @@ class UserViewSet(generics.ListCreateAPIView):
         Returns
         -------
         Response
-            A response with the updated user data or errors.
+            A response with the contacts or errors, or 409 with the user's
+            current data if they were changed in the meantime.
         """
-        user = User.objects.get(id=request.data["id"])
+        user = get_object_or_404(User.objects.visible(), id=request.data["id"])
+        self.apply_expected_version(user)
         pw = user.password;
         serilizer = UserSerializer(user, data=request.data)
         if serilizer.is_valid():
             serilizer.validated_data['password'] = pw
-            serilizer.save()
-            all_users = UserSerializer(User.objects.all(), many=True).data
-            return Response(all_users, status=201)
+            with deferred_card_updates():
+                serilizer.save()
+            return Response(list(self.get_contacts()), status=201)
         else:
             return Response(serilizer.errors, status=400)
         
     def delete(self, request):
         """
-        Deletes a user by ID.
+        Deletes a user by ID and cleans up after them in the background.
+
+        The user is only flagged as deleted here, so the response does not
+        wait for their assignments and cards to be rewritten.
 
         Parameters
         ----------
@@ -514,12 +1084,11 @@ class UserViewSet(generics.ListCreateAPIView):
         Returns
         -------
         Response
-            A response with the remaining users after deletion.
+            A response with the remaining contacts.
         """
-        user = User.objects.get(id=request.data["id"])
-        user.delete()
-        all_users = UserSerializer(User.objects.all(), many=True).data
-        return Response(all_users, status=201)
+        user = get_object_or_404(User.objects.visible(), id=request.data["id"])
+        delete_user(user)
+        return Response(list(self.get_contacts()), status=201)
     
     def post(self, request):
         """
@@ -533,44 +1102,137 @@ class UserViewSet(generics.ListCreateAPIView):
         Returns
         -------
         Response
-            A response with the created user data or errors.
+            A response with the contacts, including the new user, or errors.
         """
         serializer = NewUserSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
-            all_users = UserSerializer(User.objects.all(), many=True).data
-            return Response(all_users, status=201)
+            return Response(list(self.get_contacts()), status=201)
         else:
             return Response(serializer.errors, status=400)
 
 
-class UserDetail(generics.RetrieveUpdateDestroyAPIView):
+class ContactSearchView(ReplicaReadMixin, APIView):
+    """
+    API view for the contact autocomplete of the assignee picker.
+
+    Attributes
+    ----------
+    permission_classes : list
+        Permissions required to access the view.
+    default_limit : int
+        Number of matches returned when no `limit` is given.
+    max_limit : int
+        Upper bound for the requested number of matches.
+
+    Methods
+    -------
+    get(request)
+        Retrieves the contacts whose name or email starts with the query.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        """
+        Retrieves the contacts whose name or email starts with the query.
+
+        Matching is case-insensitive and runs as range scans over the indexed
+        casefolded `name_lower` column and the lowercase `email` index, so
+        only the matching index entries are read.
+
+        Parameters
+        ----------
+        request : Request
+            The HTTP request with the search prefix in `q` and an optional `limit`.
+
+        Returns
+        -------
+        Response
+            A response containing up to `limit` contacts, name matches first,
+            or 400 if `limit` is not an integer.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response([])
+        try:
+            limit = parse_limit(request.query_params.get('limit'), self.default_limit, self.max_limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = User.objects.visible()
+        prefix = query.casefold()
+        contacts = list(
+            queryset.filter(name_lower__gte=prefix, name_lower__lt=prefix + chr(0x10FFFF))
+            .order_by('name_lower')
+            .values(*UserViewSet.contact_fields)[:limit]
+        )
+        if len(contacts) < limit:
+            found = [contact['id'] for contact in contacts]
+            prefix = query.lower()
+            contacts += queryset.annotate(email_lower=Lower('email')).filter(
+                email_lower__gte=prefix, email_lower__lt=prefix + chr(0x10FFFF)).exclude(
+                id__in=found
+            ).order_by('email_lower').values(*UserViewSet.contact_fields)[:limit - len(contacts)]
+        return Response(contacts)
+
+
+class UserDetail(IdempotentWriteMixin, VersionedWriteMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     View for retrieving, updating, or deleting a specific user.
 
     Attributes
     ----------
     queryset : QuerySet
-        The queryset containing all User instances.
+        The queryset containing all users that are not deleted.
     serializer_class : Serializer
         The serializer class for serializing and deserializing User instances.
     permission_classes : list
         Permissions required to access the view.
+
+    Methods
+    -------
+    perform_update(serializer)
+        Saves the user and rebuilds the cards showing them in the same transaction.
+    perform_destroy(instance)
+        Deletes the user and cleans up after them in the background.
     """
-    queryset = User.objects.all()
+    queryset = User.objects.visible()
     serializer_class = UserSerializer
     permission_classes = [IsOwnerOAdmin]
 
+    def perform_update(self, serializer):
+        """
+        Saves the user and rebuilds the cards showing them in the same transaction.
+
+        Parameters
+        ----------
+        serializer : Serializer
+            The validated serializer bound to the user.
+        """
+        with deferred_card_updates():
+            super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the user and cleans up after them in the background.
+
+        Parameters
+        ----------
+        instance : User
+            The user to delete.
+        """
+        delete_user(instance)
+
 
 
-class CategoryViewSet(generics.ListCreateAPIView):
+class CategoryViewSet(IdempotentWriteMixin, BoardScopeMixin, ReplicaReadMixin, generics.ListCreateAPIView):
     """
-    ViewSet for managing categories.
+    ViewSet for managing the categories of a board.
 
     Attributes
     ----------
-    queryset : QuerySet
-        The queryset containing all Category instances.
     serializer_class : Serializer
         The serializer class for serializing and deserializing Category instances.
     permission_classes : list
@@ -579,15 +1241,20 @@ class CategoryViewSet(generics.ListCreateAPIView):
     Methods
     -------
     get(request)
-        Retrieves all categories.
+        Retrieves all categories of the board.
+    get_queryset()
+        Returns the categories of the request's board.
+    get_serializer_context()
+        Adds the request's board, which new categories are created on.
+    perform_create(serializer)
+        Saves the category, refreshing touched cards in the same transaction.
     """
-    queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """
-        Retrieves all categories.
+        Retrieves all categories of the board.
 
         Parameters
         ----------
@@ -602,4 +1269,135 @@ class CategoryViewSet(generics.ListCreateAPIView):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
\ No newline at end of file
+
+    def get_queryset(self):
+        """
+        Returns the categories of the request's board.
+
+        Returns
+        -------
+        QuerySet
+            The categories of the board.
+        """
+        return Category.objects.filter(board=self.get_board())
+
+    def get_serializer_context(self):
+        """
+        Adds the request's board, which new categories are created on.
+
+        Returns
+        -------
+        dict
+            The serializer context.
+        """
+        return {**super().get_serializer_context(), 'board': self.get_board()}
+
+    def perform_create(self, serializer):
+        """
+        Saves the category, refreshing touched cards in the same transaction.
+
+        Parameters
+        ----------
+        serializer : Serializer
+            The validated category serializer.
+        """
+        with deferred_card_updates():
+            serializer.save()
+    
+
+class BoardViewSet(IdempotentWriteMixin, generics.ListCreateAPIView):
+    """
+    ViewSet listing the boards of the user and creating new ones.
+
+    Attributes
+    ----------
+    serializer_class : Serializer
+        The serializer class for boards.
+    permission_classes : list
+        Permissions required to access the view.
+
+    Methods
+    -------
+    get_queryset()
+        Returns the boards the user is a member of.
+    perform_create(serializer)
+        Creates a board with the user as its first member.
+    """
+    serializer_class = BoardSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Returns the boards the user is a member of.
+
+        Returns
+        -------
+        QuerySet
+            The user's boards, oldest first.
+        """
+        return Board.objects.filter(memberships__user=self.request.user).order_by('id').prefetch_related(
+            Prefetch('members', queryset=User.objects.visible()))
+
+    def perform_create(self, serializer):
+        """
+        Creates a board with the user as its first member.
+
+        Parameters
+        ----------
+        serializer : BoardSerializer
+            The validated serializer.
+        """
+        with transaction.atomic():
+            board = serializer.save()
+            BoardMembership.objects.create(board=board, user=self.request.user)
+
+
+class BootstrapView(BoardScopeMixin, ReplicaReadMixin, APIView):
+    """
+    API view returning everything the board needs on load in one round trip.
+
+    Methods
+    -------
+    get(request)
+        Retrieves board, tasks, contacts, categories, summary and login state.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Retrieves board, tasks, contacts, categories, summary and login state.
+
+        Tasks, categories and summary are those of the request's board;
+        contacts are shared by all boards.
+
+        All payloads are read inside one transaction on the read database, so
+        they come from the same snapshot. The response carries the board version as its `ETag`;
+        a request whose `If-None-Match` matches it gets a 304 without any of
+        the payloads being built.
+
+        Parameters
+        ----------
+        request : Request
+            The HTTP request.
+
+        Returns
+        -------
+        Response
+            A response with the combined payloads, or 304 if unchanged.
+        """
+        board = self.get_board()
+        with transaction.atomic(using=router.db_for_read(DataVersion)):
+            version = DataVersion.get_version(DataVersion.BOARD)
+            etag = f'"board-{board.pk}-{version}"'
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            data = {
+                'version': version,
+                'board': {'id': board.pk, 'name': board.name},
+                'tasks': TaskViewSet().get_cards(board),
+                'contacts': list(UserViewSet().get_contacts()),
+                'categories': CategorySerializer(Category.objects.filter(board=board), many=True).data,
+                'summary': TaskSummaryView(request=request, format_kwarg=None).get_summary(),
+                'active': {"message": "Authenticated"},
+            }
+        return Response(data, headers={'ETag': etag})
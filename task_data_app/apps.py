@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TaskDataAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_data_app'
+
+    def ready(self):
+        from . import registry, signals  # noqa: F401
+        from .api import jobs  # noqa: F401
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from .models import DataVersion
+
+
+class InvalidationBus:
+    """
+    Cross-worker invalidation bus built on the `DataVersion` table.
+
+    Publishing a key bumps its version row inside the writing transaction and
+    runs the local handlers right away. Every worker compares the version rows
+    with the versions it last saw, at most once per `poll_interval`, and runs
+    the handlers of every key that moved. The state lives in the database, so
+    it needs no extra service and a restarted worker simply starts with empty
+    caches.
+
+    Attributes
+    ----------
+    poll_interval : float
+        Minimum number of seconds between two polls of the version rows.
+
+    Methods
+    -------
+    subscribe(key, handler)
+        Registers a handler to run when the key is invalidated.
+    publish(key)
+        Invalidates the key in all workers.
+    poll(force=False)
+        Runs the handlers of keys invalidated by other workers.
+    """
+    poll_interval = getattr(settings, 'INVALIDATION_POLL_INTERVAL', 0.05)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = defaultdict(list)
+        self._versions = None
+        self._polled_at = 0.0
+
+    def subscribe(self, key, handler):
+        """
+        Registers a handler to run when the key is invalidated.
+
+        Parameters
+        ----------
+        key : str
+            The `DataVersion` key to watch.
+        handler : callable
+            Called without arguments on invalidation.
+        """
+        self._handlers[key].append(handler)
+
+    def publish(self, key):
+        """
+        Invalidates the key in all workers.
+
+        Parameters
+        ----------
+        key : str
+            The `DataVersion` key that changed.
+        """
+        DataVersion.bump(key)
+        self._notify(key)
+
+    def poll(self, force=False):
+        """
+        Runs the handlers of keys invalidated by other workers.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Poll even if the last poll is more recent than `poll_interval`.
+        """
+        now = time.monotonic()
+        if not force and now - self._polled_at < self.poll_interval:
+            return
+        self._polled_at = now
+        versions = dict(DataVersion.objects.values_list('key', 'version'))
+        with self._lock:
+            previous, self._versions = self._versions, versions
+        if previous is None:
+            return
+        for key, version in versions.items():
+            if previous.get(key) != version:
+                self._notify(key)
+
+    def _notify(self, key):
+        """
+        Runs the local handlers of a key.
+
+        Parameters
+        ----------
+        key : str
+            The invalidated key.
+        """
+        for handler in self._handlers[key]:
+            handler()
+
+
+invalidation_bus = InvalidationBus()
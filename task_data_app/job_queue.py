@@ -0,0 +1,298 @@
+import logging
+import threading
+import traceback
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Database-backed queue for work the requests do not have to wait for.
+
+    Jobs are rows in the `Job` table, so they survive restarts and can be
+    enqueued by any worker. Enqueueing is deferred to the commit of the
+    current transaction, so a job never runs for writes that rolled back.
+    A worker claims due jobs with a lease, runs them on a thread pool and
+    deletes them once they succeeded; failed jobs are retried with a
+    growing delay until `max_attempts` is reached.
+
+    Handlers registered with `batch=True` get all claimed payloads of their
+    job name in one call, so bursts of similar jobs are handled together.
+
+    The worker runs embedded in the app process, started with the first
+    enqueued job, or on its own with the `run_jobs` management command.
+
+    Attributes
+    ----------
+    workers : int
+        Number of threads running jobs.
+    poll_interval : float
+        Seconds between two looks for due jobs when the worker is not woken up.
+    batch_size : int
+        Maximum number of jobs claimed at once.
+    max_attempts : int
+        Number of attempts after which a job is marked as failed.
+    lease : timedelta
+        How long a claimed job is reserved for its worker.
+    embedded : bool
+        Whether enqueueing starts a worker in the app process.
+
+    Methods
+    -------
+    register(name, batch=False)
+        Decorator registering the handler of a job name.
+    enqueue(name, payload=None, delay=None)
+        Adds a job once the current transaction commits.
+    run_pending()
+        Claims the due jobs and runs them.
+    start()
+        Starts the worker thread if it is not running.
+    stop()
+        Stops the worker thread.
+    join()
+        Waits until the worker thread has stopped.
+    wake()
+        Makes the worker look for due jobs right away.
+    """
+    workers = getattr(settings, 'JOB_QUEUE_WORKERS', 2)
+    poll_interval = getattr(settings, 'JOB_QUEUE_POLL_INTERVAL', 1.0)
+    batch_size = 100
+    max_attempts = getattr(settings, 'JOB_QUEUE_MAX_ATTEMPTS', 5)
+    lease = timedelta(minutes=5)
+    embedded = getattr(settings, 'JOB_QUEUE_EMBEDDED_WORKER', True)
+
+    def __init__(self):
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    def register(self, name, batch=False):
+        """
+        Decorator registering the handler of a job name.
+
+        Parameters
+        ----------
+        name : str
+            The job name.
+        batch : bool, optional
+            Pass the handler a list of all claimed payloads instead of one
+            payload per call.
+
+        Returns
+        -------
+        callable
+            The decorator, which returns the handler unchanged.
+        """
+        def decorator(handler):
+            self._handlers[name] = (handler, batch)
+            return handler
+        return decorator
+
+    def enqueue(self, name, payload=None, delay=None):
+        """
+        Adds a job once the current transaction commits.
+
+        Outside a transaction the job is added right away.
+
+        Parameters
+        ----------
+        name : str
+            The name of a registered handler.
+        payload : dict, optional
+            The JSON-serializable arguments of the job.
+        delay : timedelta, optional
+            How long to wait before running the job.
+
+        Raises
+        ------
+        KeyError
+            If no handler is registered for the name.
+        """
+        if name not in self._handlers:
+            raise KeyError(f"No job handler registered for {name!r}.")
+
+        def add():
+            Job.objects.create(name=name, payload=payload or {}, run_at=timezone.now() + (delay or timedelta()))
+            if self.embedded:
+                self.start()
+            self.wake()
+
+        transaction.on_commit(add)
+
+    def run_pending(self):
+        """
+        Claims the due jobs and runs them.
+
+        Returns
+        -------
+        int
+            The number of claimed jobs.
+        """
+        jobs = self.claim()
+        if not jobs:
+            return 0
+        groups = defaultdict(list)
+        for job in jobs:
+            groups[job.name].append(job)
+        executor = self._executor
+        if executor is None:
+            for group in groups.values():
+                self.run_group(group)
+        else:
+            for future in [executor.submit(self.run_group, group) for group in groups.values()]:
+                future.result()
+        return len(jobs)
+
+    def claim(self):
+        """
+        Leases the due jobs to this worker.
+
+        Returns
+        -------
+        list of Job
+            The claimed jobs in the order they are due.
+        """
+        now = timezone.now()
+        token = uuid.uuid4().hex
+        due = Job.objects.filter(failed=False, run_at__lte=now).filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        ids = list(due.order_by('run_at', 'id').values_list('id', flat=True)[:self.batch_size])
+        if not ids:
+            return []
+        due.filter(id__in=ids).update(locked_until=now + self.lease, lock_token=token)
+        return list(Job.objects.filter(lock_token=token).order_by('run_at', 'id'))
+
+    def run_group(self, jobs):
+        """
+        Runs claimed jobs of one name and records the outcome.
+
+        Parameters
+        ----------
+        jobs : list of Job
+            Claimed jobs sharing a name.
+        """
+        close_old_connections()
+        try:
+            handler, batch = self._handlers.get(jobs[0].name, (None, False))
+            if handler is None:
+                self.record_failure(jobs, f"No job handler registered for {jobs[0].name!r}.")
+            elif batch:
+                self.run_jobs(jobs, lambda: handler([job.payload for job in jobs]))
+            else:
+                for job in jobs:
+                    self.run_jobs([job], lambda job=job: handler(job.payload))
+        finally:
+            close_old_connections()
+
+    def run_jobs(self, jobs, call):
+        """
+        Runs a handler call and deletes or reschedules its jobs.
+
+        Parameters
+        ----------
+        jobs : list of Job
+            The jobs the call handles.
+        call : callable
+            Runs the handler.
+        """
+        try:
+            call()
+        except Exception:
+            logger.exception("Job %s failed.", jobs[0].name)
+            self.record_failure(jobs, traceback.format_exc())
+        else:
+            Job.objects.filter(id__in=[job.id for job in jobs]).delete()
+
+    def record_failure(self, jobs, error):
+        """
+        Reschedules failed jobs with a growing delay, or marks them as failed.
+
+        Parameters
+        ----------
+        jobs : list of Job
+            The failed jobs.
+        error : str
+            The error to store.
+        """
+        now = timezone.now()
+        for job in jobs:
+            job.attempts += 1
+            job.failed = job.attempts >= self.max_attempts
+            job.run_at = now + timedelta(seconds=min(2 ** job.attempts, 300))
+            job.locked_until = None
+            job.lock_token = ''
+            job.last_error = error
+        Job.objects.bulk_update(jobs, ['attempts', 'failed', 'run_at', 'locked_until', 'lock_token', 'last_error'])
+
+    def start(self):
+        """
+        Starts the worker thread if it is not running.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job-worker')
+            self._thread = threading.Thread(target=self.work, name='job-dispatcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the worker thread after the jobs it is running.
+        """
+        with self._lock:
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        self._stopping.set()
+        self._wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        if executor is not None:
+            executor.shutdown()
+
+    def join(self):
+        """
+        Waits until the worker thread has stopped.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def wake(self):
+        """
+        Makes the worker look for due jobs right away.
+        """
+        self._wakeup.set()
+
+    def work(self):
+        """
+        Runs due jobs until the worker is stopped.
+        """
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                claimed = self.run_pending()
+            except Exception:
+                logger.exception("Job queue poll failed.")
+                claimed = 0
+            finally:
+                close_old_connections()
+            if claimed < self.batch_size:
+                self._wakeup.wait(self.poll_interval)
+
+
+job_queue = JobQueue()
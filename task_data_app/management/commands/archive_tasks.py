@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from task_data_app.api.archive import archive_tasks
+
+
+class Command(BaseCommand):
+    """
+    Management command moving long-done tasks off the board into the archive.
+    """
+    help = "Archives tasks that have been in the done column for more than the given number of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Days a task must have been done.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Tasks archived per transaction.")
+
+    def handle(self, *args, **options):
+        count = archive_tasks(options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {count} tasks."))
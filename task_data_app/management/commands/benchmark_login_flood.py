@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import check_password
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from rest_framework.authtoken.models import Token
+
+from task_data_app.api.projection import refresh_cards
+from task_data_app.models import Board, BoardMembership, Task, User
+
+
+class Command(BaseCommand):
+    """
+    Management command measuring the board's read latency during a login flood.
+
+    A benchmark user, board and tasks are created and removed again at the
+    end. Requests go through the ASGI handler in-process. `/api/task/` is
+    read in a loop three times: on an idle server, while concurrent clients
+    log in through the async login endpoint, and while the same number of
+    clients hash passwords on the thread serving the synchronous views, as
+    the former synchronous login view did. The command reports the median
+    and p99 latency of every run.
+    """
+    help = "Benchmarks /api/task/ latency while a flood of logins is running."
+
+    email = 'login-benchmark@example.com'
+    password = 'login-benchmark'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=16, help="Number of concurrent login clients.")
+        parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each run.")
+        parser.add_argument('--tasks', type=int, default=50, help="Number of tasks on the benchmark board.")
+
+    def handle(self, *args, **options):
+        user, board = self.create_sample_data(options['tasks'])
+        try:
+            token = Token.objects.create(user=user)
+            for flood in ('idle', 'async', 'sync'):
+                with override_settings(ALLOWED_HOSTS=['testserver']):
+                    latencies = asyncio.run(self.run_flood(flood, token.key, board.pk, user.password, options))
+                latencies.sort()
+                self.stdout.write(
+                    f"{flood:>5}: {len(latencies):6d} reads "
+                    f"p50 {latencies[len(latencies) // 2] * 1000:8.1f} ms "
+                    f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:8.1f} ms"
+                )
+        finally:
+            board.delete()
+            user.delete()
+
+    def create_sample_data(self, count):
+        """
+        Creates the benchmark user with a board of their own.
+
+        The tasks are created in bulk, which skips the signals, so their
+        cards are built explicitly for `/api/task/` to serve them.
+
+        Parameters
+        ----------
+        count : int
+            Number of tasks on the board.
+
+        Returns
+        -------
+        tuple
+            The user and the board.
+        """
+        User.objects.filter(email=self.email).delete()
+        user = User.objects.create_user(self.email, self.password, name='Login Benchmark')
+        board = Board.objects.create(name='Login benchmark')
+        BoardMembership.objects.create(board=board, user=user)
+        tasks = Task.objects.bulk_create([Task(board=board, title=f'Task {i}') for i in range(count)])
+        refresh_cards(task.pk for task in tasks)
+        return user, board
+
+    async def run_flood(self, flood, token, board_id, encoded, options):
+        """
+        Reads the board in a loop while the given kind of flood is running.
+
+        Parameters
+        ----------
+        flood : str
+            ``'idle'`` for no flood, ``'async'`` for logins through the login
+            endpoint, ``'sync'`` for password checks on the synchronous views' thread.
+        token : str
+            The API token of the benchmark user.
+        board_id : int
+            The ID of the benchmark board.
+        encoded : str
+            The benchmark user's password hash.
+        options : dict
+            The command options.
+
+        Returns
+        -------
+        list of float
+            The seconds every read took.
+        """
+        client = AsyncClient()
+        deadline = time.monotonic() + options['seconds']
+
+        async def login():
+            while time.monotonic() < deadline:
+                if flood == 'async':
+                    await client.post(
+                        '/api/user/login/', {'email': self.email, 'password': self.password},
+                        content_type='application/json')
+                else:
+                    await sync_to_async(check_password)(self.password, encoded)
+
+        headers = {'Authorization': f'Token {token}', 'X-Board': str(board_id)}
+        response = await client.get('/api/task/', headers=headers)
+        if response.status_code != 200 or len(response.json()) != options['tasks']:
+            raise RuntimeError(f"/api/task/ does not serve the {options['tasks']} benchmark tasks.")
+        floods = [asyncio.create_task(login()) for _ in range(options['logins'] if flood != 'idle' else 0)]
+        latencies = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            response = await client.get('/api/task/', headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/task/ answered {response.status_code}.")
+        await asyncio.gather(*floods)
+        return latencies
@@ -0,0 +1,139 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing SQLite read/write throughput with and without
+    the production pragma profile from `SQLITE_PRAGMAS`.
+
+    Each run uses a fresh database file in a temporary directory, seeds it with
+    tasks and then lets reader and writer threads hammer it for a fixed time,
+    each thread on its own connection like separate workers would. The
+    default profile keeps the 5 s busy timeout that both `sqlite3` and
+    Django use out of the box.
+    """
+    help = "Benchmarks concurrent SQLite reads and writes with the default and the production profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help="Number of reader threads.")
+        parser.add_argument('--writers', type=int, default=2, help="Number of writer threads.")
+        parser.add_argument('--seconds', type=float, default=3.0, help="Duration of each run.")
+        parser.add_argument('--tasks', type=int, default=2000, help="Number of seeded tasks.")
+
+    def handle(self, *args, **options):
+        for profile in ('default', 'production'):
+            with tempfile.TemporaryDirectory() as directory:
+                result = self.run_profile(Path(directory) / 'bench.sqlite3', profile, options)
+            self.stdout.write(
+                f"{profile:>10}: {result['reads'] / options['seconds']:10.0f} reads/s "
+                f"{result['writes'] / options['seconds']:8.0f} writes/s "
+                f"{result['errors']:6d} locked errors"
+            )
+
+    def connect(self, path, profile):
+        """
+        Opens a connection configured like the given profile.
+
+        Parameters
+        ----------
+        path : Path
+            The database file.
+        profile : str
+            Either ``'default'`` or ``'production'``.
+
+        Returns
+        -------
+        sqlite3.Connection
+            The configured connection in manual transaction mode.
+        """
+        if profile == 'default':
+            return sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection = sqlite3.connect(
+            path, timeout=settings.SQLITE_PRAGMAS['busy_timeout'] / 1000,
+            isolation_level=None, check_same_thread=False,
+        )
+        for key, value in settings.SQLITE_PRAGMAS.items():
+            connection.execute(f'PRAGMA {key}={value}')
+        return connection
+
+    def run_profile(self, path, profile, options):
+        """
+        Seeds a database and runs the reader and writer threads against it.
+
+        Parameters
+        ----------
+        path : Path
+            The database file.
+        profile : str
+            Either ``'default'`` or ``'production'``.
+        options : dict
+            The command options.
+
+        Returns
+        -------
+        dict
+            The number of completed reads and writes and of "database is locked" errors.
+        """
+        setup = self.connect(path, profile)
+        setup.execute(
+            'CREATE TABLE task (id INTEGER PRIMARY KEY, container TEXT, title TEXT, priority TEXT, due_date TEXT)'
+        )
+        setup.execute('BEGIN')
+        setup.executemany(
+            'INSERT INTO task (container, title, priority, due_date) VALUES (?, ?, ?, ?)',
+            [('to-do-con', f'Task {i}', 'Medium', '2025-01-01') for i in range(options['tasks'])],
+        )
+        setup.execute('COMMIT')
+        setup.close()
+
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+        begin = 'BEGIN' if profile == 'default' else 'BEGIN IMMEDIATE'
+
+        def reader():
+            connection = self.connect(path, profile)
+            while time.monotonic() < deadline:
+                try:
+                    connection.execute(
+                        "SELECT * FROM task WHERE container = 'to-do-con' AND id > abs(random()) % ? LIMIT 50",
+                        (options['tasks'],),
+                    ).fetchall()
+                    key = 'reads'
+                except sqlite3.OperationalError:
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+            connection.close()
+
+        def writer():
+            connection = self.connect(path, profile)
+            while time.monotonic() < deadline:
+                try:
+                    connection.execute(begin)
+                    connection.execute("UPDATE task SET container = 'done-con' WHERE id = abs(random()) % ?", (options['tasks'],))
+                    connection.execute('INSERT INTO task (container, title) VALUES (?, ?)', ('to-do-con', 'New'))
+                    connection.execute('COMMIT')
+                    key = 'writes'
+                except sqlite3.OperationalError:
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+            connection.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer) for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
@@ -0,0 +1,187 @@
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from task_data_app.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing the task table with priority and container
+    stored as names against the integer enum storage.
+
+    Both layouts get the same random tasks and the same indexes in separate
+    database files. The command reports the table and index sizes and the
+    time per query of the board's priority and column filters.
+    """
+    help = "Benchmarks table size, index size and filter speed of name and integer task storage."
+
+    layouts = {
+        'names': (
+            'CREATE TABLE task (id INTEGER PRIMARY KEY, container VARCHAR(30), title VARCHAR(50), '
+            'due_date DATE, priority VARCHAR(25), priorityImg VARCHAR(50))'
+        ),
+        'integers': (
+            'CREATE TABLE task (id INTEGER PRIMARY KEY, container SMALLINT UNSIGNED, title VARCHAR(50), '
+            'due_date DATE, priority SMALLINT UNSIGNED)'
+        ),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help="Number of seeded tasks.")
+        parser.add_argument('--repeat', type=int, default=200, help="Runs of each filter query.")
+
+    def handle(self, *args, **options):
+        rows = self.build_rows(options['tasks'])
+        for layout in self.layouts:
+            with tempfile.TemporaryDirectory() as directory:
+                result = self.run_layout(Path(directory) / 'bench.sqlite3', layout, rows, options['repeat'])
+            self.stdout.write(
+                f"{layout:>9}: table {result['table'] / 1024:8.0f} KiB "
+                f"indexes {result['indexes'] / 1024:8.0f} KiB "
+                f"urgent filter {result['priority'] * 1000:7.3f} ms "
+                f"column filter {result['container'] * 1000:7.3f} ms"
+            )
+
+    def build_rows(self, count):
+        """
+        Builds random tasks with realistic priority and column names.
+
+        Parameters
+        ----------
+        count : int
+            Number of tasks.
+
+        Returns
+        -------
+        list of tuple
+            The container, priority, title and due date of every task.
+        """
+        containers = [choice for choice in Task.Container if choice]
+        priorities = [choice for choice in Task.Priority if choice]
+        return [
+            (random.choice(containers), random.choice(priorities), f'Task {i}', f'2026-{random.randint(1, 12):02d}-15')
+            for i in range(count)
+        ]
+
+    def run_layout(self, path, layout, rows, repeat):
+        """
+        Seeds one layout and measures its sizes and filter times.
+
+        Parameters
+        ----------
+        path : Path
+            The database file.
+        layout : str
+            Either ``'names'`` or ``'integers'``.
+        rows : list of tuple
+            The tasks to seed.
+        repeat : int
+            Runs of each filter query.
+
+        Returns
+        -------
+        dict
+            The table and index sizes in bytes and the seconds per filter query.
+        """
+        connection = sqlite3.connect(path, isolation_level=None)
+        connection.execute(self.layouts[layout])
+        connection.execute('CREATE INDEX task_container_due_idx ON task (container, due_date)')
+        connection.execute('CREATE INDEX task_priority_container_idx ON task (priority, container)')
+        connection.execute('BEGIN')
+        if layout == 'names':
+            connection.executemany(
+                'INSERT INTO task (container, priority, priorityImg, title, due_date) VALUES (?, ?, ?, ?, ?)',
+                [
+                    (container.label, priority.label, f'./assets/img/prio-{priority.label.lower()}.svg', title, due_date)
+                    for container, priority, title, due_date in rows
+                ],
+            )
+            urgent, column = (Task.Priority.URGENT.label, Task.Container.TO_DO.label), Task.Container.IN_PROGRESS.label
+        else:
+            connection.executemany(
+                'INSERT INTO task (container, priority, title, due_date) VALUES (?, ?, ?, ?)',
+                [(int(container), int(priority), title, due_date) for container, priority, title, due_date in rows],
+            )
+            urgent, column = (int(Task.Priority.URGENT), int(Task.Container.TO_DO)), int(Task.Container.IN_PROGRESS)
+        connection.execute('COMMIT')
+        connection.execute('VACUUM')
+        connection.execute('ANALYZE')
+
+        result = {
+            'priority': self.time_query(
+                connection, 'SELECT COUNT(*) FROM task WHERE priority = ? AND container = ?', urgent, repeat),
+            'container': self.time_query(
+                connection, 'SELECT id, title FROM task WHERE container = ? ORDER BY due_date LIMIT 50', (column,), repeat),
+        }
+        sizes = self.get_sizes(connection)
+        result['table'] = sizes.pop('task')
+        result['indexes'] = sum(sizes.values())
+        connection.close()
+        return result
+
+    def get_sizes(self, connection):
+        """
+        Measures the bytes used by the task table and each of its indexes.
+
+        Uses the `dbstat` virtual table where SQLite provides it. Otherwise
+        every index is dropped in turn and its size taken from the shrinking
+        page count, so this must be the last step on the connection.
+
+        Parameters
+        ----------
+        connection : sqlite3.Connection
+            The seeded connection.
+
+        Returns
+        -------
+        dict
+            The size in bytes by table or index name.
+        """
+        try:
+            return dict(connection.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat WHERE name NOT LIKE 'sqlite_%' GROUP BY name"))
+        except sqlite3.OperationalError:
+            pass
+        page_size = connection.execute('PRAGMA page_size').fetchone()[0]
+        indexes = [name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE tbl_name = 'task' AND type = 'index'")]
+        sizes = {}
+        pages = connection.execute('PRAGMA page_count').fetchone()[0]
+        for name in indexes:
+            connection.execute(f'DROP INDEX {name}')
+            connection.execute('VACUUM')
+            remaining = connection.execute('PRAGMA page_count').fetchone()[0]
+            sizes[name] = (pages - remaining) * page_size
+            pages = remaining
+        sizes['task'] = (pages - 1) * page_size
+        return sizes
+
+    def time_query(self, connection, sql, params, repeat):
+        """
+        Runs a query repeatedly and returns the mean time per run.
+
+        Parameters
+        ----------
+        connection : sqlite3.Connection
+            The seeded connection.
+        sql : str
+            The query.
+        params : tuple
+            The query parameters.
+        repeat : int
+            Number of runs.
+
+        Returns
+        -------
+        float
+            The mean seconds per run.
+        """
+        start = time.perf_counter()
+        for _ in range(repeat):
+            connection.execute(sql, params).fetchall()
+        return (time.perf_counter() - start) / repeat
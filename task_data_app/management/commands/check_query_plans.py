@@ -0,0 +1,181 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from task_data_app.api.filters import TaskFilterSerializer
+from task_data_app.models import Board, Category, SubTask, Task, TaskCard, User
+
+
+class Command(BaseCommand):
+    """
+    Management command checking that the API's queries use indexes.
+
+    Sample data is created inside a transaction that is rolled back at the end.
+    The queries issued by every read endpoint, plus the board, assignee and
+    deadline lookups, are run through `EXPLAIN QUERY PLAN`. The command fails
+    if a query that filters, joins or sorts a table makes SQLite scan that
+    table without an index. Unfiltered reads of a whole table are expected to
+    scan and are not reported.
+    """
+    help = "Fails if any API query falls back to a full table scan."
+
+    endpoints = [
+        '/api/task/',
+        '/api/task/summary/',
+        '/api/task/calendar/',
+        '/api/task/archive/',
+        '/api/contact/',
+        '/api/contact/search/?q=a',
+        '/api/category/',
+        '/api/bootstrap/',
+        '/api/board/',
+    ]
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        with transaction.atomic():
+            user = self.create_sample_data()
+            queries = self.capture_endpoint_queries(user, connection)
+            queries += self.get_pattern_queries(user)
+            failures = []
+            with connection.cursor() as cursor:
+                for name, sql, params in queries:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                    scans = [row[-1] for row in cursor.fetchall() if self.is_full_scan(row[-1])]
+                    if scans and self.is_selective(sql):
+                        failures.append((name, sql, scans))
+            transaction.set_rollback(True)
+
+        for name, sql, scans in failures:
+            self.stderr.write(f"{name}: {', '.join(scans)}\n    {sql}")
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(queries)} queries scan a full table.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(queries)} queries use indexes."))
+
+    def create_sample_data(self):
+        """
+        Creates a user, a category and a task with an assignee and a subtask.
+
+        The category and task are created on the user's board, which the
+        endpoints then read.
+
+        Returns
+        -------
+        User
+            The sample user, also used to authenticate the requests.
+        """
+        user = User.objects.create(email='query-plan-check@example.com', name='Query Plan')
+        board = Board.objects.for_user(user)
+        category = Category.objects.create(board=board, name='query-plan-check')
+        task = Task.objects.create(board=board, title='Query plan', container=Task.Container.TO_DO, priority=Task.Priority.URGENT, due_date=date.today())
+        task.user.add(user)
+        task.category.add(category)
+        SubTask.objects.create(task=task, name='Query plan')
+        return user
+
+    def capture_endpoint_queries(self, user, connection):
+        """
+        Calls every read endpoint and captures the queries it issues.
+
+        Parameters
+        ----------
+        user : User
+            The user the requests are authenticated as.
+        connection : DatabaseWrapper
+            The connection the queries run on; reads are pinned to it so the
+            uncommitted sample data is visible.
+
+        Returns
+        -------
+        list of tuple
+            The endpoint path, SQL and parameters of every captured query.
+        """
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(user)
+        queries = []
+        for endpoint in self.endpoints:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(endpoint, HTTP_X_READ_PRIMARY='1')
+            if response.status_code >= 400:
+                raise CommandError(f"{endpoint} returned {response.status_code}.")
+            queries += [
+                (endpoint, query['sql'], ())
+                for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+            ]
+        return queries
+
+    def get_pattern_queries(self, user):
+        """
+        Builds the board, assignee, deadline and task filter lookups the clients use.
+
+        Parameters
+        ----------
+        user : User
+            The sample user used as assignee.
+
+        Returns
+        -------
+        list of tuple
+            The name, SQL and parameters of every lookup.
+        """
+        today = date.today()
+        board = Board.objects.for_user(user)
+        tasks = Task.objects.filter(board=board)
+        querysets = {
+            'board column': tasks.filter(container=Task.Container.TO_DO).order_by('due_date'),
+            'urgent tasks': tasks.filter(priority=Task.Priority.URGENT).values('container'),
+            'deadline range': tasks.filter(due_date__gte=today, due_date__lt=today + timedelta(days=7)),
+            'assignee tasks': Task.objects.filter(user=user).values('id'),
+            'category tasks': Task.objects.filter(category__name='query-plan-check').values('id'),
+        }
+        category = Category.objects.get(board=board, name='query-plan-check')
+        task_filters = {
+            'assignee filter': {'assignee': str(user.pk)},
+            'category filter': {'category': str(category.pk)},
+            'priority filter': {'priority': 'Urgent'},
+            'container filter': {'container': 'to-do-con,done-con'},
+            'due date filter': {'due_after': today.isoformat(), 'due_before': (today + timedelta(days=7)).isoformat()},
+            'combined filter': {'assignee': str(user.pk), 'category': str(category.pk), 'container': 'to-do-con'},
+        }
+        for name, params in task_filters.items():
+            filters = TaskFilterSerializer(data=params, context={'board': board})
+            filters.is_valid(raise_exception=True)
+            matches = filters.filter_tasks(tasks).values('pk')
+            querysets[name] = TaskCard.objects.filter(task_id__in=matches).values('data')
+        return [(name, *queryset.query.sql_with_params()) for name, queryset in querysets.items()]
+
+    def is_full_scan(self, detail):
+        """
+        Checks whether a query plan step scans a table without an index.
+
+        Parameters
+        ----------
+        detail : str
+            The detail column of an `EXPLAIN QUERY PLAN` row.
+
+        Returns
+        -------
+        bool
+            `True` if the step is a plain table scan.
+        """
+        return detail.startswith('SCAN ') and ' USING ' not in detail and 'CONSTANT ROW' not in detail
+
+    def is_selective(self, sql):
+        """
+        Checks whether a query filters, joins or sorts rather than reading a whole table.
+
+        Parameters
+        ----------
+        sql : str
+            The SQL of the query.
+
+        Returns
+        -------
+        bool
+            `True` if the query has a WHERE, JOIN or ORDER BY clause.
+        """
+        return any(keyword in sql for keyword in (' WHERE ', ' JOIN ', ' ORDER BY '))
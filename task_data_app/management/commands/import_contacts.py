@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_data_app.api.utils import import_contacts, read_contact_rows
+
+
+class Command(BaseCommand):
+    """
+    Management command for importing contacts in bulk from a CSV or JSON file.
+
+    The CSV file needs an `email` and `name` column and may have a `phone`
+    column; the JSON file holds a list of objects with the same keys.
+    """
+    help = "Imports inactive contacts in bulk from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the CSV or JSON file.")
+        parser.add_argument(
+            '--format', choices=['csv', 'json'],
+            help="File format; defaults to the file extension.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        try:
+            rows = read_contact_rows(path.read_text(encoding='utf-8-sig'), file_format)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        result = import_contacts(rows)
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['error']} {error.get('email', '')}".rstrip())
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} contacts, skipped {len(result['skipped'])} existing, "
+            f"{len(result['errors'])} invalid rows."
+        ))
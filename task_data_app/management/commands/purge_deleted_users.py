@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from task_data_app.api.users import purge_user
+from task_data_app.models import User
+
+
+class Command(BaseCommand):
+    """
+    Management command removing users that were deleted but not cleaned up yet.
+
+    The `purge_user` job normally does this right after the deletion; the
+    command catches up on users whose job failed or was lost.
+    """
+    help = "Removes deleted users together with their assignments, tokens and memberships."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Assignments deleted per transaction.")
+
+    def handle(self, *args, **options):
+        user_ids = list(User.objects.filter(deleted_at__isnull=False).order_by('deleted_at').values_list('pk', flat=True))
+        for user_id in user_ids:
+            purge_user(user_id, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {len(user_ids)} deleted users."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from task_data_app.api.projection import rebuild_cards
+
+
+class Command(BaseCommand):
+    """
+    Management command regenerating the denormalized task card projection.
+    """
+    help = "Rebuilds all task cards from the tasks, assignees, subtasks and categories."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Tasks built per batch.")
+
+    def handle(self, *args, **options):
+        count = rebuild_cards(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} task cards."))
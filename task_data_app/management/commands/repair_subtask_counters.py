@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from task_data_app.api.projection import deferred_card_updates, touch_cards
+from task_data_app.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Management command recounting the denormalized subtask counters of tasks.
+
+    Only tasks whose counters differ from their `SubTask` rows are
+    rewritten, batch by batch, together with their cards.
+    """
+    help = "Recounts the subtask counters of tasks that drifted from their subtasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Tasks repaired per batch.")
+
+    def handle(self, *args, **options):
+        task_ids = list(self.get_drifted_tasks().values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        for start in range(0, len(task_ids), batch_size):
+            batch = task_ids[start:start + batch_size]
+            with deferred_card_updates():
+                Task.count_subtasks(batch)
+                touch_cards(batch)
+        self.stdout.write(self.style.SUCCESS(f"Repaired the subtask counters of {len(task_ids)} tasks."))
+
+    def get_drifted_tasks(self):
+        """
+        Returns the tasks whose counters do not match their subtasks.
+
+        Returns
+        -------
+        QuerySet
+            The drifted tasks, ordered by ID.
+        """
+        counts = Task.get_subtask_counts()
+        return Task.objects.alias(
+            counted_total=counts['subtask_total'], counted_done=counts['subtask_done'],
+        ).exclude(subtask_total=models.F('counted_total'), subtask_done=models.F('counted_done')).order_by('pk')
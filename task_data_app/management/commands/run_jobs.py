@@ -0,0 +1,35 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from task_data_app.job_queue import job_queue
+
+
+class Command(BaseCommand):
+    """
+    Management command running the background job queue outside the app process.
+    """
+    help = "Runs queued background jobs until interrupted, or once with --once."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Run the due jobs once and exit.")
+
+    def handle(self, *args, **options):
+        if options['once']:
+            count = 0
+            while True:
+                claimed = job_queue.run_pending()
+                count += claimed
+                if claimed < job_queue.batch_size:
+                    break
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} jobs."))
+            return
+        signal.signal(signal.SIGTERM, lambda signum, frame: job_queue.stop())
+        job_queue.start()
+        self.stdout.write(f"Running jobs with {job_queue.workers} threads.")
+        try:
+            job_queue.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            job_queue.stop()
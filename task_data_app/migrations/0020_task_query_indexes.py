@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0019_taskevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['container', 'due_date'], name='task_container_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date'], name='task_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['priority', 'container'], name='task_priority_container_idx'),
+        ),
+        # Reverse lookups from a user or category to its tasks read only the
+        # through table when it has an index led by the user/category column.
+        migrations.RunSQL(
+            sql='CREATE INDEX task_user_user_task_idx ON task_data_app_task_user (user_id, task_id)',
+            reverse_sql='DROP INDEX task_user_user_task_idx',
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX task_category_category_task_idx ON task_data_app_task_category (category_id, task_id)',
+            reverse_sql='DROP INDEX task_category_category_task_idx',
+        ),
+    ]
@@ -0,0 +1,104 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_initial_positions(apps, schema_editor):
+    """
+    Numbers the existing assignees and categories of every task in insertion order.
+    """
+    for model_name in ('TaskAssignment', 'TaskCategory'):
+        model = apps.get_model('task_data_app', model_name)
+        rows = list(model.objects.order_by('task_id', 'id'))
+        position, task_id = 0, None
+        for row in rows:
+            position = position + 1 if row.task_id == task_id else 0
+            task_id = row.task_id
+            row.position = position
+        model.objects.bulk_update(rows, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0020_task_query_indexes'),
+    ]
+
+    operations = [
+        # The implicit through tables are taken over as they are; only the
+        # migration state changes here.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TaskAssignment',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='task_data_app.task')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'task_data_app_task_user',
+                        'unique_together': {('task', 'user')},
+                    },
+                ),
+                migrations.CreateModel(
+                    name='TaskCategory',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='task_data_app.task')),
+                        ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='task_data_app.category')),
+                    ],
+                    options={
+                        'db_table': 'task_data_app_task_category',
+                        'unique_together': {('task', 'category')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='task',
+                    name='user',
+                    field=models.ManyToManyField(blank=True, related_name='task', through='task_data_app.TaskAssignment', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='task',
+                    name='category',
+                    field=models.ManyToManyField(blank=True, related_name='task', through='task_data_app.TaskCategory', to='task_data_app.category'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='taskassignment',
+            name='position',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='taskcategory',
+            name='position',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        # The reverse-lookup indexes from 0020 are replaced by model indexes.
+        migrations.RunSQL(
+            sql='DROP INDEX IF EXISTS task_user_user_task_idx',
+            reverse_sql='CREATE INDEX task_user_user_task_idx ON task_data_app_task_user (user_id, task_id)',
+        ),
+        migrations.RunSQL(
+            sql='DROP INDEX IF EXISTS task_category_category_task_idx',
+            reverse_sql='CREATE INDEX task_category_category_task_idx ON task_data_app_task_category (category_id, task_id)',
+        ),
+        migrations.AddIndex(
+            model_name='taskassignment',
+            index=models.Index(fields=['task', 'position'], name='task_user_task_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskassignment',
+            index=models.Index(fields=['user', 'task'], name='task_user_user_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcategory',
+            index=models.Index(fields=['task', 'position'], name='task_cat_task_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcategory',
+            index=models.Index(fields=['category', 'task'], name='task_cat_category_task_idx'),
+        ),
+        migrations.RunPython(set_initial_positions, migrations.RunPython.noop),
+    ]
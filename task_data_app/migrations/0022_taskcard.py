@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0021_ordered_task_relations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCard',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='task_data_app.task')),
+                ('data', models.JSONField(default=dict)),
+            ],
+        ),
+    ]
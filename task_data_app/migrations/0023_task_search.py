@@ -0,0 +1,48 @@
+from django.db import migrations
+
+SEARCH_TABLE = 'task_data_app_task_search'
+
+
+def create_search_table(apps, schema_editor):
+    """
+    Creates and fills the FTS5 task search table if SQLite supports FTS5.
+
+    Without FTS5 the table is skipped and task search falls back to
+    substring matching.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                "title, description, subtasks, tokenize='unicode61 remove_diacritics 2')"
+            )
+        except Exception:
+            return
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, subtasks) "
+            "SELECT t.id, t.title, t.description, "
+            "COALESCE((SELECT group_concat(s.name, ' ') FROM task_data_app_subtask s WHERE s.task_id = t.id), '') "
+            "FROM task_data_app_task t"
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    """
+    Drops the FTS5 task search table.
+    """
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0022_taskcard'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def set_initial_done_since(apps, schema_editor):
+    """
+    Marks tasks already in the done column as done since now.
+
+    Their real completion time is unknown, so they become archivable once
+    the archival period has passed from the upgrade on.
+    """
+    Task = apps.get_model('task_data_app', 'Task')
+    Task.objects.filter(container='done-con').update(done_since=django.utils.timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0023_task_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(blank=True, default='', max_length=50)),
+                ('done_since', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('card', models.JSONField(default=dict)),
+                ('snapshot', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='done_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('done_since__isnull', False)), fields=['done_since'], name='task_done_since_idx'),
+        ),
+        migrations.RunPython(set_initial_done_since, migrations.RunPython.noop),
+    ]
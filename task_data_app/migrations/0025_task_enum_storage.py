@@ -0,0 +1,190 @@
+from collections import Counter
+
+from django.db import migrations, models
+
+CONTAINERS = {
+    '': 0,
+    'to-do-con': 1,
+    'in-progress-con': 2,
+    'await-feedback-con': 3,
+    'done-con': 4,
+}
+
+PRIORITIES = {
+    '': 0,
+    'low': 1,
+    'medium': 2,
+    'urgent': 3,
+}
+
+PRIORITY_LABELS = {0: '', 1: 'Low', 2: 'Medium', 3: 'Urgent'}
+
+
+def encode_choices(apps, schema_editor):
+    """
+    Copies the container and priority names into the integer columns.
+
+    Names are matched case-insensitively; unknown names become 0 (none).
+    The image of every priority is the one most stored with it in
+    `priorityImg` and is kept in `PriorityImage`. The snapshots of archived
+    tasks are converted the same way, and the cards get the image of their
+    priority.
+    """
+    Task = apps.get_model('task_data_app', 'Task')
+    TaskCard = apps.get_model('task_data_app', 'TaskCard')
+    ArchivedTask = apps.get_model('task_data_app', 'ArchivedTask')
+    PriorityImage = apps.get_model('task_data_app', 'PriorityImage')
+    archived_tasks = list(ArchivedTask.objects.all())
+    images = get_priority_images(
+        list(Task.objects.values_list('priority', 'priorityImg'))
+        + [(task.snapshot.get('priority'), task.snapshot.get('priorityImg')) for task in archived_tasks]
+    )
+    PriorityImage.objects.bulk_create([PriorityImage(priority=value, image=image) for value, image in images.items()])
+    for name, value in CONTAINERS.items():
+        if value:
+            Task.objects.filter(container__iexact=name).update(container_value=value)
+    for name, value in PRIORITIES.items():
+        if value:
+            Task.objects.filter(priority__iexact=name).update(priority_value=value)
+    for archived_task in archived_tasks:
+        snapshot = archived_task.snapshot
+        snapshot['container'] = CONTAINERS.get(str(snapshot.get('container', '')).lower(), 0)
+        snapshot['priority'] = PRIORITIES.get(str(snapshot.get('priority', '')).lower(), 0)
+        snapshot.pop('priorityImg', None)
+        encode_card(archived_task.card, images)
+    ArchivedTask.objects.bulk_update(archived_tasks, ['snapshot', 'card'], batch_size=500)
+    cards = list(TaskCard.objects.all())
+    for card in cards:
+        encode_card(card.data, images)
+    TaskCard.objects.bulk_update(cards, ['data'], batch_size=500)
+
+
+def get_priority_images(rows):
+    """
+    Returns the image most often stored with every priority.
+
+    Parameters
+    ----------
+    rows : list of tuple
+        The priority name and image of every task.
+
+    Returns
+    -------
+    dict
+        The image by priority value, for the priorities stored with one.
+    """
+    counts = {}
+    for name, image in rows:
+        value = PRIORITIES.get(str(name or '').lower(), 0)
+        if value and image:
+            counts.setdefault(value, Counter())[image] += 1
+    return {value: images.most_common(1)[0][0] for value, images in counts.items()}
+
+
+def encode_card(card, images):
+    """
+    Rewrites the container, priority and priority image of a card as the API now emits them.
+    """
+    container = CONTAINERS.get(str(card.get('container', '')).lower(), 0)
+    priority = PRIORITIES.get(str(card.get('priority', '')).lower(), 0)
+    card['container'] = next(name for name, value in CONTAINERS.items() if value == container)
+    card['priority'] = PRIORITY_LABELS[priority]
+    card['priorityImg'] = images.get(priority, '')
+
+
+def decode_choices(apps, schema_editor):
+    """
+    Copies the integer columns back into the container, priority and image names.
+    """
+    Task = apps.get_model('task_data_app', 'Task')
+    ArchivedTask = apps.get_model('task_data_app', 'ArchivedTask')
+    PriorityImage = apps.get_model('task_data_app', 'PriorityImage')
+    images = dict(PriorityImage.objects.values_list('priority', 'image'))
+    for name, value in CONTAINERS.items():
+        Task.objects.filter(container_value=value).update(container=name)
+    for value, label in PRIORITY_LABELS.items():
+        Task.objects.filter(priority_value=value).update(priority=label, priorityImg=images.get(value, ''))
+    container_names = {value: name for name, value in CONTAINERS.items()}
+    archived_tasks = list(ArchivedTask.objects.all())
+    for archived_task in archived_tasks:
+        snapshot = archived_task.snapshot
+        snapshot['container'] = container_names.get(snapshot.get('container'), '')
+        snapshot['priority'] = PRIORITY_LABELS.get(snapshot.get('priority'), '')
+        snapshot['priorityImg'] = images.get(PRIORITIES.get(snapshot['priority'].lower(), 0), '')
+    ArchivedTask.objects.bulk_update(archived_tasks, ['snapshot'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0024_task_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriorityImage',
+            fields=[
+                ('priority', models.PositiveSmallIntegerField(choices=[(0, ''), (1, 'Low'), (2, 'Medium'), (3, 'Urgent')], primary_key=True, serialize=False)),
+                ('image', models.CharField(max_length=50)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_container_due_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_priority_container_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='container_value',
+            field=models.PositiveSmallIntegerField(blank=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_value',
+            field=models.PositiveSmallIntegerField(blank=True, default=0),
+        ),
+        migrations.RunPython(encode_choices, decode_choices),
+        migrations.RemoveField(
+            model_name='task',
+            name='container',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='priority',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='priorityImg',
+        ),
+        migrations.RenameField(
+            model_name='task',
+            old_name='container_value',
+            new_name='container',
+        ),
+        migrations.RenameField(
+            model_name='task',
+            old_name='priority_value',
+            new_name='priority',
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='container',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, ''), (1, 'to-do-con'), (2, 'in-progress-con'), (3, 'await-feedback-con'), (4, 'done-con')], default=0),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, ''), (1, 'Low'), (2, 'Medium'), (3, 'Urgent')], default=0),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['container', 'due_date'], name='task_container_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['priority', 'container'], name='task_priority_container_idx'),
+        ),
+    ]
@@ -0,0 +1,156 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_into_default_board(apps, schema_editor):
+    """
+    Puts all existing tasks, categories and archived tasks into a default board.
+
+    Every existing user becomes a member of it, and the cards get the board ID.
+    """
+    Board = apps.get_model('task_data_app', 'Board')
+    BoardMembership = apps.get_model('task_data_app', 'BoardMembership')
+    User = apps.get_model('task_data_app', 'User')
+    Task = apps.get_model('task_data_app', 'Task')
+    TaskCard = apps.get_model('task_data_app', 'TaskCard')
+    Category = apps.get_model('task_data_app', 'Category')
+    ArchivedTask = apps.get_model('task_data_app', 'ArchivedTask')
+    board = Board.objects.create(name='Join')
+    BoardMembership.objects.bulk_create(
+        [BoardMembership(board=board, user_id=user_id) for user_id in User.objects.values_list('id', flat=True)],
+        batch_size=500,
+    )
+    Task.objects.update(board=board)
+    Category.objects.update(board=board)
+    ArchivedTask.objects.update(board=board)
+    cards = list(TaskCard.objects.all())
+    for card in cards:
+        card.data['board'] = board.id
+    TaskCard.objects.bulk_update(cards, ['data'], batch_size=500)
+    archived_tasks = list(ArchivedTask.objects.all())
+    for archived_task in archived_tasks:
+        archived_task.card['board'] = board.id
+    ArchivedTask.objects.bulk_update(archived_tasks, ['card'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0025_task_enum_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Board',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default='', max_length=50)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BoardMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_due_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_container_due_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_priority_container_idx',
+        ),
+        migrations.AlterField(
+            model_name='archivedtask',
+            name='archived_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='name',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='board',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='task_data_app.board'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='board',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='task_data_app.board'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='board',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='task_data_app.board'),
+        ),
+        migrations.AddField(
+            model_name='boardmembership',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='task_data_app.board'),
+        ),
+        migrations.AddField(
+            model_name='boardmembership',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='board_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(move_into_default_board, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='archivedtask',
+            name='board',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='task_data_app.board'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='task_data_app.board'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='board',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='task_data_app.board'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['board', '-archived_at', '-id'], name='archived_board_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'container', 'due_date'], name='task_board_container_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'due_date'], name='task_board_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'priority', 'container'], name='task_board_priority_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('board', 'name'), name='category_board_name_uniq'),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='members',
+            field=models.ManyToManyField(blank=True, related_name='boards', through='task_data_app.BoardMembership', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='boardmembership',
+            index=models.Index(fields=['user', 'board'], name='board_member_user_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='boardmembership',
+            unique_together={('board', 'user')},
+        ),
+    ]
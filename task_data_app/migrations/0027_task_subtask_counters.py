@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_subtasks(apps, schema_editor):
+    """
+    Fills the subtask counters of all tasks and adds them to the cards.
+
+    Archived cards get the counters from their stored subtask statuses.
+    """
+    Task = apps.get_model('task_data_app', 'Task')
+    SubTask = apps.get_model('task_data_app', 'SubTask')
+    TaskCard = apps.get_model('task_data_app', 'TaskCard')
+    ArchivedTask = apps.get_model('task_data_app', 'ArchivedTask')
+    subtasks = SubTask.objects.filter(task=models.OuterRef('pk')).order_by().values('task')
+    count = models.Count('pk')
+    Task.objects.update(
+        subtask_total=Coalesce(models.Subquery(subtasks.annotate(count=count).values('count')), 0),
+        subtask_done=Coalesce(models.Subquery(subtasks.filter(checked=True).annotate(count=count).values('count')), 0),
+    )
+    counters = {
+        task_id: (total, done)
+        for task_id, total, done in Task.objects.values_list('id', 'subtask_total', 'subtask_done')
+    }
+    cards = list(TaskCard.objects.all())
+    for card in cards:
+        card.data['subtaskTotal'], card.data['subtaskDone'] = counters.get(card.task_id, (0, 0))
+    TaskCard.objects.bulk_update(cards, ['data'], batch_size=500)
+    archived_tasks = list(ArchivedTask.objects.all())
+    for archived_task in archived_tasks:
+        statuses = archived_task.card.get('subtaskschecked', [])
+        archived_task.card['subtaskTotal'] = len(statuses)
+        archived_task.card['subtaskDone'] = statuses.count('checked')
+    ArchivedTask.objects.bulk_update(archived_tasks, ['card'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0026_boards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='subtask_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtask_done',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_subtasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-19 20:04
+
+from django.db import migrations, models
+
+
+def add_card_versions(apps, schema_editor):
+    """
+    Adds the version of the tasks to their cards.
+    """
+    TaskCard = apps.get_model('task_data_app', 'TaskCard')
+    cards = list(TaskCard.objects.all())
+    for card in cards:
+        card.data['version'] = 1
+    TaskCard.objects.bulk_update(cards, ['data'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0028_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(add_card_versions, migrations.RunPython.noop),
+    ]
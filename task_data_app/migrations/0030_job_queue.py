@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-19 20:08
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0029_row_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('lock_token', models.CharField(blank=True, default='', max_length=32)),
+                ('failed', models.BooleanField(default=False)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('failed', False)), fields=['run_at', 'id'], name='job_due_idx'), models.Index(condition=models.Q(('lock_token', ''), _negated=True), fields=['lock_token'], name='job_lock_token_idx')],
+            },
+        ),
+    ]
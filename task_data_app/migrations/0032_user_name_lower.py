@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+def casefold_names(apps, schema_editor):
+    """
+    Fills the casefolded name of all users.
+
+    SQLite's `lower()` only folds ASCII letters, so the names are folded here.
+    """
+    User = apps.get_model('task_data_app', 'User')
+    users = list(User.objects.only('id', 'name'))
+    for user in users:
+        user.name_lower = user.name.casefold()
+    User.objects.bulk_update(users, ['name_lower'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0031_user_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='name_lower',
+            field=models.CharField(blank=True, default='', editable=False, max_length=250),
+        ),
+        migrations.RunPython(casefold_names, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_name_lower_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['name_lower'], name='user_name_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 20:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_data_app', '0032_user_name_lower'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskevent',
+            name='board_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,7 @@
+from django.contrib.auth.hashers import identify_hasher
 from django.contrib.auth.models import UserManager, PermissionsMixin, AbstractBaseUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Lower
 from django.utils import timezone
 # Create your models here.
 
@@ -16,6 +18,8 @@ class CustomUserManager(UserManager):
         Creates and saves a regular User.
     create_superuser(email, password=None, **extra_fields)
         Creates and saves a SuperUser.
+    visible()
+        Returns the users that are not deleted.
     """
 
 
@@ -100,8 +104,77 @@ class CustomUserManager(UserManager):
             raise ValueError("Superuser must have is_superuser=True.")
 
         return self._create_user(email, password, **extra_fields)
+
+    def visible(self):
+        """
+        Returns the users that are not deleted.
+
+        Deleted users stay in the table until their cleanup job has removed
+        them, see `User.mark_deleted`.
+
+        Returns
+        -------
+        QuerySet
+            The users without `deleted_at`.
+        """
+        return self.filter(deleted_at__isnull=True)
     
-class User(AbstractBaseUser, PermissionsMixin):
+class VersionConflict(Exception):
+    """
+    Raised when a versioned row was changed since the instance being saved was read.
+
+    Attributes
+    ----------
+    instance : VersionedModel
+        The instance whose save was rejected.
+    """
+
+    def __init__(self, instance):
+        super().__init__(f"{instance._meta.object_name} {instance.pk} was changed since version {instance.version}.")
+        self.instance = instance
+
+
+class VersionedModel(models.Model):
+    """
+    Abstract model for rows updated with optimistic concurrency control.
+
+    Every update is a conditional `UPDATE ... WHERE version = ?` that also
+    increments the version, so an instance read before another write to the
+    same row cannot overwrite it. Callers that got the version from a client
+    set it on the instance before saving.
+
+    Attributes
+    ----------
+    version : int
+        The number of the current state of the row; starts at 1.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        """
+        Updates the row if it still has the version of the instance.
+
+        Raises
+        ------
+        VersionConflict
+            If the row exists with another version.
+        """
+        version_field = self._meta.get_field('version')
+        values = [value for value in values if value[0] is not version_field]
+        values.append((version_field, None, self.version + 1))
+        updated = super()._do_update(
+            base_qs.filter(version=self.version), using, pk_val, values, update_fields, forced_update)
+        if updated:
+            self.version += 1
+        elif base_qs.filter(pk=pk_val).exists():
+            raise VersionConflict(self)
+        return updated
+
+
+class User(VersionedModel, AbstractBaseUser, PermissionsMixin):
     """
     Custom User model with email as the unique identifier instead of username.
 
@@ -111,6 +184,9 @@ class User(AbstractBaseUser, PermissionsMixin):
         The email address of the user.
     name : str
         The full name of the user.
+    name_lower : str
+        The Unicode-casefolded name, kept in sync by `save` for the indexed
+        prefix search of contacts.
     name_tag : str
         A short name tag for the user.
     color : str
@@ -127,6 +203,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         The date when the user joined.
     last_login : datetime
         The date of the user's last login.
+    deleted_at : datetime
+        When the user was deleted; set until the cleanup job removes the row.
+    version : int
+        The number of the current state of the user, see `VersionedModel`.
 
     Methods
     -------
@@ -136,9 +216,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         Returns the first part of the user's name or email username.
     save(*args, **kwargs)
         Saves the user instance, ensuring the password is hashed if provided.
+    has_encoded_password()
+        Checks whether the stored password is already an encoded hash.
+    mark_deleted()
+        Flags the user as deleted and deactivates them.
     """
     email = models.EmailField(blank=True, unique=True, default='')
     name = models.CharField(max_length=250, blank=True, default='')
+    name_lower = models.CharField(max_length=250, blank=True, default='', editable=False)
     name_tag = models.CharField(max_length=2, blank=True, default='')
     color = models.CharField(max_length=15, blank=True, default='')
     phone = models.IntegerField(blank=True, default=0)
@@ -149,18 +234,26 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     date_joined = models.DateTimeField(default=timezone.now)
     last_login = models.DateTimeField(blank=True, null=True)
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
     
     objects = CustomUserManager()
 
     USERNAME_FIELD = 'email'
     EMAIL_FIELD = 'email'
     REQUIRED_FIELDS = []
+    # Saved by `mark_deleted`; such saves leave the task cards to the purge job.
+    DELETION_FIELDS = frozenset({'deleted_at', 'is_active'})
 
     objects = CustomUserManager()
 
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            models.Index(fields=['name_lower'], name='user_name_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(fields=['deleted_at'], name='user_deleted_idx', condition=models.Q(deleted_at__isnull=False)),
+        ]
 
     def get_full_name(self):
         """
@@ -188,6 +281,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         """
         Saves the user instance, ensuring the password is hashed if provided.
 
+        Passwords that are already encoded by a known hasher are stored as-is,
+        so a hash computed off the request thread is not hashed a second time.
+        `name_lower` is refreshed from the name and saved along with it.
+
         Parameters
         ----------
         *args : tuple
@@ -195,10 +292,42 @@ class User(AbstractBaseUser, PermissionsMixin):
         **kwargs : dict
             Keyword arguments for the save method.
         """
-        if self.password:
+        if self.password and not self.has_encoded_password():
             self.set_password(self.password)
+        self.name_lower = self.name.casefold()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_lower'}
         super().save(*args, **kwargs)
-        
+
+    def has_encoded_password(self):
+        """
+        Checks whether the stored password is already an encoded hash.
+
+        Returns
+        -------
+        bool
+            `True` if a configured hasher recognises the stored password.
+        """
+        try:
+            identify_hasher(self.password)
+        except ValueError:
+            return False
+        return True
+
+    def mark_deleted(self):
+        """
+        Flags the user as deleted and deactivates them.
+
+        Only the user row is written, so this is cheap however many tasks the
+        user is assigned to. The user disappears from every endpoint and can
+        no longer authenticate; their assignments, tokens and memberships are
+        removed later by the `purge_user` job, which also deletes the row.
+        """
+        self.deleted_at = timezone.now()
+        self.is_active = False
+        self.save(update_fields=self.DELETION_FIELDS)
+
 
     def __str__(self):
         """
@@ -211,23 +340,151 @@ class User(AbstractBaseUser, PermissionsMixin):
         """
         return self.name
     
+class BoardQuerySet(models.QuerySet):
+    """
+    QuerySet for boards.
+
+    Methods
+    -------
+    default()
+        Returns the default board, creating it if there is none.
+    for_user(user, board_id=None)
+        Returns the board a user works on.
+    """
+
+    def default(self):
+        """
+        Returns the default board, creating it if there is none.
+
+        The default board is the oldest one. It holds the data from before
+        boards existed and every new user joins it.
+
+        Returns
+        -------
+        Board
+            The default board.
+        """
+        board = self.order_by('id').first()
+        if board is None:
+            board = self.create(name=Board.DEFAULT_NAME)
+        return board
+
+    def for_user(self, user, board_id=None):
+        """
+        Returns the board a user works on.
+
+        Authenticated users get the requested board if they are a member of
+        it, otherwise the oldest board they are a member of. Anonymous users
+        only get the default board.
+
+        Parameters
+        ----------
+        user : User or AnonymousUser
+            The requesting user.
+        board_id : int, optional
+            The ID of the requested board.
+
+        Returns
+        -------
+        Board or None
+            The board, or `None` if the user may not access it.
+        """
+        if user.is_authenticated:
+            boards = self.filter(memberships__user=user)
+        else:
+            boards = self.filter(pk=self.default().pk)
+        if board_id is not None:
+            boards = boards.filter(pk=board_id)
+        return boards.order_by('id').first()
+
+
+class Board(models.Model):
+    """
+    Model for a board partitioning tasks and categories between teams.
+
+    Attributes
+    ----------
+    name : str
+        The name of the board.
+    members : ManyToManyField
+        The users working on the board, through `BoardMembership`.
+    """
+    name = models.CharField(max_length=50, blank=True, default='')
+    members = models.ManyToManyField(User, related_name='boards', blank=True, through='BoardMembership')
+
+    DEFAULT_NAME = 'Join'
+
+    objects = BoardQuerySet.as_manager()
+
+    def __str__(self):
+        """
+        Returns a string representation of the board.
+
+        Returns
+        -------
+        str
+            The board's name.
+        """
+        return self.name
+
+
+class BoardMembership(models.Model):
+    """
+    Model for the membership of a user in a board.
+
+    Attributes
+    ----------
+    board : ForeignKey
+        The board.
+    user : ForeignKey
+        The member.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='board_memberships')
+
+    class Meta:
+        unique_together = [('board', 'user')]
+        indexes = [
+            models.Index(fields=['user', 'board'], name='board_member_user_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the membership.
+
+        Returns
+        -------
+        str
+            The board ID and user ID.
+        """
+        return f"{self.board_id}:{self.user_id}"
+
+
 class Category(models.Model):
     """
     Model for representing a task category.
 
     Attributes
     ----------
+    board : ForeignKey
+        The board the category belongs to.
     name : str
-        The name of the category.
+        The name of the category, unique per board.
     color : str
         The color assigned to the category.
     name_tag : str
         A short name tag for the category.
     """
-    name = models.CharField(max_length=30, blank=True, default='', unique=True)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='categories')
+    name = models.CharField(max_length=30, blank=True, default='')
     color = models.CharField(max_length=15, blank=True, default='')
     name_tag = models.CharField(max_length=2, blank=True, default='')
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'name'], name='category_board_name_uniq'),
+        ]
+
     def __str__(self):
         """
         Returns a string representation of the category.
@@ -240,37 +497,198 @@ class Category(models.Model):
         return self.name
     
 
-class Task(models.Model):
+class Task(VersionedModel):
     """
     Model for representing a task.
 
     Attributes
     ----------
-    container : str
-        The container to which the task belongs.
+    board : ForeignKey
+        The board the task belongs to.
+    container : int
+        The board column of the task, one of `Task.Container`.
     title : str
         The title of the task.
     category : ManyToManyField
-        The categories associated with the task.
+        The categories associated with the task, ordered through `TaskCategory`.
     description : str
         The description of the task.
     due_date : date
         The due date for the task.
-    priority : str
-        The priority level of the task.
-    priorityImg : str
-        The image URL associated with the task's priority.
+    priority : int
+        The priority level of the task, one of `Task.Priority`.
     user : ManyToManyField
-        The users associated with the task.
+        The users associated with the task, ordered through `TaskAssignment`.
+    done_since : datetime
+        When the task was moved to the done column; empty for open tasks.
+    subtask_total : int
+        The number of subtasks, maintained by the `SubTask` write paths.
+    subtask_done : int
+        The number of checked subtasks, maintained by the `SubTask` write paths.
+    version : int
+        The number of the current state of the task, see `VersionedModel`.
+
+    Methods
+    -------
+    priority_img
+        The image URL associated with the task's priority.
+    get_subtask_counts()
+        Returns expressions counting the subtasks of a task from the `SubTask` rows.
+    count_subtasks(task_ids)
+        Recounts the subtasks of the given tasks.
+    save(*args, **kwargs)
+        Saves the task and tracks when it was moved to the done column.
+    set_assignees(users)
+        Sets the assigned users in the given order.
+    set_categories(categories)
+        Sets the categories in the given order.
     """
-    container = models.CharField(max_length=30, blank=True, default='')
+    class Container(models.IntegerChoices):
+        """
+        Board columns, labelled with the names the API uses.
+        """
+        NONE = 0, ''
+        TO_DO = 1, 'to-do-con'
+        IN_PROGRESS = 2, 'in-progress-con'
+        AWAIT_FEEDBACK = 3, 'await-feedback-con'
+        DONE = 4, 'done-con'
+
+    class Priority(models.IntegerChoices):
+        """
+        Priority levels, labelled with the names the API uses.
+        """
+        NONE = 0, ''
+        LOW = 1, 'Low'
+        MEDIUM = 2, 'Medium'
+        URGENT = 3, 'Urgent'
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tasks', db_index=False)
+    container = models.PositiveSmallIntegerField(choices=Container, blank=True, default=Container.NONE)
     title = models.CharField(max_length=50, blank=True, default='')
-    category = models.ManyToManyField(Category, related_name='task', blank=True)
+    category = models.ManyToManyField(Category, related_name='task', blank=True, through='TaskCategory')
     description = models.CharField(max_length=250, blank=True, default='')
     due_date = models.DateField(blank=True, null=True)
-    priority = models.CharField(max_length=25, blank=True)
-    priorityImg = models.CharField(max_length=50, blank=True)
-    user = models.ManyToManyField(User, related_name='task', blank=True)
+    priority = models.PositiveSmallIntegerField(choices=Priority, blank=True, default=Priority.NONE)
+    user = models.ManyToManyField(User, related_name='task', blank=True, through='TaskAssignment')
+    done_since = models.DateTimeField(blank=True, null=True, editable=False)
+    subtask_total = models.PositiveIntegerField(default=0, editable=False)
+    subtask_done = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('subtask_total', 'subtask_done')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'container', 'due_date'], name='task_board_container_due_idx'),
+            models.Index(fields=['board', 'due_date'], name='task_board_due_date_idx'),
+            models.Index(fields=['board', 'priority', 'container'], name='task_board_priority_idx'),
+            models.Index(fields=['done_since'], name='task_done_since_idx',
+                         condition=models.Q(done_since__isnull=False)),
+        ]
+
+    @property
+    def priority_img(self):
+        """
+        The image URL associated with the task's priority.
+
+        Returns
+        -------
+        str
+            The image of the priority, see `PriorityImageRegistry.get`.
+        """
+        from .registry import priority_image_registry
+
+        return priority_image_registry.get(self.priority)
+
+    @classmethod
+    def get_subtask_counts(cls):
+        """
+        Returns expressions counting the subtasks of a task from the `SubTask` rows.
+
+        Returns
+        -------
+        dict
+            Subquery expressions for `subtask_total` and `subtask_done`.
+        """
+        subtasks = SubTask.objects.filter(task=models.OuterRef('pk')).order_by().values('task')
+        count = models.Count('pk')
+        return {
+            'subtask_total': Coalesce(models.Subquery(subtasks.annotate(count=count).values('count')), 0),
+            'subtask_done': Coalesce(models.Subquery(
+                subtasks.filter(checked=True).annotate(count=count).values('count')), 0),
+        }
+
+    @classmethod
+    def count_subtasks(cls, task_ids):
+        """
+        Recounts the subtasks of the given tasks.
+
+        The counters are set from the `SubTask` rows in a single `UPDATE`,
+        so the result is correct regardless of concurrent writes to other
+        subtasks of the same tasks.
+
+        Parameters
+        ----------
+        task_ids : iterable of int
+            The IDs of the tasks to recount.
+        """
+        task_ids = {task_id for task_id in task_ids if task_id is not None}
+        if task_ids:
+            cls.objects.filter(pk__in=task_ids).update(**cls.get_subtask_counts())
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the task and tracks when it was moved to the done column.
+
+        Updates of an existing task leave the subtask counters alone, so a
+        task loaded before a subtask changed does not overwrite them.
+
+        Parameters
+        ----------
+        *args : tuple
+            Positional arguments passed to the parent `save` method.
+        **kwargs : dict
+            Keyword arguments passed to the parent `save` method.
+        """
+        if self.container != self.Container.DONE:
+            self.done_since = None
+        elif self.done_since is None:
+            self.done_since = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            skipped = {*self.counter_fields, *self.get_deferred_fields()}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        elif update_fields is not None and 'container' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'done_since'}
+        super().save(*args, **kwargs)
+
+    def set_assignees(self, users):
+        """
+        Sets the assigned users in the given order.
+
+        Parameters
+        ----------
+        users : list of User or int
+            The users or user IDs, in display order.
+        """
+        with transaction.atomic():
+            self.user.set(users)
+            TaskAssignment.objects.set_positions(self, users, 'user_id')
+
+    def set_categories(self, categories):
+        """
+        Sets the categories in the given order.
+
+        Parameters
+        ----------
+        categories : list of Category or int
+            The categories or category IDs, in display order.
+        """
+        with transaction.atomic():
+            self.category.set(categories)
+            TaskCategory.objects.set_positions(self, categories, 'category_id')
     
     def __str__(self):
         """
@@ -282,11 +700,286 @@ class Task(models.Model):
             The task's title.
         """  
         return self.title
+
+
+class PriorityImageQuerySet(models.QuerySet):
+    """
+    QuerySet for priority images.
+
+    Methods
+    -------
+    store(priority, image)
+        Sets the image of a priority unless it already has that image.
+    """
+
+    def store(self, priority, image):
+        """
+        Sets the image of a priority unless it already has that image.
+
+        A new image refreshes every card of the priority, so an unchanged
+        image is not saved again.
+
+        Parameters
+        ----------
+        priority : int
+            The priority, one of `Task.Priority`.
+        image : str
+            The image URL.
+        """
+        if not self.filter(priority=priority, image=image).exists():
+            self.update_or_create(priority=priority, defaults={'image': image})
+
+
+class PriorityImage(models.Model):
+    """
+    Model for the image the frontend shows for a task priority.
+
+    Attributes
+    ----------
+    priority : int
+        The priority, one of `Task.Priority`.
+    image : str
+        The image URL returned as `priorityImg` with tasks of the priority.
+    """
+    priority = models.PositiveSmallIntegerField(primary_key=True, choices=Task.Priority.choices)
+    image = models.CharField(max_length=50)
+
+    objects = PriorityImageQuerySet.as_manager()
+
+    def __str__(self):
+        """
+        Returns a string representation of the priority image.
+
+        Returns
+        -------
+        str
+            The priority and its image.
+        """
+        return f"{self.get_priority_display()}: {self.image}"
+
+
+class PositionQuerySet(models.QuerySet):
+    """
+    QuerySet for ordered task relations.
+
+    Methods
+    -------
+    set_positions(task, items, column)
+        Stores the order of the related items of a task.
+    """
+
+    def set_positions(self, task, items, column):
+        """
+        Stores the order of the related items of a task.
+
+        Parameters
+        ----------
+        task : Task
+            The task whose relations are ordered.
+        items : list of Model or int
+            The related objects or IDs, in display order.
+        column : str
+            The attribute holding the related ID on the through model.
+        """
+        positions = {getattr(item, 'pk', item): position for position, item in enumerate(items)}
+        rows = list(self.filter(task=task))
+        for row in rows:
+            row.position = positions.get(getattr(row, column), len(positions))
+        self.bulk_update(rows, ['position'])
+
+
+class TaskAssignment(models.Model):
+    """
+    Model for the ordered assignment of a user to a task.
+
+    Attributes
+    ----------
+    task : ForeignKey
+        The assigned task.
+    user : ForeignKey
+        The assigned user.
+    position : int
+        The position of the user among the task's assignees.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    position = models.PositiveSmallIntegerField(default=0)
+
+    objects = PositionQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'task_data_app_task_user'
+        unique_together = [('task', 'user')]
+        indexes = [
+            models.Index(fields=['task', 'position'], name='task_user_task_position_idx'),
+            models.Index(fields=['user', 'task'], name='task_user_user_task_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the assignment.
+
+        Returns
+        -------
+        str
+            The task ID, user ID and position.
+        """
+        return f"{self.task_id}:{self.user_id}@{self.position}"
+
+
+class TaskCategory(models.Model):
+    """
+    Model for the ordered link of a category to a task.
+
+    Attributes
+    ----------
+    task : ForeignKey
+        The linked task.
+    category : ForeignKey
+        The linked category.
+    position : int
+        The position of the category among the task's categories.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    position = models.PositiveSmallIntegerField(default=0)
+
+    objects = PositionQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'task_data_app_task_category'
+        unique_together = [('task', 'category')]
+        indexes = [
+            models.Index(fields=['task', 'position'], name='task_cat_task_position_idx'),
+            models.Index(fields=['category', 'task'], name='task_cat_category_task_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the category link.
+
+        Returns
+        -------
+        str
+            The task ID, category ID and position.
+        """
+        return f"{self.task_id}:{self.category_id}@{self.position}"
     
+class SubTaskQuerySet(models.QuerySet):
+    """
+    QuerySet for subtasks that keeps the subtask counters of the tasks in step.
+
+    The bulk operations bypass `SubTask.save` and `SubTask.delete`, so each
+    of them recounts the affected tasks in the same transaction.
+
+    Methods
+    -------
+    bulk_create(objs, *args, **kwargs)
+        Creates the subtasks and recounts their tasks.
+    bulk_update(objs, fields, *args, **kwargs)
+        Updates the subtasks and recounts their tasks.
+    update(**kwargs)
+        Updates the matching subtasks and recounts their tasks.
+    delete()
+        Deletes the matching subtasks and recounts their tasks.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Creates the subtasks and recounts their tasks.
+
+        Parameters
+        ----------
+        objs : list of SubTask
+            The subtasks to create.
+        *args : tuple
+            Positional arguments passed to the parent method.
+        **kwargs : dict
+            Keyword arguments passed to the parent method.
+
+        Returns
+        -------
+        list of SubTask
+            The created subtasks.
+        """
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            Task.count_subtasks(subtask.task_id for subtask in objs)
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """
+        Updates the subtasks and recounts their tasks.
+
+        Parameters
+        ----------
+        objs : list of SubTask
+            The subtasks to update.
+        fields : list of str
+            The fields to write.
+        *args : tuple
+            Positional arguments passed to the parent method.
+        **kwargs : dict
+            Keyword arguments passed to the parent method.
+
+        Returns
+        -------
+        int
+            The number of updated rows.
+        """
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            task_ids = set(self.filter(pk__in=[subtask.pk for subtask in objs]).values_list('task_id', flat=True))
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            Task.count_subtasks(task_ids | {subtask.task_id for subtask in objs})
+        return updated
+
+    def update(self, **kwargs):
+        """
+        Updates the matching subtasks and recounts their tasks.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            The fields and values to write.
+
+        Returns
+        -------
+        int
+            The number of updated rows.
+        """
+        with transaction.atomic(using=self.db):
+            task_ids = set(self.values_list('task_id', flat=True))
+            updated = super().update(**kwargs)
+            new_task = kwargs.get('task_id', kwargs.get('task'))
+            task_ids.add(getattr(new_task, 'pk', new_task))
+            Task.count_subtasks(task_ids)
+        return updated
+
+    def delete(self):
+        """
+        Deletes the matching subtasks and recounts their tasks.
+
+        Returns
+        -------
+        tuple
+            The number of deleted objects and the count per model.
+        """
+        with transaction.atomic(using=self.db):
+            task_ids = set(self.values_list('task_id', flat=True))
+            deleted = super().delete()
+            Task.count_subtasks(task_ids)
+        return deleted
+
+
 class SubTask(models.Model):
     """
     Model for representing a subtask related to a parent task.
 
+    Saving and deleting a subtask recounts the subtasks of its task in the
+    same transaction.
+
     Attributes
     ----------
     task : ForeignKey
@@ -295,11 +988,82 @@ class SubTask(models.Model):
         The name of the subtask.
     checked : bool
         Indicates whether the subtask is completed.
+
+    Methods
+    -------
+    save(*args, **kwargs)
+        Saves the subtask and recounts the subtasks of its task.
+    delete(*args, **kwargs)
+        Deletes the subtask and recounts the subtasks of its task.
     """
     task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True)
     name = models.CharField(max_length=50, blank=True, default='')
     checked = models.BooleanField(default=False)
 
+    objects = SubTaskQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Loads a subtask and remembers the task it was loaded with.
+
+        Parameters
+        ----------
+        db : str
+            The database alias.
+        field_names : list of str
+            The loaded fields.
+        values : list
+            The loaded values.
+
+        Returns
+        -------
+        SubTask
+            The loaded subtask.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_task_id = instance.__dict__.get('task_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the subtask and recounts the subtasks of its task.
+
+        A subtask moved to another task recounts both tasks.
+
+        Parameters
+        ----------
+        *args : tuple
+            Positional arguments passed to the parent `save` method.
+        **kwargs : dict
+            Keyword arguments passed to the parent `save` method.
+        """
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            Task.count_subtasks({self.task_id, getattr(self, '_loaded_task_id', None)})
+        self._loaded_task_id = self.task_id
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the subtask and recounts the subtasks of its task.
+
+        Parameters
+        ----------
+        *args : tuple
+            Positional arguments passed to the parent `delete` method.
+        **kwargs : dict
+            Keyword arguments passed to the parent `delete` method.
+
+        Returns
+        -------
+        tuple
+            The number of deleted objects and the count per model.
+        """
+        with transaction.atomic(using=kwargs.get('using')):
+            deleted = super().delete(*args, **kwargs)
+            Task.count_subtasks([self.task_id])
+        return deleted
+
     def __str__(self):
         """
         Returns a string representation of the subtask.
@@ -310,3 +1074,327 @@ class SubTask(models.Model):
             The subtask's name.
         """
         return self.name
+
+
+class DataVersion(models.Model):
+    """
+    Model for a monotonic version counter of a group of data.
+
+    The counter is bumped in the same transaction as every write to the data it
+    tracks, so all workers can tell whether their view of it is still current.
+
+    Attributes
+    ----------
+    key : str
+        The name of the tracked data, e.g. ``'board'``.
+    version : int
+        The current version of the tracked data.
+
+    Methods
+    -------
+    get_version(key)
+        Returns the current version for the given key.
+    bump(key)
+        Increments the version for the given key.
+    """
+    BOARD = 'board'
+    CATEGORY = 'category'
+    PRIORITY_IMAGE = 'priority_image'
+
+    key = models.CharField(max_length=30, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def get_version(cls, key):
+        """
+        Returns the current version for the given key.
+
+        Parameters
+        ----------
+        key : str
+            The name of the tracked data.
+
+        Returns
+        -------
+        int
+            The current version, or 0 if the data was never written.
+        """
+        return cls.objects.filter(key=key).values_list('version', flat=True).first() or 0
+
+    @classmethod
+    def bump(cls, key):
+        """
+        Increments the version for the given key.
+
+        Parameters
+        ----------
+        key : str
+            The name of the tracked data.
+        """
+        if not cls.objects.filter(key=key).update(version=models.F('version') + 1):
+            cls.objects.get_or_create(key=key, defaults={'version': 1})
+
+    def __str__(self):
+        """
+        Returns a string representation of the data version.
+
+        Returns
+        -------
+        str
+            The key and its version.
+        """
+        return f"{self.key}@{self.version}"
+
+
+class TaskEvent(models.Model):
+    """
+    Model for an entry in the log of task changes streamed to open boards.
+
+    Attributes
+    ----------
+    task_id : int
+        The ID of the changed task; not a foreign key so deletions stay logged.
+    board_id : int or None
+        The board of a deleted task, so the delete is only streamed to that
+        board; upserts take the board from the task's card.
+    kind : str
+        Either ``'upsert'`` or ``'delete'``.
+    created : datetime
+        When the change was recorded.
+
+    Methods
+    -------
+    record(kind, task_ids, board_id=None)
+        Appends one event per task ID to the log.
+    """
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+
+    task_id = models.BigIntegerField()
+    board_id = models.BigIntegerField(null=True, blank=True)
+    kind = models.CharField(max_length=10)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+
+    @classmethod
+    def record(cls, kind, task_ids, board_id=None):
+        """
+        Appends one event per task ID to the log.
+
+        Parameters
+        ----------
+        kind : str
+            Either ``'upsert'`` or ``'delete'``.
+        task_ids : iterable of int
+            The IDs of the changed tasks.
+        board_id : int, optional
+            The board of the tasks.
+
+        Returns
+        -------
+        list of TaskEvent
+            The logged events.
+        """
+        return cls.objects.bulk_create([cls(task_id=task_id, board_id=board_id, kind=kind) for task_id in task_ids])
+
+    def __str__(self):
+        """
+        Returns a string representation of the event.
+
+        Returns
+        -------
+        str
+            The event kind and task ID.
+        """
+        return f"{self.kind} {self.task_id}"
+
+
+class TaskCard(models.Model):
+    """
+    Model for the denormalized board card of a task.
+
+    The card holds the task exactly as `/api/task/` returns it, with assignee,
+    subtask and category data flattened in, so the board is read with a single
+    scan of this table. It is rebuilt in the same transaction as every write
+    that changes what the card shows.
+
+    Attributes
+    ----------
+    task : OneToOneField
+        The task the card belongs to; also the primary key.
+    data : dict
+        The flattened card.
+    """
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    data = models.JSONField(default=dict)
+
+    def __str__(self):
+        """
+        Returns a string representation of the card.
+
+        Returns
+        -------
+        str
+            The task's title.
+        """
+        return self.data.get('title', '')
+
+
+class ArchivedTask(models.Model):
+    """
+    Model for a done task moved off the board by the archival.
+
+    Archived tasks are removed from `Task` together with their subtasks and
+    relations, so the board, summary and card queries only read active rows.
+    The row keeps the card for listing and a snapshot for restoring the task
+    under its original ID.
+
+    Attributes
+    ----------
+    id : int
+        The ID the task had on the board.
+    board : ForeignKey
+        The board the task was archived from.
+    title : str
+        The title of the task.
+    done_since : datetime
+        When the task was moved to the done column.
+    archived_at : datetime
+        When the task was archived.
+    card : dict
+        The task's card as `/api/task/` returned it.
+    snapshot : dict
+        The task's fields, ordered assignee and category IDs and subtasks.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='archived_tasks', db_index=False)
+    title = models.CharField(max_length=50, blank=True, default='')
+    done_since = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+    card = models.JSONField(default=dict)
+    snapshot = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', '-archived_at', '-id'], name='archived_board_date_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the archived task.
+
+        Returns
+        -------
+        str
+            The task's title.
+        """
+        return self.title
+
+
+class IdempotencyKey(models.Model):
+    """
+    Model for the stored response of a write sent with an `Idempotency-Key` header.
+
+    A retry with the same key gets the stored response replayed instead of
+    running the write again. Rows expire after a TTL and are pruned.
+
+    Attributes
+    ----------
+    scope : str
+        Digest of the credentials the request was sent with, so clients
+        cannot replay each other's responses.
+    key : str
+        The key chosen by the client.
+    fingerprint : str
+        Digest of the method, path, board and body of the request.
+    status_code : int
+        The status of the stored response; empty while the write is running.
+    locked_until : datetime
+        Until when a running write holds the key; a retry after that takes
+        the key over, since the write was lost.
+    content_type : str
+        The content type of the stored response.
+    content : bytes
+        The zlib compressed body of the stored response.
+    expires_at : datetime
+        When the key may be reused.
+    """
+    scope = models.CharField(max_length=32)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=32)
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    content = models.BinaryField(blank=True, default=b'')
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_scope_key_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the idempotency key.
+
+        Returns
+        -------
+        str
+            The key and the stored status.
+        """
+        return f"{self.key} -> {self.status_code}"
+
+
+class Job(models.Model):
+    """
+    Model for a unit of deferred work in the background job queue.
+
+    Finished jobs are deleted. Jobs that keep failing are kept, marked as
+    failed, for inspection.
+
+    Attributes
+    ----------
+    name : str
+        The name of the registered handler that runs the job.
+    payload : dict
+        The arguments of the job.
+    run_at : datetime
+        When the job is due; pushed back after a failed attempt.
+    attempts : int
+        Number of failed attempts so far.
+    locked_until : datetime
+        End of the lease of the worker running the job; empty while queued.
+    lock_token : str
+        Identifies the claim of the worker running the job.
+    failed : bool
+        Whether the job gave up after too many attempts.
+    last_error : str
+        The error of the last failed attempt.
+    created : datetime
+        When the job was enqueued.
+    """
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    lock_token = models.CharField(max_length=32, blank=True, default='')
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True, default='')
+    created = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_at', 'id'], name='job_due_idx', condition=models.Q(failed=False)),
+            models.Index(fields=['lock_token'], name='job_lock_token_idx', condition=~models.Q(lock_token='')),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the job.
+
+        Returns
+        -------
+        str
+            The handler name and job ID.
+        """
+        return f"{self.name} #{self.pk}"
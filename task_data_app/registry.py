@@ -0,0 +1,167 @@
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+from .invalidation import invalidation_bus
+from .models import Category, DataVersion, PriorityImage, Task
+
+
+class CategoryRegistry:
+    """
+    Process-local registry of all categories.
+
+    Categories change rarely, so they are loaded once per process and kept in
+    memory. The registry is cleared through the invalidation bus whenever the
+    category `DataVersion` moves, in this worker or any other. Categories read
+    inside a write transaction are not cached, since the transaction may
+    still roll back.
+
+    Methods
+    -------
+    get_categories()
+        Returns all categories keyed by ID.
+    get(category_ids)
+        Returns the category data for the given IDs.
+    invalidate()
+        Drops the cached categories.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories = None
+
+    def get_categories(self):
+        """
+        Returns all categories keyed by ID, reloading them if they changed.
+
+        Returns
+        -------
+        dict
+            Mapping of category ID to a dict with `id`, `name`, `color` and `name_tag`.
+        """
+        invalidation_bus.poll()
+        categories = self._categories
+        if categories is None:
+            alias = router.db_for_read(Category)
+            categories = {
+                category['id']: category
+                for category in Category.objects.using(alias).values('id', 'name', 'color', 'name_tag')
+            }
+            if not (alias == DEFAULT_DB_ALIAS and connections[alias].in_atomic_block):
+                with self._lock:
+                    self._categories = categories
+        return categories
+
+    def get(self, category_ids):
+        """
+        Returns the category data for the given IDs.
+
+        Parameters
+        ----------
+        category_ids : list of int
+            The category IDs of a task.
+
+        Returns
+        -------
+        list of dict
+            The known categories in the order of the given IDs.
+        """
+        categories = self.get_categories()
+        return [categories[category_id] for category_id in category_ids if category_id in categories]
+
+    def invalidate(self):
+        """
+        Drops the cached categories so the next lookup reloads them.
+        """
+        with self._lock:
+            self._categories = None
+
+
+class PriorityImageRegistry:
+    """
+    Process-local registry of the priority images.
+
+    Cached and invalidated like the categories in `CategoryRegistry`.
+
+    Methods
+    -------
+    get(priority)
+        Returns the image of a priority.
+    derive_image(images, priority)
+        Derives the image of a priority from the image of another one.
+    invalidate()
+        Drops the cached images.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._images = None
+
+    def get(self, priority):
+        """
+        Returns the image of a priority, reloading the images if they changed.
+
+        Parameters
+        ----------
+        priority : int
+            The priority, one of `Task.Priority`.
+
+        Returns
+        -------
+        str
+            The image URL, derived from another priority's image if the
+            priority has none, or an empty string.
+        """
+        invalidation_bus.poll()
+        images = self._images
+        if images is None:
+            alias = router.db_for_read(PriorityImage)
+            images = dict(PriorityImage.objects.using(alias).values_list('priority', 'image'))
+            if not (alias == DEFAULT_DB_ALIAS and connections[alias].in_atomic_block):
+                with self._lock:
+                    self._images = images
+        if priority in images:
+            return images[priority]
+        return self.derive_image(images, priority)
+
+    def derive_image(self, images, priority):
+        """
+        Derives the image of a priority from the image of another one.
+
+        Images named after their priority, such as ``prio-urgent.svg``, give
+        the name of the missing image, such as ``prio-low.svg``.
+
+        Parameters
+        ----------
+        images : dict
+            The stored images by priority.
+        priority : int
+            The priority without a stored image.
+
+        Returns
+        -------
+        str
+            The derived image URL, or an empty string if no stored image is
+            named after its priority.
+        """
+        if not priority:
+            return ''
+        for other, image in sorted(images.items()):
+            label = Task.Priority(other).label.lower()
+            if label and label in image.lower():
+                start = image.lower().rindex(label)
+                return image[:start] + Task.Priority(priority).label.lower() + image[start + len(label):]
+        return ''
+
+    def invalidate(self):
+        """
+        Drops the cached images so the next lookup reloads them.
+        """
+        with self._lock:
+            self._images = None
+
+
+category_registry = CategoryRegistry()
+invalidation_bus.subscribe(DataVersion.CATEGORY, category_registry.invalidate)
+priority_image_registry = PriorityImageRegistry()
+invalidation_bus.subscribe(DataVersion.PRIORITY_IMAGE, priority_image_registry.invalidate)
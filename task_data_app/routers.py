@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+
+_read_db = ContextVar('read_db', default=None)
+
+
+@contextmanager
+def read_from(alias):
+    """
+    Routes the reads inside the block to the given database alias.
+
+    Parameters
+    ----------
+    alias : str
+        The database alias to read from; ignored if it is not configured.
+
+    Yields
+    ------
+    str
+        The alias the reads are routed to.
+    """
+    if alias not in connections.settings:
+        alias = DEFAULT_DB_ALIAS
+    token = _read_db.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_db.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router sending reads to the read-only replica where requested.
+
+    Reads go to the primary unless they run inside `read_from`, so writes and
+    any read that has to see the request's own writes stay on the primary.
+    Writes and migrations always go to the primary.
+
+    Methods
+    -------
+    db_for_read(model, **hints)
+        Returns the alias selected by `read_from`, or the primary.
+    db_for_write(model, **hints)
+        Returns the primary alias.
+    allow_relation(obj1, obj2, **hints)
+        Allows relations between objects from the primary and the replica.
+    allow_migrate(db, app_label, model_name=None, **hints)
+        Only allows migrations on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_db.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
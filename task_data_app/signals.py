@@ -0,0 +1,264 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .api.events import task_event_broker
+from .api.projection import rebuild_cards, schedule_card_refresh, touch_cards
+from .invalidation import invalidation_bus
+from .models import Board, BoardMembership, Category, DataVersion, PriorityImage, SubTask, Task, TaskAssignment, TaskCard, TaskCategory, TaskEvent, User
+
+
+def tasks_changed(task_ids):
+    """
+    Logs upsert events for the given tasks and marks their cards as stale.
+
+    Parameters
+    ----------
+    task_ids : iterable of int
+        The IDs of the changed tasks.
+    """
+    task_ids = list(task_ids)
+    task_event_broker.record(TaskEvent.UPSERT, task_ids)
+    touch_cards(task_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=SubTask)
+@receiver(post_delete, sender=SubTask)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Task.category.through)
+@receiver(m2m_changed, sender=Task.user.through)
+def bump_board_version(sender, **kwargs):
+    """
+    Bumps the board version whenever board data changes.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    **kwargs : dict
+        The signal arguments.
+    """
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidation_bus.publish(DataVersion.BOARD)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_registry(sender, **kwargs):
+    """
+    Invalidates the category registry in every worker.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    **kwargs : dict
+        The signal arguments.
+    """
+    invalidation_bus.publish(DataVersion.CATEGORY)
+
+
+@receiver(post_save, sender=PriorityImage)
+@receiver(post_delete, sender=PriorityImage)
+def priority_image_changed(sender, instance, **kwargs):
+    """
+    Invalidates the priority images in every worker and refreshes the cards showing the image.
+
+    The priorities without a stored image show one derived from the stored
+    images, so their cards are refreshed as well.
+
+    A priority can be shown on any number of cards, so they are rebuilt by
+    a background job instead of the admin's request; the job also logs the
+    upsert events once the cards are rebuilt.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    instance : PriorityImage
+        The saved or deleted priority image.
+    **kwargs : dict
+        The signal arguments.
+    """
+    invalidation_bus.publish(DataVersion.PRIORITY_IMAGE)
+    stored = PriorityImage.objects.exclude(pk=instance.pk).values_list('priority', flat=True)
+    tasks = Task.objects.exclude(priority=Task.Priority.NONE).exclude(priority__in=stored)
+    schedule_card_refresh(tasks.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Task)
+def record_task_saved(sender, instance, **kwargs):
+    """
+    Logs an upsert event for a saved task and marks its card as stale.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    instance : Task
+        The saved task.
+    **kwargs : dict
+        The signal arguments.
+    """
+    tasks_changed([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def record_task_deleted(sender, instance, **kwargs):
+    """
+    Logs a delete event for a deleted task.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    instance : Task
+        The deleted task.
+    **kwargs : dict
+        The signal arguments.
+    """
+    task_event_broker.record(TaskEvent.DELETE, [instance.pk], board_id=instance.board_id)
+
+
+@receiver(post_save, sender=SubTask)
+@receiver(post_delete, sender=SubTask)
+def record_subtask_changed(sender, instance, **kwargs):
+    """
+    Logs an upsert event for the parent task of a changed subtask and marks its card as stale.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    instance : SubTask
+        The saved or deleted subtask.
+    **kwargs : dict
+        The signal arguments.
+    """
+    if instance.task_id:
+        tasks_changed([instance.task_id])
+
+
+@receiver(m2m_changed, sender=Task.category.through)
+@receiver(m2m_changed, sender=Task.user.through)
+def record_task_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Logs upsert events for tasks whose assignees or categories changed and marks their cards as stale.
+
+    Parameters
+    ----------
+    sender : Model
+        The through model that sent the signal.
+    instance : Model
+        The task, or the user or category on the reverse side.
+    action : str
+        The m2m action.
+    reverse : bool
+        Whether the change was made from the user or category side.
+    pk_set : set of int or None
+        The primary keys added or removed.
+    **kwargs : dict
+        The signal arguments.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        tasks_changed([instance.pk])
+    elif pk_set:
+        tasks_changed(pk_set)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Category)
+def record_related_tasks_changed(sender, instance, created, **kwargs):
+    """
+    Logs upsert events for the tasks showing a renamed or recolored user or category
+    and rebuilds their cards in the transaction of the save.
+
+    Saves that only flag a user as deleted are skipped: the cards keep
+    showing the user until the `purge_user` job removes their assignments,
+    which updates the cards and logs the events batch by batch.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    instance : User or Category
+        The saved user or category.
+    created : bool
+        Whether the instance was just created.
+    **kwargs : dict
+        The signal arguments.
+    """
+    update_fields = kwargs.get('update_fields')
+    if created or (update_fields and update_fields <= User.DELETION_FIELDS):
+        return
+    tasks_changed(instance.task.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def join_default_board(sender, instance, created, **kwargs):
+    """
+    Makes a new user a member of the default board.
+
+    Parameters
+    ----------
+    sender : Model
+        The model class that sent the signal.
+    instance : User
+        The saved user.
+    created : bool
+        Whether the user was just created.
+    **kwargs : dict
+        The signal arguments.
+    """
+    if created:
+        BoardMembership.objects.get_or_create(board=Board.objects.default(), user=instance)
+
+
+@receiver(post_delete, sender=TaskAssignment)
+@receiver(post_delete, sender=TaskCategory)
+def record_task_relation_deleted(sender, instance, **kwargs):
+    """
+    Logs an upsert event for a task that lost an assignee or category.
+
+    This also covers assignments removed by deleting a user or category.
+
+    Parameters
+    ----------
+    sender : Model
+        The through model that sent the signal.
+    instance : TaskAssignment or TaskCategory
+        The deleted assignment or category link.
+    **kwargs : dict
+        The signal arguments.
+    """
+    tasks_changed([instance.task_id])
+
+
+@receiver(post_migrate)
+def build_missing_task_cards(sender, app_config, **kwargs):
+    """
+    Builds the card projection after migrating a database that has tasks but no cards.
+
+    Parameters
+    ----------
+    sender : AppConfig
+        The app config that was migrated.
+    app_config : AppConfig
+        The app config that was migrated.
+    **kwargs : dict
+        The signal arguments.
+    """
+    if app_config.name != 'task_data_app':
+        return
+    using = kwargs.get('using', DEFAULT_DB_ALIAS)
+    if TaskCard._meta.db_table not in connections[using].introspection.table_names():
+        return
+    if not TaskCard.objects.using(using).exists() and Task.objects.using(using).exists():
+        rebuild_cards()